@@ -0,0 +1,184 @@
+"""
+acc_width_analysis.py
+
+Runs the fixed-point 5x5 conv over a whole image dataset and records, per
+output channel, the peak accumulator magnitudes seen by the MAC datapath:
+
+  * running partial sums in RTL MAC order (conv5x5_core accumulates the 25
+    products row-major, then adds the bias),
+  * the final accumulator after bias,
+  * the output after >>> SHIFT and ReLU.
+
+From those peaks it recommends the minimum signed accumulator width and
+output width that never overflow on the data, next to the worst case any
+8-bit image could reach with these weights, and reports how many values
+would wrap or saturate at the widths used today (image_ref.py ACC_WIDTH=24,
+conv5x5_core.sv ACC_WIDTH=32 / OUTPUT_WIDTH=16).
+
+Usage:
+    python acc_width_analysis.py [dataset.npy | image_dir] [--stride 3]
+
+A directory is packed once into a memmapped .npy with patch_stream.build_dataset.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from image_ref import read_signed_hex
+from patch_stream import build_dataset, open_dataset, patch_windows
+
+# Configuration
+DATASET      = "Covid19-dataset/test"
+DATASET_NPY  = "dataset_u8.npy"
+WEIGHTS_FILE = "weights0.mem"
+BIAS_FILE    = "bias0.mem"
+PATCH_DIM    = 5
+STRIDE       = 3
+OUT_CH       = 5
+SHIFT        = 8
+# Widths currently in the flow
+CURRENT_ACC_WIDTHS = {"image_ref.py": 24, "conv5x5_core.sv": 32}
+CURRENT_OUT_WIDTH  = 16
+IMAGES_PER_BATCH   = 8
+
+
+def signed_bits(lo, hi):
+    """Smallest two's-complement width holding every value in [lo, hi]."""
+    lo, hi = int(lo), int(hi)
+    neg = (-lo - 1).bit_length() if lo < 0 else 0
+    pos = hi.bit_length() if hi > 0 else 0
+    return max(neg, pos) + 1
+
+
+def signed_bits_array(values):
+    """Vectorized signed_bits for every element (int64 values, |v| < 2**53)."""
+    mag = np.where(values < 0, ~values, values)
+    return np.frexp(mag.astype(np.float64))[1] + 1
+
+
+def bits_histogram(values, max_bits=64):
+    """(channels, max_bits+1) counts of required signed width, one row per channel."""
+    bits = signed_bits_array(values)
+    return np.stack([np.bincount(bits[:, c], minlength=max_bits + 1) for c in range(values.shape[1])])
+
+
+def worst_case_range(Wq, bq, max_pixel=255):
+    """Per-channel (min, max) accumulator over all possible unsigned 8-bit patches."""
+    pos = np.where(Wq > 0, Wq, 0).sum(axis=1) * max_pixel
+    neg = np.where(Wq < 0, Wq, 0).sum(axis=1) * max_pixel
+    # Partial sums can also peak before the bias is added.
+    lo = np.minimum(neg, neg + bq)
+    hi = np.maximum(pos, pos + bq)
+    return lo, hi
+
+
+def scan(images, Wq, bq, stride=STRIDE, batch=IMAGES_PER_BATCH):
+    """
+    Stream images through the conv in batches and collect per-channel stats.
+
+    Returns a dict of (OUT_CH,) int64 arrays: partial_min/partial_max (running
+    MAC sums incl. final bias), acc_min/acc_max, out_max, plus per-channel
+    histograms of the signed width each accumulator / output value needs.
+    """
+    W = Wq.astype(np.int64)
+    b = bq.astype(np.int64)
+    stats = {
+        "partial_min": np.zeros(OUT_CH, np.int64),
+        "partial_max": np.zeros(OUT_CH, np.int64),
+        "acc_min": np.full(OUT_CH, np.iinfo(np.int64).max),
+        "acc_max": np.full(OUT_CH, np.iinfo(np.int64).min),
+        "out_max": np.zeros(OUT_CH, np.int64),
+        "acc_bits": np.zeros((OUT_CH, 65), np.int64),
+        "out_bits": np.zeros((OUT_CH, 65), np.int64),
+        "num_patches": 0,
+    }
+
+    for start in range(0, len(images), batch):
+        win = patch_windows(np.asarray(images[start:start + batch]), PATCH_DIM, stride)
+        pix = win.reshape(-1, PATCH_DIM * PATCH_DIM).astype(np.int64)   # (P, 25)
+
+        # Running MAC sums in RTL order: (P, C, 25)
+        partial = np.cumsum(pix[:, None, :] * W[None, :, :], axis=2)
+        acc = partial[:, :, -1] + b
+        out = np.maximum(acc >> SHIFT, 0)
+
+        stats["partial_min"] = np.minimum(stats["partial_min"], np.minimum(partial.min(axis=(0, 2)), acc.min(axis=0)))
+        stats["partial_max"] = np.maximum(stats["partial_max"], np.maximum(partial.max(axis=(0, 2)), acc.max(axis=0)))
+        stats["acc_min"] = np.minimum(stats["acc_min"], acc.min(axis=0))
+        stats["acc_max"] = np.maximum(stats["acc_max"], acc.max(axis=0))
+        stats["out_max"] = np.maximum(stats["out_max"], out.max(axis=0))
+        stats["acc_bits"] += bits_histogram(acc)
+        stats["out_bits"] += bits_histogram(out)
+        stats["num_patches"] += pix.shape[0]
+
+    return stats
+
+
+def overflow_counts(stats, acc_width, out_width):
+    """Per-channel number of accumulators that wrap at acc_width and outputs that saturate at out_width."""
+    wraps = stats["acc_bits"][:, acc_width + 1:].sum(axis=1)
+    sats = stats["out_bits"][:, out_width + 1:].sum(axis=1)
+    return wraps, sats
+
+
+def load_images(path):
+    if os.path.isdir(path):
+        print(f"Packing images under {path} into {DATASET_NPY}...")
+        build_dataset(path, DATASET_NPY)
+        path = DATASET_NPY
+    return open_dataset(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Accumulator/output width analysis over a dataset.")
+    parser.add_argument("dataset", nargs="?", default=DATASET,
+                        help="image directory or .npy written by patch_stream.build_dataset")
+    parser.add_argument("--weights", default=WEIGHTS_FILE)
+    parser.add_argument("--bias", default=BIAS_FILE)
+    parser.add_argument("--weight-bits", type=int, default=16,
+                        help="entry width of the weights file (8 after hex_to_signed.py)")
+    parser.add_argument("--stride", type=int, default=STRIDE)
+    args = parser.parse_args()
+
+    Wq = np.array(read_signed_hex(args.weights, bits=args.weight_bits), dtype=np.int64).reshape(OUT_CH, -1)
+    bq = np.array(read_signed_hex(args.bias, bits=16), dtype=np.int64)
+    images = load_images(args.dataset)
+
+    t0 = time.perf_counter()
+    stats = scan(images, Wq, bq, args.stride)
+    elapsed = time.perf_counter() - t0
+    print(f"Scanned {len(images)} images / {stats['num_patches']} patches in {elapsed:.2f} s\n")
+
+    wc_lo, wc_hi = worst_case_range(Wq, bq)
+    print(f"{'Ch':<3} | {'acc min':>10} | {'acc max':>10} | {'peak |partial|':>14} | {'out max':>8} | "
+          f"{'acc bits':>8} | {'out bits':>8} | {'worst-case acc bits':>19}")
+    print("-" * 100)
+    need_acc, need_out, need_wc = [], [], []
+    for c in range(OUT_CH):
+        acc_bits = signed_bits(stats["partial_min"][c], stats["partial_max"][c])
+        out_bits = signed_bits(0, stats["out_max"][c])
+        wc_bits = signed_bits(wc_lo[c], wc_hi[c])
+        need_acc.append(acc_bits)
+        need_out.append(out_bits)
+        need_wc.append(wc_bits)
+        peak = max(abs(int(stats["partial_min"][c])), int(stats["partial_max"][c]))
+        print(f"{c:<3} | {stats['acc_min'][c]:>10} | {stats['acc_max'][c]:>10} | {peak:>14} | "
+              f"{stats['out_max'][c]:>8} | {acc_bits:>8} | {out_bits:>8} | {wc_bits:>19}")
+
+    print("\nRecommendation:")
+    print(f"  Minimum accumulator width on this data : {max(need_acc)} bits")
+    print(f"  Minimum accumulator width, any image   : {max(need_wc)} bits")
+    print(f"  Minimum output width on this data      : {max(need_out)} bits (signed, after >>>{SHIFT} and ReLU)")
+
+    print("\nOverflow at current widths:")
+    for name, width in CURRENT_ACC_WIDTHS.items():
+        wraps, sats = overflow_counts(stats, width, CURRENT_OUT_WIDTH)
+        print(f"  {name:<16} ACC_WIDTH={width:<2}: {int(wraps.sum())} accumulator wraps "
+              f"(per channel {wraps.tolist()}), {int(sats.sum())} outputs saturated at "
+              f"{CURRENT_OUT_WIDTH} bits (per channel {sats.tolist()})")
+
+
+if __name__ == "__main__":
+    main()
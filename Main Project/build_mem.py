@@ -0,0 +1,296 @@
+"""
+build_mem.py
+
+Incremental, parallel regeneration of the hardware test vectors.
+
+Replaces running weights_mem.py, hex_to_signed.py, image_array.py,
+gen_ref.py, testbench.py and image_ref.py by hand in the right order. Each
+step declares the files it reads (including its own script, so code edits
+count) and the files it writes; a step depends on whichever step writes
+one of its inputs. A step is rebuilt only when it is stale:
+
+  * it has never been built, or one of its outputs is missing;
+  * an input's SHA-256 differs from the one recorded at its last build
+    (covid_classifier.h5 retrained, a new X-ray, an edited script);
+  * an output no longer matches what the build wrote (clobbered by a
+    script run by hand), so it is regenerated rather than trusted.
+
+Rebuilt steps whose outputs come out byte-identical do not invalidate
+their dependents. A step whose source (the X-ray) is missing keeps its
+existing outputs, but fails the build once its other inputs change. Ready
+steps run concurrently in a thread pool, and the results the cocotb test
+reads are copied into conv_accelerator_cocotb_test/.
+Hashes are kept in .mem_build.json next to this script.
+
+  python build_mem.py                 # bring everything up to date
+  python build_mem.py -n              # list what would run and why
+  python build_mem.py ref cocotb -j 2 # only these targets (+ what they need)
+  python build_mem.py --all           # include the optional q8 / float outputs
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+
+from model_weights import MODEL_PATH, file_hash
+
+# Configuration
+BASE_DIR    = os.path.dirname(os.path.abspath(__file__))
+STATE_FILE  = ".mem_build.json"
+COCOTB_DIR  = "conv_accelerator_cocotb_test"
+COCOTB_FILES = ["weights0.mem", "bias0.mem", "patch0.vec", "ref0.vec"]
+IMG_PATH    = os.path.join("Covid19-dataset", "test", "covid", "2.png")
+JOBS        = 4
+
+
+def _weights(inputs, outputs):
+    from model_weights import conv_weights
+    from weights_mem import write_weights_mem
+    W, b = conv_weights(path=inputs[0])
+    write_weights_mem(W, b, *outputs)
+
+
+def _weights_q8(inputs, outputs):
+    from hex_to_signed import write_weights_q8
+    from model_weights import conv_weights
+    write_weights_q8(conv_weights(path=inputs[0])[0], outputs[0])
+
+
+def _patch(inputs, outputs):
+    from image_array import write_first_patch
+    from patch_stream import load_image
+    write_first_patch(load_image(inputs[0]), outputs[0])
+
+
+def _ref(inputs, outputs):
+    from gen_ref import write_ref
+    write_ref(*inputs[:3], outputs[0])
+
+
+def _ref_float(inputs, outputs):
+    from model_weights import conv_weights
+    from testbench import write_float_ref
+    W, b = conv_weights(path=inputs[0])
+    write_float_ref(inputs[1], outputs[0], W, b)
+
+
+def _image(inputs, outputs):
+    from image_ref import OUT_CH, read_signed_hex, write_image_mems
+    from patch_stream import load_image
+    pix = load_image(inputs[0]).astype(int)
+    Wq = np.array(read_signed_hex(inputs[1], bits=16), dtype=int).reshape(OUT_CH, -1)
+    bq = read_signed_hex(inputs[2], bits=16)
+    write_image_mems(pix, Wq, bq, *outputs)
+
+
+def _copy(inputs, outputs):
+    for src, dst in zip(inputs, outputs):
+        shutil.copyfile(src, dst)
+
+
+def build_steps(model=MODEL_PATH, image=IMG_PATH):
+    """
+    The build graph.
+
+    Returns:
+        dict: name -> (function, inputs, outputs, built by default); paths
+        are relative to BASE_DIR and function(inputs, outputs) gets them
+        as absolute paths.
+    """
+    return {
+        "weights":    (_weights, [model, "weights_mem.py", "model_weights.py"],
+                       ["weights0.mem", "bias0.mem"], True),
+        "weights_q8": (_weights_q8, [model, "hex_to_signed.py", "model_weights.py"],
+                       ["weights0_q8.mem"], False),
+        "patch":      (_patch, [image, "image_array.py", "patch_stream.py"], ["patch0.vec"], True),
+        "ref":        (_ref, ["weights0.mem", "bias0.mem", "patch0.vec", "gen_ref.py"], ["ref0.vec"], True),
+        "ref_float":  (_ref_float, [model, "patch0.vec", "testbench.py", "model_weights.py"],
+                       ["ref0_float.vec"], False),
+        "image":      (_image, [image, "weights0.mem", "bias0.mem", "image_ref.py", "patch_stream.py"],
+                       ["image.mem", "image_ref.mem"], True),
+        "cocotb":     (_copy, COCOTB_FILES, [os.path.join(COCOTB_DIR, f) for f in COCOTB_FILES], True),
+    }
+
+
+def dependencies(steps):
+    """name -> set of steps that write one of its inputs."""
+    producers = {out: name for name, (_, _, outputs, _) in steps.items() for out in outputs}
+    return {name: {producers[i] for i in inputs if i in producers and producers[i] != name}
+            for name, (_, inputs, _, _) in steps.items()}
+
+
+def _hashes(paths):
+    return {p: file_hash(os.path.join(BASE_DIR, p)) for p in paths}
+
+
+def stale_reason(name, steps, state):
+    """Why `name` must run, or None when its recorded hashes still match."""
+    _, inputs, outputs, _ = steps[name]
+    record = state.get(name)
+    for p in outputs:
+        if not os.path.exists(os.path.join(BASE_DIR, p)):
+            return f"{p} missing"
+    if record is None:
+        return "never built"
+    for p, digest in _hashes(inputs).items():
+        if record["inputs"].get(p) != digest:
+            return f"{p} changed"
+    for p, digest in _hashes(outputs).items():
+        if record["outputs"].get(p) != digest:
+            return f"{p} modified outside the build"
+    return None
+
+
+def _stale_without(name, steps, state, changed):
+    """
+    Why the kept outputs of `name` (run with a source input missing) are
+    stale: an upstream step rewrote its outputs in this build, or a present
+    input differs from the one recorded. None when nothing points to it.
+    """
+    _, inputs, _, _ = steps[name]
+    present = [p for p in inputs if os.path.exists(os.path.join(BASE_DIR, p))]
+    for dep in sorted(changed):
+        for p in present:
+            if p in steps[dep][2]:
+                return f"{p} rebuilt by {dep}"
+    record = state.get(name)
+    if record is not None:
+        for p, digest in _hashes(present).items():
+            if record["inputs"].get(p) != digest:
+                return f"{p} changed"
+    return None
+
+
+def _run(name, steps):
+    func, inputs, outputs, _ = steps[name]
+    before = _hashes(inputs)                 # what this build actually read
+    old = _hashes([p for p in outputs if os.path.exists(os.path.join(BASE_DIR, p))])
+    start = time.perf_counter()
+    func([os.path.join(BASE_DIR, p) for p in inputs], [os.path.join(BASE_DIR, p) for p in outputs])
+    record = {"inputs": before, "outputs": _hashes(outputs)}
+    return record, time.perf_counter() - start, record["outputs"] != old
+
+
+def build(steps, targets=None, jobs=JOBS, force=False, dry_run=False, state_path=STATE_FILE):
+    """
+    Bring `targets` (default: every default step) and what they need up to date.
+
+    Returns:
+        dict: name -> (status, detail, seconds); status is one of built,
+        up to date, kept (source input missing, existing outputs used),
+        would run, failed (also when kept outputs no longer match their
+        other inputs) or skipped.
+    """
+    deps = dependencies(steps)
+    wanted, todo = set(), list(targets or [n for n, s in steps.items() if s[3]])
+    while todo:
+        name = todo.pop()
+        if name not in wanted:
+            wanted.add(name)
+            todo.extend(deps[name])
+
+    state_file = os.path.join(BASE_DIR, state_path)
+    state = {}
+    if os.path.exists(state_file):
+        with open(state_file) as f:
+            state = json.load(f)
+
+    results, running, pending = {}, {}, set(wanted)
+    changed = set()                          # built steps whose outputs differ from the files they replaced
+    ok = lambda n: results.get(n, ("",))[0] in ("built", "up to date", "kept", "would run")  # noqa: E731
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            progress = True
+            while progress:                  # settle every step that needs no worker
+                progress = False
+                for name in sorted(pending):
+                    if any(d in pending or d in running.values() for d in deps[name]):
+                        continue
+                    pending.discard(name)
+                    progress = True
+                    failed = [d for d in deps[name] if not ok(d)]
+                    if failed:
+                        results[name] = ("skipped", f"needs {', '.join(failed)}", 0.0)
+                        continue
+                    missing = [p for p in steps[name][1] if not os.path.exists(os.path.join(BASE_DIR, p))]
+                    have_outputs = all(os.path.exists(os.path.join(BASE_DIR, p)) for p in steps[name][2])
+                    if missing:
+                        detail = f"missing input {', '.join(missing)}"
+                        stale = _stale_without(name, steps, state, changed) if have_outputs else None
+                        if not have_outputs:
+                            results[name] = ("failed", detail, 0.0)
+                        elif stale:
+                            results[name] = ("failed", f"{detail}; outputs are stale ({stale})", 0.0)
+                        else:
+                            results[name] = ("kept", detail, 0.0)
+                            if not dry_run and name not in state:
+                                # Remember what the kept outputs go with, so later changes are caught
+                                present = [p for p in steps[name][1] if p not in missing]
+                                state[name] = {"inputs": _hashes(present), "outputs": _hashes(steps[name][2])}
+                        continue
+                    upstream = [d for d in deps[name] if results[d][0] == "would run"]
+                    reason = "forced" if force else stale_reason(name, steps, state)
+                    if reason is None and not upstream:
+                        results[name] = ("up to date", "", 0.0)
+                    elif dry_run:
+                        results[name] = ("would run", reason or f"if {', '.join(upstream)} changes its outputs", 0.0)
+                    else:
+                        running[pool.submit(_run, name, steps)] = name
+                        results[name] = ("running", reason, 0.0)
+            if not running:
+                if pending:
+                    raise RuntimeError(f"dependency cycle among {', '.join(sorted(pending))}")
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    state[name], seconds, rewritten = future.result()
+                    if rewritten:
+                        changed.add(name)
+                    results[name] = ("built", results[name][1], seconds)
+                except Exception as e:  # report and keep building independent steps
+                    results[name] = ("failed", f"{type(e).__name__}: {e}", 0.0)
+
+    if not dry_run:
+        with open(state_file, "w") as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+    return results
+
+
+def report(results, steps):
+    print(f"{'step':<11} | {'status':<10} | {'time (s)':>8} | detail")
+    print("-" * 80)
+    for name in steps:
+        if name in results:
+            status, detail, seconds = results[name]
+            print(f"{name:<11} | {status:<10} | {seconds:>8.3f} | {detail}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild stale .mem/.vec files and copy them to the cocotb test.")
+    parser.add_argument("targets", nargs="*", help="steps to bring up to date (default: all default steps)")
+    parser.add_argument("--all", action="store_true", help="also build weights_q8 and ref_float")
+    parser.add_argument("-j", "--jobs", type=int, default=JOBS)
+    parser.add_argument("-n", "--dry-run", action="store_true", help="only list what would run and why")
+    parser.add_argument("-f", "--force", action="store_true", help="rebuild every selected step")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--image", default=IMG_PATH)
+    args = parser.parse_args()
+
+    steps = build_steps(args.model, args.image)
+    unknown = [t for t in args.targets if t not in steps]
+    if unknown:
+        parser.error(f"unknown step(s) {', '.join(unknown)}; choose from {', '.join(steps)}")
+    targets = args.targets or (list(steps) if args.all else None)
+    results = build(steps, targets, args.jobs, args.force, args.dry_run)
+    report(results, steps)
+    if any(status == "failed" for status, _, _ in results.values()):
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -14,16 +14,18 @@ def read_signed_hex(fname, bits=16):
             vals.append(v)
     return vals
 
-# 1) Load signed weights & bias for channel 0
-raw_w = read_signed_hex("weights0.mem", bits=16)   # 125 entries
-W0 = np.array(raw_w).reshape(5,5,1,5)[...,0]       # pick channel 0
+# 1) Load signed weights & bias for all channels
+raw_w = read_signed_hex("weights0.mem", bits=16)   # 125 entries, channel-major
+W = np.array(raw_w).reshape(5,5,5)                 # (channel, u, v)
 
-b_raw = read_signed_hex("bias0.mem", bits=16)
-b0 = b_raw[0]
+b = read_signed_hex("bias0.mem", bits=16)
 
-# 2) Load the patch
+# 2) Load the patch and the hardware reference
 patch = np.loadtxt("patch0.vec", dtype=int).reshape(5,5)
+ref = [v & 0xFFFF for v in read_signed_hex("ref0.vec", bits=16)]
 
-# 3) Compute
-acc = np.sum(patch * W0) + b0
-print("Signed Python channel0:", acc, "ReLU→", max(acc,0))
+# 3) Compute every channel (ref_crosscheck.py does this for a whole dataset)
+for c in range(5):
+    acc = np.sum(patch * W[c]) + b[c]
+    out = max(acc >> 8, 0)
+    print(f"Signed Python channel{c}:", acc, "ReLU(>>8)→", out, "ref0.vec:", ref[c], "OK" if out == ref[c] else "MISMATCH")
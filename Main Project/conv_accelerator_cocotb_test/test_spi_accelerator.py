@@ -3,6 +3,8 @@ from cocotb.clock import Clock
 from cocotb.triggers import Timer, RisingEdge, FallingEdge, ClockCycles
 import random
 import os
+import sys
+import numpy as np
 
 CLK_MAIN_PERIOD_NS = 10  
 SCLK_SPI_PERIOD_NS = 40  
@@ -27,6 +29,24 @@ REF_FILE     = os.path.join(DATA_FILE_PATH, "ref0.vec")
 
 MAX_STATUS_POLLS = 5000 
 
+# --- Randomized co-verification mode ---
+# Number of random weight/bias sets and patches streamed per set. Weights and
+# biases are only reloaded over SPI when the set changes, so most cases cost
+# one 25-byte patch write plus start/poll/read.
+RANDOM_WEIGHT_SETS     = int(os.environ.get("RANDOM_WEIGHT_SETS", "8"))
+RANDOM_PATCHES_PER_SET = int(os.environ.get("RANDOM_PATCHES_PER_SET", "250"))
+RANDOM_MAX_ERRORS_LOG  = 20
+# Optional image whose stride-3 patches (via ../patch_stream.py) replace the
+# random patches, so real X-ray data streams through the DUT.
+PATCH_SOURCE_IMAGE     = os.environ.get("PATCH_SOURCE_IMAGE", "")
+
+NUM_CHANNELS   = 5
+KERNEL_ELEMS   = 25
+CORE_ACC_WIDTH = 32      # conv5x5_core.sv ACC_WIDTH
+REF_ACC_WIDTH  = 24      # image_ref.py ACC_WIDTH
+CORE_SHIFT     = 8       # conv5x5_core.sv SHIFT_AMOUNT
+CORE_OUT_MAX   = 0x7FFF  # conv5x5_core.sv saturates to the largest positive OUTPUT_WIDTH value
+
 def read_decimal_vec_to_bytes(filename, num_bytes, byte_width=8):
     data_bytes = []
     try:
@@ -119,6 +139,126 @@ async def spi_read_data_block(dut, num_bytes):
     dut._log.info(f"SPI: Received data block: {[hex(b) for b in received_bytes]}")
     return received_bytes
 
+async def spi_write_command(dut, command, data_bytes=()):
+    """CS-framed command plus optional payload, without per-transfer logging."""
+    await spi_assert_cs(dut)
+    await spi_transfer_byte(dut, command)
+    for byte_val in data_bytes:
+        await spi_transfer_byte(dut, byte_val)
+    await spi_deassert_cs(dut)
+
+async def spi_wait_done(dut, poll_cycles=50):
+    for _ in range(MAX_STATUS_POLLS):
+        await ClockCycles(dut.clk_main, poll_cycles)
+        await spi_assert_cs(dut)
+        await spi_transfer_byte(dut, CMD_READ_STATUS)
+        status_byte = await spi_transfer_byte(dut, 0x00)
+        await spi_deassert_cs(dut)
+        if (status_byte >> 1) & 0x1:
+            return True
+    return False
+
+async def spi_read_results(dut):
+    await spi_assert_cs(dut)
+    await spi_transfer_byte(dut, CMD_READ_RESULTS)
+    rx = [await spi_transfer_byte(dut, 0xAA) for _ in range(RESULTS_BYTES)]
+    await spi_deassert_cs(dut)
+    return rx
+
+def words_to_be_bytes(words):
+    """Signed/unsigned 16-bit words -> big-endian byte list, as read_hex_mem_to_bytes produces."""
+    data_bytes = []
+    for w in words:
+        w = int(w) & 0xFFFF
+        data_bytes.append(w >> 8)
+        data_bytes.append(w & 0xFF)
+    return data_bytes
+
+def expected_outputs(patches, weights, biases, acc_width=CORE_ACC_WIDTH):
+    """
+    Vectorized golden model of conv5x5_core for a whole table of cases.
+
+    Args:
+        patches: (N, 25) unsigned 8-bit pixels.
+        weights: (N, 5, 25) signed 16-bit weights, channel-major like weights0.mem.
+        biases:  (N, 5) signed 16-bit biases.
+        acc_width: accumulator width; sums wrap in two's complement at this width.
+
+    Returns:
+        (N, 5) int64 array of channel outputs after >>>8, ReLU and saturation.
+    """
+    patches = np.asarray(patches, dtype=np.int64)
+    weights = np.asarray(weights, dtype=np.int64)
+    biases  = np.asarray(biases,  dtype=np.int64)
+
+    acc = np.einsum("nk,nck->nc", patches, weights) + biases
+    half = 1 << (acc_width - 1)
+    acc = ((acc + half) & ((1 << acc_width) - 1)) - half
+    return np.clip(acc >> CORE_SHIFT, 0, CORE_OUT_MAX)
+
+def edge_case_table():
+    """
+    Hand-picked cases at the saturation and accumulator-width boundaries.
+
+    Every case uses an all-255 patch (except the zero case) and solves for
+    weights/bias so the pre-shift accumulator lands exactly on a target value:
+    around 0, around CORE_OUT_MAX << CORE_SHIFT (the 16-bit saturation point)
+    and around +/-2**(REF_ACC_WIDTH-1) (the 24-bit reference mask).
+    """
+    sat = CORE_OUT_MAX << CORE_SHIFT
+    lim = 1 << (REF_ACC_WIDTH - 1)
+    targets = [-257, -256, -1, 0, 255, 256,
+               sat - 1, sat, sat + 255, sat + 256,
+               lim - 1, lim, lim + 1, -lim - 1, -lim, -lim + 1]
+
+    patches, weights, biases = [], [], []
+    for target in targets:
+        rem = target
+        w = []
+        for _ in range(KERNEL_ELEMS):
+            wk = max(-32768, min(32767, rem // 255))
+            w.append(wk)
+            rem -= 255 * wk
+        # rem is now in [0, 255); push it into the bias.
+        patches.append([255] * KERNEL_ELEMS)
+        weights.append([w] * NUM_CHANNELS)
+        biases.append([rem] * NUM_CHANNELS)
+
+    # Absolute extremes of the 16-bit operands, plus the all-zero case.
+    for pix, wk, bk in ((255, 32767, 32767), (255, -32768, -32768), (0, 0, 0)):
+        patches.append([pix] * KERNEL_ELEMS)
+        weights.append([[wk] * KERNEL_ELEMS] * NUM_CHANNELS)
+        biases.append([bk] * NUM_CHANNELS)
+
+    return (np.array(patches, dtype=np.int64),
+            np.array(weights, dtype=np.int64),
+            np.array(biases,  dtype=np.int64))
+
+def random_case_table(rng, num_sets, patches_per_set):
+    """
+    Draw random weight/bias sets and patches. Half the sets use full-range
+    int16 weights (mostly saturating or ReLU-clamped outputs), half use
+    small Q8.8-like weights so the outputs land in the linear region.
+
+    Returns (patches, weights, biases, set_index) with one row per case.
+    """
+    set_w, set_b = [], []
+    for s in range(num_sets):
+        if s % 2:
+            w = rng.integers(-32768, 32768, size=(NUM_CHANNELS, KERNEL_ELEMS))
+            b = rng.integers(-32768, 32768, size=NUM_CHANNELS)
+        else:
+            w = rng.integers(-512, 512, size=(NUM_CHANNELS, KERNEL_ELEMS))
+            b = rng.integers(-4096, 4096, size=NUM_CHANNELS)
+        set_w.append(w)
+        set_b.append(b)
+
+    set_index = np.repeat(np.arange(num_sets), patches_per_set)
+    patches = rng.integers(0, 256, size=(set_index.size, KERNEL_ELEMS))
+    weights = np.array(set_w, dtype=np.int64)[set_index]
+    biases  = np.array(set_b, dtype=np.int64)[set_index]
+    return patches, weights, biases, set_index
+
 async def reset_dut(dut, duration_ns):
     dut._log.info("Applying reset to DUT...")
     dut.rst_n_main.value = 1
@@ -239,3 +379,70 @@ async def test_accelerator_system_spi(dut):
         dut._log.info(f"Approx. System Throughput (incl. SPI for 1 patch): {system_throughput_pps:.2f} patches/sec")
 
     await ClockCycles(dut.clk_main, 20)
+
+@cocotb.test()
+async def test_accelerator_system_spi_random(dut):
+    """
+    Randomized co-verification: stream edge-case and random patches through the
+    SPI interface and compare every result against a golden table computed
+    up front with expected_outputs().
+    """
+    cocotb.start_soon(Clock(dut.clk_main, CLK_MAIN_PERIOD_NS, units="ns").start())
+    cocotb.start_soon(Clock(dut.sclk_spi, SCLK_SPI_PERIOD_NS, units="ns").start())
+
+    dut.cs_n_spi.value = 1
+    dut.mosi_spi.value = 0
+
+    await reset_dut(dut, CLK_MAIN_PERIOD_NS * 5)
+
+    # cocotb seeds `random` from RANDOM_SEED, so the numpy draws are reproducible too.
+    rng = np.random.default_rng(random.getrandbits(32))
+
+    e_patches, e_weights, e_biases = edge_case_table()
+    r_patches, r_weights, r_biases, r_sets = random_case_table(
+        rng, RANDOM_WEIGHT_SETS, RANDOM_PATCHES_PER_SET)
+    if PATCH_SOURCE_IMAGE:
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+        from patch_stream import load_image, patch_windows
+        image_patches = patch_windows(load_image(PATCH_SOURCE_IMAGE)).reshape(-1, KERNEL_ELEMS)
+        r_patches = np.resize(image_patches, r_patches.shape)
+        dut._log.info(f"Random mode: patches taken from {PATCH_SOURCE_IMAGE}")
+
+    # Each edge case carries its own weights; random cases share per-set weights.
+    patches  = np.concatenate([e_patches, r_patches])
+    weights  = np.concatenate([e_weights, r_weights])
+    biases   = np.concatenate([e_biases,  r_biases])
+    set_keys = np.concatenate([-1 - np.arange(len(e_patches)), r_sets])
+
+    expected = expected_outputs(patches, weights, biases)
+    num_cases = len(patches)
+    dut._log.info(f"Random mode: {num_cases} cases "
+                  f"({len(e_patches)} edge, {RANDOM_WEIGHT_SETS}x{RANDOM_PATCHES_PER_SET} random); "
+                  f"{int(np.sum(expected == CORE_OUT_MAX))} saturated and "
+                  f"{int(np.sum(expected == 0))} ReLU-clamped channel outputs expected")
+
+    start_time_ns = cocotb.utils.get_sim_time(units='ns')
+    errors = 0
+    loaded_key = None
+    for n in range(num_cases):
+        if set_keys[n] != loaded_key:
+            await spi_write_command(dut, CMD_WRITE_WEIGHTS, words_to_be_bytes(weights[n].ravel()))
+            await spi_write_command(dut, CMD_WRITE_BIASES,  words_to_be_bytes(biases[n]))
+            loaded_key = set_keys[n]
+
+        await spi_write_command(dut, CMD_WRITE_PATCH, [int(p) for p in patches[n]])
+        await spi_write_command(dut, CMD_START_PROC)
+        assert await spi_wait_done(dut), f"Timeout on case {n}: DUT did not assert DONE"
+
+        hw_bytes  = await spi_read_results(dut)
+        ref_bytes = words_to_be_bytes(expected[n])
+        if hw_bytes != ref_bytes:
+            errors += 1
+            if errors <= RANDOM_MAX_ERRORS_LOG:
+                dut._log.error(f"Case {n}: patch={patches[n].tolist()} bias={biases[n].tolist()} "
+                               f"HW={[hex(b) for b in hw_bytes]} REF={[hex(b) for b in ref_bytes]}")
+
+    elapsed_ns = cocotb.utils.get_sim_time(units='ns') - start_time_ns
+    dut._log.info(f"Random mode: {num_cases - errors}/{num_cases} cases matched in "
+                  f"{elapsed_ns / 1e6:.2f} ms simulated ({elapsed_ns / num_cases / 1000:.2f} µs/case)")
+    assert errors == 0, f"{errors} of {num_cases} random cases mismatched"
@@ -0,0 +1,143 @@
+"""
+crossbar_conv.py
+
+Analog crossbar backend for the first Conv2D layer.
+
+Maps the 25x5 fixed-point weight matrix from weights0.mem onto a simulated
+memristor crossbar (challenge#20/crossbar_sim.py) using differential pairs:
+each output channel uses two bitlines, G+ for positive and G- for negative
+weights, so the signed result is I+ - I-. Every stride-3 patch of the image
+(im2col via patch_stream) becomes one vector of wordline read voltages, and
+the whole image is pushed through the array in batches.
+
+The bitline currents are scaled back to the accumulator domain, then bias,
+>>8 and ReLU are applied, and the result is compared against the
+fixed-point reference (image_ref.conv_fixed_point). The report also gives
+the MVM operation count and estimated latency next to the digital core.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from image_ref import read_signed_hex, conv_fixed_point
+from patch_stream import IMG_PATH, load_image, patch_windows
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "challenge#20"))
+from crossbar_sim import Crossbar  # noqa: E402
+
+# Configuration
+WEIGHTS_FILE = "weights0.mem"
+BIAS_FILE    = "bias0.mem"
+PATCH_DIM    = 5
+STRIDE       = 3
+OUT_CH       = 5
+SHIFT        = 8
+V_READ       = 0.15     # full-scale read voltage (below the 0.17 V switching threshold)
+BATCH        = 1024     # patches per crossbar batch
+T_READ_NS    = 100.0    # assumed analog read + ADC time per MVM
+# Digital core: N_cycles measured in functional simulation of the pipelined
+# design, at the synthesized Fmax (README "Hardware Performance Metrics")
+DIGITAL_CYCLES_PER_PATCH = 172
+DIGITAL_FMAX_MHZ         = 101.51
+
+
+def weights_to_crossbar(Wq, variation=0.0, r_wire=0.0, seed=0):
+    """
+    Program a (25, 2*OUT_CH) crossbar with differential weight pairs.
+
+    Column 2c holds max(W, 0) and column 2c+1 holds max(-W, 0) for channel c,
+    scaled linearly into the nominal [G_min, G_max] range.
+
+    Returns:
+        tuple: (crossbar, gain) where (I+ - I-) / gain = V @ W.
+    """
+    W = np.asarray(Wq, dtype=np.float64).T                 # (25, OUT_CH)
+    w_max = max(np.abs(W).max(), 1.0)
+    xbar = Crossbar(W.shape[0], 2 * OUT_CH, variation=variation, r_wire=r_wire, seed=seed)
+    g_min, g_max = (g.mean() for g in xbar.G_range)
+    g_span = g_max - g_min
+
+    G = np.empty((W.shape[0], 2 * OUT_CH))
+    G[:, 0::2] = g_min + np.maximum(W, 0) / w_max * g_span
+    G[:, 1::2] = g_min + np.maximum(-W, 0) / w_max * g_span
+    xbar.set_conductances(G)
+    return xbar, g_span / w_max
+
+
+def crossbar_conv(image, Wq, bq, xbar, gain, batch=BATCH):
+    """
+    Run every patch of `image` through the crossbar.
+
+    Returns:
+        tuple: (acc, out) with the estimated pre-shift accumulators and the
+        final >>SHIFT/ReLU outputs, each (OH, OW, OUT_CH).
+    """
+    win = patch_windows(image, PATCH_DIM, STRIDE)
+    grid = win.shape[:2]
+    cols = win.reshape(-1, PATCH_DIM * PATCH_DIM)         # im2col, (P, 25)
+
+    acc = np.empty((cols.shape[0], OUT_CH))
+    scale = 255.0 / V_READ
+    for start in range(0, cols.shape[0], batch):
+        V = cols[start:start + batch] * (V_READ / 255.0)
+        I = xbar.mvm(V)
+        acc[start:start + batch] = (I[:, 0::2] - I[:, 1::2]) / gain * scale
+
+    acc = np.rint(acc).astype(np.int64) + np.asarray(bq, dtype=np.int64)
+    out = np.maximum(acc >> SHIFT, 0)
+    return acc.reshape(*grid, OUT_CH), out.reshape(*grid, OUT_CH)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crossbar-backed first Conv2D layer.")
+    parser.add_argument("--image", default=IMG_PATH)
+    parser.add_argument("--variation", type=float, default=0.0,
+                        help="device-to-device parameter spread")
+    parser.add_argument("--r-wire", type=float, default=0.0,
+                        help="wire segment resistance in ohms (0 = ideal wires)")
+    parser.add_argument("--batch", type=int, default=BATCH)
+    args = parser.parse_args()
+
+    Wq = np.array(read_signed_hex(WEIGHTS_FILE, bits=16), dtype=np.int64).reshape(OUT_CH, -1)
+    bq = np.array(read_signed_hex(BIAS_FILE, bits=16), dtype=np.int64)
+    if os.path.exists(args.image):
+        image = load_image(args.image)
+    else:
+        print(f"{args.image} not found; using a random 256x256 image")
+        image = np.random.default_rng(0).integers(0, 256, (256, 256), dtype=np.uint8)
+
+    xbar, gain = weights_to_crossbar(Wq, args.variation, args.r_wire)
+
+    win = patch_windows(image, PATCH_DIM, STRIDE)
+    ref_out = conv_fixed_point(win, Wq, bq, SHIFT)
+    ref_acc = np.einsum("...uv,cuv->...c", win.astype(np.int64), Wq.reshape(OUT_CH, PATCH_DIM, PATCH_DIM)) + bq
+
+    start = time.perf_counter()
+    acc, out = crossbar_conv(image, Wq, bq, xbar, gain, args.batch)
+    elapsed = time.perf_counter() - start
+
+    num_mvm = out.shape[0] * out.shape[1]
+    print(f"Crossbar: 25x{2 * OUT_CH} differential array, variation={args.variation}, "
+          f"r_wire={args.r_wire} ohm; simulated {num_mvm} MVMs in {elapsed:.3f} s\n")
+
+    print(f"{'Ch':<3} | {'max |acc err|':>13} | {'mean |acc err|':>14} | {'max |out err|':>13} | {'outputs differing':>17}")
+    print("-" * 72)
+    for c in range(OUT_CH):
+        acc_err = np.abs(acc[..., c] - ref_acc[..., c])
+        out_err = np.abs(out[..., c] - ref_out[..., c])
+        print(f"{c:<3} | {acc_err.max():>13} | {acc_err.mean():>14.2f} | {out_err.max():>13} | "
+              f"{np.mean(out_err > 0):>16.2%}")
+
+    macs = num_mvm * PATCH_DIM * PATCH_DIM * OUT_CH
+    analog_us = num_mvm * T_READ_NS / 1e3
+    digital_us = num_mvm * DIGITAL_CYCLES_PER_PATCH / DIGITAL_FMAX_MHZ
+    print(f"\nMVM operations : {num_mvm} crossbar reads ({macs} MACs)")
+    print(f"Analog latency : {analog_us:.1f} us at {T_READ_NS:.0f} ns per read")
+    print(f"Digital core   : {digital_us:.1f} us at {DIGITAL_CYCLES_PER_PATCH} cycles/patch, {DIGITAL_FMAX_MHZ} MHz")
+
+
+if __name__ == "__main__":
+    main()
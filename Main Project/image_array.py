@@ -1,20 +1,24 @@
-from PIL import Image
 import numpy as np
 import os
 
+from patch_stream import patch_windows, write_patch_vec
+
 # 1) Point this at one of your test X-ray files:
 img_path = os.path.join("Covid19-dataset","test","covid","2.png")
 
-# 2) Load & preprocess to a (256×256) grayscale array
-img = Image.open(img_path).convert('L')           # grayscale PIL image
-img = img.resize((256,256))                       # same size your RTL expects
-your_image = np.array(img, dtype=np.uint8)        # shape (256,256)
+def write_first_patch(your_image, path="patch0.vec", i0=0, j0=0):
+    """Write the 5×5 patch at (i0, j0) of a (256×256) uint8 image, one value per line."""
+    # Pick the top-left 5×5 patch (or any other (i,j) window) as a view:
+    patch = patch_windows(your_image, patch_dim=5, stride=1)[i0, j0]
+    write_patch_vec(patch, path)
+
+if __name__ == "__main__":
+    from PIL import Image
 
-# 3) Extract the top-left 5×5 patch (or any other (i,j) window):
-i0, j0 = 0, 0  # change to test other locations
-patch = your_image[i0:i0+5, j0:j0+5]
+    # 2) Load & preprocess to a (256×256) grayscale array
+    img = Image.open(img_path).convert('L')           # grayscale PIL image
+    img = img.resize((256,256))                       # same size your RTL expects
+    your_image = np.array(img, dtype=np.uint8)        # shape (256,256)
 
-# 4) Write to patch0.vec, one value per line
-with open("patch0.vec","w") as f:
-    for v in patch.flatten():
-        f.write(f"{int(v)}\n")
+    # 3) + 4) Write the top-left patch to patch0.vec
+    write_first_patch(your_image, "patch0.vec")
@@ -1,6 +1,7 @@
 
 import numpy as np
-from PIL import Image
+
+from patch_stream import patch_windows
 
 # Configuration
 IMG_PATH    = "Covid19-dataset/test/covid/2.png"   # Place your 256×256 grayscale test image here
@@ -26,6 +27,45 @@ def read_signed_hex(fname, bits=16):
             vals.append(v)
     return vals
 
+def conv_fixed_point(windows, Wq, bq, shift=8):
+    """
+    Fixed-point conv for any block of patch views (e.g. from patch_stream).
+
+    Args:
+        windows: (..., PATCH_DIM, PATCH_DIM) uint8 patches.
+        Wq: (OUT_CH, PATCH_DIM*PATCH_DIM) signed weights.
+        bq: (OUT_CH,) signed biases.
+
+    Returns:
+        (..., OUT_CH) int64 outputs after arithmetic >>shift and ReLU.
+    """
+    Wk = np.asarray(Wq, dtype=np.int64).reshape(-1, PATCH_DIM, PATCH_DIM)
+    acc = np.einsum("...uv,cuv->...c", windows.astype(np.int64), Wk) + np.asarray(bq, dtype=np.int64)
+    return np.maximum(acc >> shift, 0)
+
+def write_image_mems(pix, Wq, bq, image_path="image.mem", ref_path="image_ref.mem"):
+    """
+    Write a (IMG_DIM, IMG_DIM) image as 2-digit hex and its channel-0 conv
+    outputs (raster order) as ACC_WIDTH-bit hex.
+
+    Returns:
+        list: The channel-0 reference values.
+    """
+    # Write image.mem (256×256 bytes, hex)
+    with open(image_path, "w") as f_img:
+        for val in pix.flatten():
+            f_img.write(f"{val:02x}\n")
+
+    # Compute channel-0 outputs for each 5×5 patch (raster order)
+    outs = conv_fixed_point(patch_windows(pix, PATCH_DIM, STRIDE), Wq, bq)
+    refs = outs[..., 0].ravel().tolist()
+
+    # Write image_ref.mem (84×84 entries, 24-bit hex => 6 hex digits)
+    with open(ref_path, "w") as f_ref:
+        for v in refs:
+            f_ref.write(f"{v & ((1<<ACC_WIDTH)-1):06x}\n")
+    return refs
+
 def main():
     # 1) Load fixed-point weights & biases
     Wraw = read_signed_hex("weights0.mem", bits=16)   # length = OUT_CH * PATCH_DIM*PATCH_DIM
@@ -34,31 +74,14 @@ def main():
     # Reshape weights into [OUT_CH, PATCH_DIM*PATCH_DIM]
     Wq = np.array(Wraw, dtype=int).reshape((OUT_CH, PATCH_DIM*PATCH_DIM))
 
-    # 2) Load and prepare image
+    # 2) Load and prepare image (PIL is only needed here)
+    from PIL import Image
     img = Image.open(IMG_PATH).convert("L").resize((IMG_DIM, IMG_DIM))
     pix = np.array(img, dtype=int)
 
-    # 3) Write image.mem (256×256 bytes, hex)
-    with open("image.mem", "w") as f_img:
-        for val in pix.flatten():
-            f_img.write(f"{val:02x}\n")
+    # 3)-5) Write image.mem and image_ref.mem
+    refs = write_image_mems(pix, Wq, bq)
     print(f"Wrote image.mem ({IMG_DIM*IMG_DIM} entries)")
-
-    # 4) Compute channel-0 outputs for each 5×5 patch
-    refs = []
-    for y in range(0, IMG_DIM - PATCH_DIM + 1, STRIDE):
-        for x in range(0, IMG_DIM - PATCH_DIM + 1, STRIDE):
-            patch = pix[y:y+PATCH_DIM, x:x+PATCH_DIM].flatten()
-            acc = int(np.dot(Wq[0], patch)) + bq[0]
-            # Arithmetic shift right by 8 bits, then ReLU
-            scaled = acc >> 8
-            relu   = max(0, scaled)
-            refs.append(relu)
-
-    # 5) Write image_ref.mem (84×84 entries, 24-bit hex => 6 hex digits)
-    with open("image_ref.mem", "w") as f_ref:
-        for v in refs:
-            f_ref.write(f"{v & ((1<<ACC_WIDTH)-1):06x}\n")
     print(f"Wrote image_ref.mem ({len(refs)} entries)")
 
     # 6) Summary
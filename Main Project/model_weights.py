@@ -0,0 +1,134 @@
+"""
+model_weights.py
+
+TensorFlow-free access to the trained Conv2D weights in covid_classifier.h5.
+
+A Keras HDF5 file stores each layer's weights as plain datasets under
+model_weights/<layer>/, and the layer order in its model_config attribute,
+so h5py is all that is needed to read the kernels and biases. The result is
+cached in weights_cache/<model>.<sha256 prefix>.npz, keyed by the hash of the
+model file: retraining invalidates the cache by itself, and regenerating
+.mem files costs one hash plus one small np.load instead of a TensorFlow
+import. Without h5py the weights are loaded through Keras, imported only then.
+
+Run directly to list the Conv2D layers and time cold vs cached lookups.
+"""
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+# Configuration
+MODEL_PATH = "covid_classifier.h5"
+CACHE_DIR  = os.path.join(os.path.dirname(os.path.abspath(__file__)), "weights_cache")
+HASH_CHUNK = 1 << 20
+
+
+def file_hash(path):
+    """SHA-256 hex digest of a file's contents."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_CHUNK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _text(value):
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+def _with_bias(kernel, bias=None):
+    """(kernel, bias) with a zero bias for layers built with use_bias=False."""
+    if bias is None:
+        bias = np.zeros(kernel.shape[-1], dtype=kernel.dtype)
+    return kernel, bias
+
+
+def _read_h5(path):
+    """[(kernel, bias), ...] for every Conv2D layer in model order, read with h5py."""
+    import h5py
+    with h5py.File(path, "r") as f:
+        config = json.loads(_text(f.attrs["model_config"]))["config"]
+        layers = config["layers"] if isinstance(config, dict) else config
+        weights = f["model_weights"] if "model_weights" in f else f
+        convs = []
+        for layer in layers:
+            if layer["class_name"] != "Conv2D":
+                continue
+            group = weights[layer["config"]["name"]]
+            # Dataset names look like "conv2d/kernel:0"
+            arrays = {_text(n).split("/")[-1].split(":")[0]: np.array(group[_text(n)])
+                      for n in group.attrs["weight_names"]}
+            convs.append(_with_bias(arrays["kernel"], arrays.get("bias")))
+    return convs
+
+
+def _read_keras(path):
+    """Fallback when h5py is missing: load the model with Keras."""
+    from tensorflow.keras.models import load_model
+    model = load_model(path, compile=False)
+    return [_with_bias(*layer.get_weights()) for layer in model.layers
+            if layer.__class__.__name__ == "Conv2D"]
+
+
+def conv_layers(path=MODEL_PATH, cache_dir=CACHE_DIR):
+    """
+    Kernels and biases of every Conv2D layer, from the cache while the model file is unchanged.
+
+    Returns:
+        list: (kernel, bias) per layer in model order; kernels are
+        (kh, kw, in_ch, out_ch) float32 as Keras stores them.
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    cache = os.path.join(cache_dir, f"{stem}.{file_hash(path)[:16]}.npz")
+    if os.path.exists(cache):
+        with np.load(cache) as data:
+            return [(data[f"kernel{i}"], data[f"bias{i}"]) for i in range(len(data.files) // 2)]
+
+    try:
+        convs = _read_h5(path)
+    except ImportError:
+        convs = _read_keras(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    arrays = {}
+    for i, (kernel, bias) in enumerate(convs):
+        arrays[f"kernel{i}"], arrays[f"bias{i}"] = kernel, bias
+    # Write then rename, so concurrent regenerations never read a partial file;
+    # the temp name is unique per writer (build_mem.py runs steps in threads)
+    fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=cache_dir)
+    with os.fdopen(fd, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp, cache)
+    return convs
+
+
+def conv_weights(index=0, path=MODEL_PATH, cache_dir=CACHE_DIR):
+    """(W, b) of the index-th Conv2D layer; index 0 is the layer the accelerator implements."""
+    return conv_layers(path, cache_dir)[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List Conv2D weights without importing TensorFlow.")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    convs = _read_h5(args.model)
+    t_h5 = time.perf_counter() - start
+    conv_layers(args.model, args.cache_dir)              # make sure the cache exists
+    start = time.perf_counter()
+    cached = conv_layers(args.model, args.cache_dir)
+    t_cache = time.perf_counter() - start
+
+    for i, ((W, b), (Wc, bc)) in enumerate(zip(convs, cached)):
+        same = np.array_equal(W, Wc) and np.array_equal(b, bc)
+        print(f"Conv2D #{i}: kernel {W.shape}, bias {b.shape}, cache {'matches' if same else 'DIFFERS'}")
+    print(f"h5py read: {t_h5 * 1e3:.1f} ms, cached lookup (hash + npz): {t_cache * 1e3:.1f} ms")
+
+if __name__ == "__main__":
+    main()
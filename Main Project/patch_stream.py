@@ -0,0 +1,147 @@
+"""
+patch_stream.py
+
+Zero-copy 5x5 patch source for the conv accelerator flow.
+
+Patches are strided NumPy views built with `sliding_window_view`, so scanning
+a full image (or a memmapped stack of images) never materializes a patch
+array or writes one patch0.vec per position. The same views feed:
+
+  * the fixed-point reference (`image_ref.conv_fixed_point`) as whole blocks,
+  * the cocotb SPI driver via `patch_to_bytes`,
+  * benchmarks via `iter_patch_blocks` / `iter_patches`.
+
+Run directly to time a full-image scan in raster and tiled order.
+"""
+import glob
+import os
+import time
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Configuration (matches image_ref.py / the RTL)
+IMG_PATH  = os.path.join("Covid19-dataset", "test", "covid", "2.png")
+IMG_DIM   = 256
+PATCH_DIM = 5
+STRIDE    = 3
+TILE      = 16   # output positions per tile edge in "tiled" order
+
+
+def load_image(path=IMG_PATH, dim=IMG_DIM):
+    """Load an X-ray as a (dim, dim) uint8 grayscale array, as image_array.py does."""
+    from PIL import Image
+    img = Image.open(path).convert("L").resize((dim, dim))
+    return np.array(img, dtype=np.uint8)
+
+
+def build_dataset(image_dir, out_path, dim=IMG_DIM):
+    """
+    Pack every image under image_dir (recursively, sorted) into one raw
+    uint8 file of shape (N, dim, dim) that `open_dataset` can memmap.
+    Returns the list of source paths in stored order.
+    """
+    paths = sorted(
+        p for ext in ("png", "jpg", "jpeg")
+        for p in glob.glob(os.path.join(image_dir, "**", f"*.{ext}"), recursive=True)
+    )
+    out = np.lib.format.open_memmap(out_path, mode="w+", dtype=np.uint8,
+                                    shape=(len(paths), dim, dim))
+    for i, p in enumerate(paths):
+        out[i] = load_image(p, dim)
+    out.flush()
+    return paths
+
+
+def open_dataset(path):
+    """Memmap a dataset written by `build_dataset` (read-only, nothing loaded up front)."""
+    return np.load(path, mmap_mode="r")
+
+
+def patch_windows(images, patch_dim=PATCH_DIM, stride=STRIDE):
+    """
+    Strided view of every patch position.
+
+    Args:
+        images: (H, W) image or (N, H, W) stack; ndarray or np.memmap.
+        patch_dim: square patch edge.
+        stride: step between patch origins in both directions.
+
+    Returns:
+        View of shape (OH, OW, patch_dim, patch_dim) for a single image or
+        (N, OH, OW, patch_dim, patch_dim) for a stack. Shares memory with
+        `images`; no pixel data is copied.
+    """
+    single = images.ndim == 2
+    if single:
+        images = images[np.newaxis]
+    win = sliding_window_view(images, (patch_dim, patch_dim), axis=(1, 2))
+    win = win[:, ::stride, ::stride]
+    return win[0] if single else win
+
+
+def iter_patch_blocks(images, order="raster", tile=TILE,
+                      patch_dim=PATCH_DIM, stride=STRIDE):
+    """
+    Yield (n, y, x, block) where block is a (rows, cols, patch_dim, patch_dim)
+    view and (y, x) is the pixel origin of its top-left patch in image n.
+
+    order="raster" yields one output row per block; order="tiled" yields
+    tile x tile groups of output positions, left-to-right, top-to-bottom.
+    """
+    if order not in ("raster", "tiled"):
+        raise ValueError(f"Unknown patch order '{order}' (expected 'raster' or 'tiled')")
+
+    win = patch_windows(images, patch_dim, stride)
+    if win.ndim == 4:
+        win = win[np.newaxis]
+    num_images, out_h, out_w = win.shape[:3]
+    row_step = 1 if order == "raster" else tile
+    col_step = out_w if order == "raster" else tile
+
+    for n in range(num_images):
+        for oy in range(0, out_h, row_step):
+            for ox in range(0, out_w, col_step):
+                block = win[n, oy:oy + row_step, ox:ox + col_step]
+                yield n, oy * stride, ox * stride, block
+
+
+def iter_patches(images, order="raster", tile=TILE,
+                 patch_dim=PATCH_DIM, stride=STRIDE):
+    """Yield (n, y, x, patch) for every position, each patch a (patch_dim, patch_dim) view."""
+    for n, y0, x0, block in iter_patch_blocks(images, order, tile, patch_dim, stride):
+        for i in range(block.shape[0]):
+            for j in range(block.shape[1]):
+                yield n, y0 + i * stride, x0 + j * stride, block[i, j]
+
+
+def patch_to_bytes(patch):
+    """Row-major pixel bytes, as the SPI driver sends CMD_WRITE_PATCH."""
+    return [int(v) for v in np.asarray(patch).ravel()]
+
+
+def write_patch_vec(patch, path="patch0.vec"):
+    """Write one patch in the decimal patch0.vec format read by the testbenches."""
+    with open(path, "w") as f:
+        for v in patch_to_bytes(patch):
+            f.write(f"{v}\n")
+
+
+def main():
+    image = load_image() if os.path.exists(IMG_PATH) else \
+        np.random.default_rng(0).integers(0, 256, (IMG_DIM, IMG_DIM), dtype=np.uint8)
+
+    win = patch_windows(image)
+    print(f"Patch grid: {win.shape[0]}x{win.shape[1]} positions, "
+          f"shares memory with image: {np.shares_memory(win, image)}")
+
+    for order in ("raster", "tiled"):
+        start = time.perf_counter()
+        count = sum(1 for _ in iter_patches(image, order=order))
+        elapsed = time.perf_counter() - start
+        print(f"{order:<7}: {count} patch views in {elapsed * 1e3:.2f} ms "
+              f"({count / elapsed:,.0f} patches/s)")
+
+
+if __name__ == "__main__":
+    main()
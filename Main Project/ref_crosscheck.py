@@ -0,0 +1,224 @@
+"""
+ref_crosscheck.py
+
+Cross-checks the float model against the Q8.8 fixed-point datapath on every
+patch of every image, and checks the single-patch reference files against both.
+
+The two references disagree in format. testbench.py writes the float
+conv as decimal int(max(acc, 0)) to ref0_float.vec. gen_ref.py writes the
+Q8.8 result, ReLU(acc >> 8), as 4-digit hex to ref0.vec, which is what the
+RTL is compared against. This script puts both in the same units (the
+weights are scaled by 256 and the accumulator is shifted back by 8), then
+for each output channel reports:
+
+  * max |fixed - float| and mean error,
+  * a histogram of the error,
+  * the positions where the error exceeds what Q8.8 rounding can explain.
+
+That bound is computed per patch: each weight and bias is off by at most
+half an LSB, so the accumulator is off by at most (0.5*sum(patch) + 0.5)/256,
+and the >> 8 drops less than one more. A larger error means the .mem files
+do not come from this model (stale or wrong weights, 16-bit wrap).
+
+Then patch0.vec / ref0.vec / ref0_float.vec and the cocotb copy of ref0.vec
+are checked, recognising a decimal float reference left in ref0.vec.
+
+Usage:
+    python ref_crosscheck.py [dataset.npy | image_dir] [--tol 1.5] [--stride 3]
+
+Without a dataset, random 8-bit images are used. Exits with status 1 when
+anything is flagged, so it can gate a long simulation.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from acc_width_analysis import load_images
+from image_ref import conv_fixed_point, read_signed_hex
+from model_weights import MODEL_PATH, conv_weights
+from patch_stream import IMG_DIM, patch_windows
+from testbench import float_ref
+
+# Configuration
+DATASET          = "Covid19-dataset/test"
+WEIGHTS_FILE     = "weights0.mem"
+BIAS_FILE        = "bias0.mem"
+PATCH_FILE       = "patch0.vec"
+REF_FILE         = "ref0.vec"
+REF_FLOAT_FILE   = "ref0_float.vec"
+COCOTB_REF_FILE  = os.path.join("conv_accelerator_cocotb_test", "ref0.vec")
+PATCH_DIM        = 5
+STRIDE           = 3
+OUT_CH           = 5
+SHIFT            = 8
+IMAGES_PER_BATCH = 8
+RANDOM_IMAGES    = 32
+HIST_EDGES       = np.arange(-4.0, 4.5, 0.5)   # outer bins also count everything beyond them
+MAX_EXAMPLES     = 10
+
+
+def error_bound(windows):
+    """Largest |fixed - float| Q8.8 rounding allows for each patch, shape (...,)."""
+    q = (0.5 * windows.sum(axis=(-2, -1), dtype=np.int64) + 0.5) / (1 << SHIFT)
+    return q + 1.0
+
+
+def cross_check(images, W, b, Wq, bq, stride=STRIDE, tol=None, batch=IMAGES_PER_BATCH):
+    """
+    Float and fixed-point conv over every patch of `images`, in image batches.
+
+    Args:
+        W, b: float kernel (5, 5, 1, OUT_CH) and bias, as from model_weights.
+        Wq, bq: (OUT_CH, 25) and (OUT_CH,) integer weights from the .mem files.
+        tol: fixed absolute tolerance; None uses the per-patch rounding bound.
+
+    Returns:
+        dict: per-channel (OUT_CH,) arrays max_abs, sum_err, flagged, a
+        (OUT_CH, bins) hist, num_patches, and up to MAX_EXAMPLES flagged
+        (image, row, col, channel, fixed, float, allowed) tuples.
+    """
+    Wf = np.asarray(W, dtype=np.float64)[:, :, 0, :]
+    bf = np.asarray(b, dtype=np.float64)
+    stats = {
+        "max_abs": np.zeros(OUT_CH),
+        "sum_err": np.zeros(OUT_CH),
+        "flagged": np.zeros(OUT_CH, np.int64),
+        "hist": np.zeros((OUT_CH, len(HIST_EDGES) - 1), np.int64),
+        "num_patches": 0,
+        "examples": [],
+    }
+
+    for start in range(0, len(images), batch):
+        win = patch_windows(np.asarray(images[start:start + batch]), PATCH_DIM, stride)   # (N, OH, OW, 5, 5)
+        fixed = conv_fixed_point(win, Wq, bq, SHIFT)
+        flt = np.maximum(np.einsum("...uv,uvc->...c", win.astype(np.float64), Wf) + bf, 0.0)
+        err = fixed - flt                                                                 # (N, OH, OW, C)
+        allowed = error_bound(win)[..., None] if tol is None else np.full(err.shape, tol)
+
+        flat = err.reshape(-1, OUT_CH)
+        stats["max_abs"] = np.maximum(stats["max_abs"], np.abs(flat).max(axis=0))
+        stats["sum_err"] += flat.sum(axis=0)
+        clipped = np.clip(flat, HIST_EDGES[0], HIST_EDGES[-1])
+        stats["hist"] += np.stack([np.histogram(clipped[:, c], HIST_EDGES)[0] for c in range(OUT_CH)])
+        stats["num_patches"] += flat.shape[0]
+
+        bad = np.abs(err) > np.broadcast_to(allowed, err.shape)
+        stats["flagged"] += bad.reshape(-1, OUT_CH).sum(axis=0)
+        for n, i, j, c in np.argwhere(bad)[:MAX_EXAMPLES - len(stats["examples"])]:
+            stats["examples"].append((start + int(n), int(i), int(j), int(c), int(fixed[n, i, j, c]),
+                                      float(flt[n, i, j, c]), float(np.broadcast_to(allowed, err.shape)[n, i, j, c])))
+    return stats
+
+
+def quantization_check(W, b, Wq, bq):
+    """Largest |.mem value - model value * 256| over the weights and over the biases (<= 0.5 when in sync)."""
+    scale = 1 << SHIFT
+    w_model = np.asarray(W, dtype=np.float64)[:, :, 0, :].reshape(-1, OUT_CH).T * scale   # channel-major like the .mem
+    return float(np.abs(Wq - w_model).max()), float(np.abs(bq - np.asarray(b, dtype=np.float64) * scale).max())
+
+
+def _read_decimal(path):
+    try:
+        return np.loadtxt(path, dtype=np.int64, ndmin=1)
+    except ValueError:
+        return None
+
+
+def check_reference_files(W, b, Wq, bq):
+    """
+    Compare the single-patch reference files with both models.
+
+    Returns:
+        list: (file, ok, message) per file that exists.
+    """
+    if not os.path.exists(PATCH_FILE):
+        return [(PATCH_FILE, False, "missing")]
+    patch = np.loadtxt(PATCH_FILE, dtype=np.int64).reshape(PATCH_DIM, PATCH_DIM)
+    fixed = conv_fixed_point(patch, Wq, bq, SHIFT).tolist()
+    flt = float_ref(patch, W, b)
+    checks = []
+
+    for path in (REF_FILE, COCOTB_REF_FILE):
+        if not os.path.exists(path):
+            continue
+        hex_vals = [v & 0xFFFF for v in read_signed_hex(path, bits=16)]
+        if hex_vals == [v & 0xFFFF for v in fixed]:
+            checks.append((path, True, f"matches gen_ref.py (Q8.8 hex) {fixed}"))
+        elif _read_decimal(path) is not None and _read_decimal(path).tolist() == flt:
+            checks.append((path, False, f"holds the decimal float reference {flt} from testbench.py; "
+                                        f"regenerate with gen_ref.py (expected {fixed})"))
+        else:
+            checks.append((path, False, f"read as hex {hex_vals}, expected {fixed} from {WEIGHTS_FILE}/{BIAS_FILE}"))
+
+    if os.path.exists(REF_FLOAT_FILE):
+        vals = _read_decimal(REF_FLOAT_FILE)
+        ok = vals is not None and vals.tolist() == flt
+        checks.append((REF_FLOAT_FILE, ok, f"{'matches' if ok else 'differs from'} the float model {flt}"))
+    return checks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Float vs Q8.8 conv cross-check over a dataset.")
+    parser.add_argument("dataset", nargs="?", default=DATASET,
+                        help="image directory or .npy written by patch_stream.build_dataset")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--weights", default=WEIGHTS_FILE)
+    parser.add_argument("--bias", default=BIAS_FILE)
+    parser.add_argument("--stride", type=int, default=STRIDE)
+    parser.add_argument("--tol", type=float, help="absolute tolerance (default: per-patch Q8.8 rounding bound)")
+    args = parser.parse_args()
+
+    W, b = conv_weights(path=args.model)
+    Wq = np.array(read_signed_hex(args.weights, bits=16), dtype=np.int64).reshape(OUT_CH, -1)
+    bq = np.array(read_signed_hex(args.bias, bits=16), dtype=np.int64)
+    if os.path.exists(args.dataset):
+        images = load_images(args.dataset)
+    else:
+        print(f"{args.dataset} not found, using {RANDOM_IMAGES} random images")
+        images = np.random.default_rng(0).integers(0, 256, (RANDOM_IMAGES, IMG_DIM, IMG_DIM), dtype=np.uint8)
+
+    problems = 0
+    w_err, b_err = quantization_check(W, b, Wq, bq)
+    in_sync = w_err <= 0.5 and b_err <= 0.5
+    problems += not in_sync
+    print(f"{args.weights}/{args.bias} vs {args.model} x 256: max |diff| weights {w_err:.3f}, "
+          f"bias {b_err:.3f} LSB -> {'in sync' if in_sync else 'OUT OF SYNC'}")
+
+    t0 = time.perf_counter()
+    stats = cross_check(images, W, b, Wq, bq, args.stride, args.tol)
+    elapsed = time.perf_counter() - t0
+    print(f"Checked {len(images)} images / {stats['num_patches']} patches x {OUT_CH} channels in {elapsed:.2f} s "
+          f"({stats['num_patches'] / elapsed:,.0f} patches/s)\n")
+
+    tol_label = f"|err| > {args.tol}" if args.tol is not None else "|err| > bound"
+    print(f"{'Ch':<3} | {'max |err|':>9} | {'mean err':>9} | {tol_label:>13}")
+    print("-" * 44)
+    for c in range(OUT_CH):
+        print(f"{c:<3} | {stats['max_abs'][c]:>9.4f} | {stats['sum_err'][c] / stats['num_patches']:>9.4f} | "
+              f"{stats['flagged'][c]:>13}")
+
+    print("\nError histogram (fixed - float, bins of 0.5; outer bins include everything beyond):")
+    print("bin >= " + " ".join(f"{e:>7.1f}" for e in HIST_EDGES[:-1]))
+    for c in range(OUT_CH):
+        print(f"ch {c:<3} " + " ".join(f"{n:>7}" for n in stats["hist"][c]))
+
+    flagged = int(stats["flagged"].sum())
+    problems += flagged > 0
+    if flagged:
+        print(f"\n{flagged} disagreements; first {len(stats['examples'])}:")
+        print(f"{'image':>6} | {'row':>4} | {'col':>4} | {'ch':>3} | {'fixed':>6} | {'float':>10} | {'allowed':>8}")
+        for n, i, j, c, fx, fl, allowed in stats["examples"]:
+            print(f"{n:>6} | {i:>4} | {j:>4} | {c:>3} | {fx:>6} | {fl:>10.4f} | {allowed:>8.4f}")
+
+    print("\nReference files:")
+    for path, ok, message in check_reference_files(W, b, Wq, bq):
+        problems += not ok
+        print(f"  {'OK  ' if ok else 'FAIL'} {path}: {message}")
+
+    if problems:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import filecmp
+import glob
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+COCOTB_DIR = "conv_accelerator_cocotb_test"
+COCOTB_FILES = ["weights0.mem", "bias0.mem", "patch0.vec", "ref0.vec"]
+
+
+def _copy_project(tmp):
+    """The build inputs and tracked outputs, without the X-ray (not in the repo)."""
+    for path in glob.glob(os.path.join(HERE, "*.py")) + glob.glob(os.path.join(HERE, "*.mem")) + \
+            glob.glob(os.path.join(HERE, "*.vec")) + [os.path.join(HERE, "covid_classifier.h5")]:
+        shutil.copy(path, tmp)
+    os.makedirs(os.path.join(tmp, COCOTB_DIR))
+    for name in COCOTB_FILES:
+        shutil.copy(os.path.join(HERE, COCOTB_DIR, name), os.path.join(tmp, COCOTB_DIR))
+
+
+def _build(tmp, *args):
+    return subprocess.run([sys.executable, "build_mem.py", *args], cwd=tmp, capture_output=True, text=True)
+
+
+class TestBuildMem(unittest.TestCase):
+    def test_cold_parallel_build(self):
+        # Every step that reads the model starts on an empty weights_cache at once
+        with tempfile.TemporaryDirectory() as tmp:
+            _copy_project(tmp)
+            for _ in range(3):
+                shutil.rmtree(os.path.join(tmp, "weights_cache"), ignore_errors=True)
+                run = _build(tmp, "--all", "-f", "-j", "4")
+                self.assertEqual(run.returncode, 0, run.stdout + run.stderr)
+                self.assertNotIn("failed", run.stdout)
+                self.assertEqual(len(os.listdir(os.path.join(tmp, "weights_cache"))), 1)
+            with open(os.path.join(tmp, "ref0.vec")) as f, open(os.path.join(HERE, "ref0.vec")) as g:
+                self.assertEqual(f.read(), g.read())
+
+    def test_first_build_leaves_tracked_files_unchanged(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            _copy_project(tmp)
+            run = _build(tmp)
+            self.assertEqual(run.returncode, 0, run.stdout + run.stderr)
+            for name in ["weights0.mem", "bias0.mem", "patch0.vec", "ref0.vec", "image.mem", "image_ref.mem"] + \
+                    [os.path.join(COCOTB_DIR, f) for f in COCOTB_FILES]:
+                self.assertTrue(filecmp.cmp(os.path.join(tmp, name), os.path.join(HERE, name), shallow=False), name)
+
+    def test_kept_outputs_fail_when_weights_change(self):
+        # image.mem is kept without the X-ray, but image_ref.mem goes stale with new weights
+        import h5py
+        with tempfile.TemporaryDirectory() as tmp:
+            _copy_project(tmp)
+            self.assertEqual(_build(tmp).returncode, 0)
+            model = os.path.join(tmp, "retrained.h5")
+            shutil.copy(os.path.join(tmp, "covid_classifier.h5"), model)
+            with h5py.File(model, "r+") as f:
+                kernels = []
+                f.visititems(lambda name, obj: kernels.append(obj)
+                             if isinstance(obj, h5py.Dataset) and "kernel" in name else None)
+                kernels[0][...] = kernels[0][...] * 1.5
+            for _ in range(2):                      # the rebuild, then every later run
+                run = _build(tmp, "--model", "retrained.h5")
+                self.assertEqual(run.returncode, 1, run.stdout + run.stderr)
+                self.assertRegex(run.stdout, r"image\s+\| failed .*outputs are stale")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,33 +1,38 @@
-
 import numpy as np
-from tensorflow.keras.models import load_model
+from model_weights import conv_weights
+
+# Float reference; ref0.vec (fixed-point, hex) comes from gen_ref.py
+OUT_PATH = "ref0_float.vec"
 
-# 1) Load the 5×5 patch you already generated
-patch = np.loadtxt("patch0.vec", dtype=np.int32)
-patch = patch.reshape(5, 5, 1)   # shape: [H,W,channels]
+def float_ref(patch, W, b):
+    """The 5 outputs ReLU(sum(patch * W[..., k]) + b[k]) of the float model, as ints."""
+    patch = np.asarray(patch).reshape(5, 5, 1)   # shape: [H,W,channels]
+    outs = []
+    for k in range(W.shape[3]):
+        filt = W[..., k]      # shape (5,5,1)
+        acc  = np.sum(patch * filt) + b[k]
+        outs.append(int(max(acc, 0)))  # apply ReLU and cast to integer
+    return outs
 
-# 2) Load your trained model and extract the first Conv2D layer’s weights
-model = load_model("covid_classifier.h5")
-# Inspect model.layers to find your first Conv2D:
-for i, layer in enumerate(model.layers):
-    if layer.__class__.__name__ == "Conv2D":
-        conv_idx = i
-        break
+def write_float_ref(patch_path="patch0.vec", out_path=OUT_PATH, W=None, b=None):
+    # 1) Load the 5×5 patch you already generated
+    patch = np.loadtxt(patch_path, dtype=np.int32)
 
-W, b = model.layers[conv_idx].get_weights()
-# W has shape (5,5,1,5), b has shape (5,)
+    # 2) Extract the first Conv2D layer’s weights from the trained model
+    if W is None:
+        W, b = conv_weights()
+    # W has shape (5,5,1,5), b has shape (5,)
 
-# 3) Compute the 5 outputs: out[k] = ReLU( sum(patch * W[...,k]) + b[k] )
-outs = []
-for k in range(W.shape[3]):
-    filt = W[..., k]      # shape (5,5,1)
-    acc  = np.sum(patch * filt) + b[k]
-    outs.append(int(max(acc, 0)))  # apply ReLU and cast to integer
+    # 3) Compute the 5 outputs: out[k] = ReLU( sum(patch * W[...,k]) + b[k] )
+    outs = float_ref(patch, W, b)
 
-# 4) Save them to ref0.vec, one per line
-with open("ref0.vec", "w") as f:
-    for v in outs:
-        f.write(f"{v}\n")
+    # 4) Save them one per line
+    with open(out_path, "w") as f:
+        for v in outs:
+            f.write(f"{v}\n")
+    return outs
 
-print("Generated ref0.vec:")
-print(outs)
+if __name__ == "__main__":
+    outs = write_float_ref()
+    print(f"Generated {OUT_PATH}:")
+    print(outs)
@@ -1,27 +1,29 @@
 import numpy as np
-from tensorflow.keras.models import load_model
-
-# Load your trained model
-model = load_model("covid_classifier.h5")
-conv  = next(l for l in model.layers if l.__class__.__name__ == "Conv2D")
-W, b  = conv.get_weights()  # W.shape==(5,5,1,5), b.shape==(5,)
+from model_weights import conv_weights
 
 # Fixed-point scale: Q8.8
 SCALE = 256
-Wq = np.round(W * SCALE).astype(np.int16)  # signed 16-bit
-bq = np.round(b * SCALE).astype(np.int16)
 
-# Write weights0.mem (125 entries, 4-digit hex)
-with open("weights0.mem","w") as f:
-    for c in range(Wq.shape[3]):
-        for u in range(5):
-            for v in range(5):
-                w = int(Wq[u,v,0,c]) & 0xFFFF
-                f.write(f"{w:04x}\n")
+def write_weights_mem(W, b, weights_path="weights0.mem", bias_path="bias0.mem"):
+    """Write Q8.8 conv weights (channel-major) and biases as 4-digit hex."""
+    Wq = np.round(W * SCALE).astype(np.int16)  # signed 16-bit
+    bq = np.round(b * SCALE).astype(np.int16)
+
+    # Write weights0.mem (125 entries, 4-digit hex)
+    with open(weights_path,"w") as f:
+        for c in range(Wq.shape[3]):
+            for u in range(5):
+                for v in range(5):
+                    w = int(Wq[u,v,0,c]) & 0xFFFF
+                    f.write(f"{w:04x}\n")
 
-# Write bias0.mem (5 entries, 4-digit hex)
-with open("bias0.mem","w") as f:
-    for val in bq:
-        f.write(f"{(int(val)&0xFFFF):04x}\n")
+    # Write bias0.mem (5 entries, 4-digit hex)
+    with open(bias_path,"w") as f:
+        for val in bq:
+            f.write(f"{(int(val)&0xFFFF):04x}\n")
 
-print("Regenerated weights0.mem & bias0.mem with Q8.8 (scale=256)")
+if __name__ == "__main__":
+    # First Conv2D layer of the trained model (h5py + .npz cache, no TensorFlow import)
+    W, b  = conv_weights()  # W.shape==(5,5,1,5), b.shape==(5,)
+    write_weights_mem(W, b)
+    print("Regenerated weights0.mem & bias0.mem with Q8.8 (scale=256)")
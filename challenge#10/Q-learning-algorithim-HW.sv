@@ -1,6 +1,10 @@
 module q_update_datapath #(
     parameter DATA_WIDTH = 32,
-    parameter NUM_ACTIONS = 4
+    parameter NUM_ACTIONS = 4,
+    // Fractional bits of learning_rate and gamma. Products are shifted right
+    // by FRAC_BITS so they stay in the Q/reward format; 0 keeps plain integer
+    // arithmetic. q_learning_fixed.py models this datapath bit-exactly.
+    parameter FRAC_BITS = 0
 ) (
     input  logic signed [DATA_WIDTH-1:0] q_current,
     input  logic signed [DATA_WIDTH-1:0] reward,
@@ -10,13 +14,14 @@ module q_update_datapath #(
     output logic signed [DATA_WIDTH-1:0] q_new
 );
 
-    logic signed [DATA_WIDTH-1:0] term1, term2, term3;
+    logic signed [DATA_WIDTH-1:0] term1, term2, term3, scaled_td;
+    logic signed [2*DATA_WIDTH-1:0] prod1, prod2;
 
     // term1 = gamma * max_q_next
-    // Note: For actual hardware, this would likely be implemented with fixed-point
-    // arithmetic and potentially shifters for powers of two.
+    // Full-width product, then rescale by FRAC_BITS and truncate to DATA_WIDTH.
     always_comb begin
-        term1 = gamma * q_next_max;
+        prod1 = gamma * q_next_max;
+        term1 = prod1 >>> FRAC_BITS;
     end
 
     // term2 = reward + term1
@@ -31,7 +36,9 @@ module q_update_datapath #(
 
     // q_new = q_current + learning_rate * term3
     always_comb begin
-        q_new = q_current + (learning_rate * term3);
+        prod2     = learning_rate * term3;
+        scaled_td = prod2 >>> FRAC_BITS;
+        q_new     = q_current + scaled_td;
     end
 
-endmodule
\ No newline at end of file
+endmodule
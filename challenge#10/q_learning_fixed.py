@@ -0,0 +1,168 @@
+"""
+Fixed-point, bit-exact Q-learning reference for q_update_datapath.
+
+Runs the vectorized grid-world engine from q_learning_vec.py with integer
+Q-values and the exact arithmetic of Q-learning-algorithim-HW.sv:
+
+    term1     = (gamma * q_next_max)           >>> FRAC_BITS   (wrap to DATA_WIDTH)
+    term2     =  reward + term1                                (wrap)
+    term3     =  term2 - q_current                             (wrap)
+    q_new     =  q_current + ((learning_rate * term3) >>> FRAC_BITS)   (wrap)
+
+Q-values and rewards use `value_frac_bits` fractional bits, alpha and gamma
+use `coef_frac_bits` (the RTL FRAC_BITS parameter). Exploration uses one
+xorshift32 generator per environment so runs are reproducible outside Python:
+
+    seed_e   = ((seed + 1) * 0x9E3779B1 + e * 0x85EBCA6B) mod 2**32, or'ed with 1
+    x ^= x << 13; x ^= x >> 17; x ^= x << 5          (once per env per engine step)
+    explore  = (x & 0xFFFF) < round(epsilon * 2**16)
+    action   = (x >> 16) & 3                          (when exploring)
+
+Every TD update of the traced environments is written to one trace file per
+episode, with the datapath inputs and expected output in hex, ready to drive
+q_update_datapath from a testbench.
+"""
+import os
+import time
+
+import numpy as np
+
+from q_learning_vec import GridWorld, VectorQLearner, NUM_ACTIONS
+
+DATA_WIDTH = 32
+VALUE_FRAC_BITS = 16
+COEF_FRAC_BITS = 16
+TRACE_DIR = "traces"
+
+
+def wrap(x, width=DATA_WIDTH):
+    """Two's-complement wrap of int64 values to `width` bits."""
+    half = np.int64(1) << (width - 1)
+    return ((x + half) & ((np.int64(1) << width) - 1)) - half
+
+
+def to_fixed(x, frac_bits):
+    """Round real values to the nearest fixed-point integer (half away from zero)."""
+    scaled = np.asarray(x, dtype=np.float64) * (1 << frac_bits)
+    return (np.sign(scaled) * np.floor(np.abs(scaled) + 0.5)).astype(np.int64)
+
+
+def q_update(q_current, reward, q_next_max, learning_rate, gamma,
+             width=DATA_WIDTH, frac_bits=COEF_FRAC_BITS):
+    """Bit-exact, vectorized model of q_update_datapath (int64 in, int64 out)."""
+    term1 = wrap((gamma * q_next_max) >> frac_bits, width)
+    term2 = wrap(reward + term1, width)
+    term3 = wrap(term2 - q_current, width)
+    scaled_td = wrap((learning_rate * term3) >> frac_bits, width)
+    return wrap(q_current + scaled_td, width)
+
+
+class FixedPointQLearner(VectorQLearner):
+    """
+    VectorQLearner with integer Q-tables and the q_update_datapath arithmetic.
+
+    Args:
+        world, num_envs, alpha, gamma, epsilon, shared_q, seed: as VectorQLearner.
+        width (int): DATA_WIDTH of the datapath.
+        value_frac_bits (int): fractional bits of Q-values and rewards.
+        coef_frac_bits (int): fractional bits of alpha and gamma (FRAC_BITS).
+        trace_envs (list): environments whose updates are written to trace files.
+        trace_dir (str): directory for the trace files.
+    """
+    q_dtype = np.int64
+
+    def __init__(self, world, num_envs=64, alpha=0.5, gamma=0.9, epsilon=0.1,
+                 shared_q=False, seed=0, width=DATA_WIDTH,
+                 value_frac_bits=VALUE_FRAC_BITS, coef_frac_bits=COEF_FRAC_BITS,
+                 trace_envs=(), trace_dir=TRACE_DIR):
+        super().__init__(world, num_envs, alpha, gamma, epsilon, shared_q, seed)
+        self.width = width
+        self.value_frac_bits = value_frac_bits
+        self.coef_frac_bits = coef_frac_bits
+        self.alpha_fx = int(to_fixed(alpha, coef_frac_bits))
+        self.gamma_fx = int(to_fixed(gamma, coef_frac_bits))
+        self.epsilon_threshold = int(round(epsilon * (1 << 16)))
+        self.reward_values = wrap(to_fixed(world.reward, value_frac_bits), width)
+
+        e = np.arange(num_envs, dtype=np.uint64)
+        seeds = ((seed + 1) * 0x9E3779B1 + e * 0x85EBCA6B) & 0xFFFFFFFF
+        self.lfsr = (seeds | 1).astype(np.uint32)
+
+        self.trace_envs = list(trace_envs)
+        self.trace_dir = trace_dir
+        self.tracing = bool(self.trace_envs)
+        self._trace_rows = {env: [] for env in self.trace_envs}
+        if self.tracing:
+            os.makedirs(trace_dir, exist_ok=True)
+
+    def next_random(self):
+        """Advance every environment's xorshift32 generator once."""
+        x = self.lfsr
+        x ^= x << np.uint32(13)
+        x ^= x >> np.uint32(17)
+        x ^= x << np.uint32(5)
+        return x
+
+    def choose_actions(self, state):
+        q = self.Q[self.table, state]
+        greedy = NUM_ACTIONS - 1 - np.argmax(q[:, ::-1], axis=1)
+        r = self.next_random()
+        explore = (r & np.uint32(0xFFFF)) < self.epsilon_threshold
+        random_actions = ((r >> np.uint32(16)) & np.uint32(NUM_ACTIONS - 1)).astype(np.int64)
+        return np.where(explore, random_actions, greedy)
+
+    def td_update(self, q_sa, reward, q_next_max):
+        return q_update(q_sa, reward, q_next_max, self.alpha_fx, self.gamma_fx,
+                        self.width, self.coef_frac_bits)
+
+    def record_updates(self, mask, episode, state, action, nxt, q_sa, reward, q_next_max, new_q):
+        for env in self.trace_envs:
+            if mask[env]:
+                self._trace_rows[env].append((state[env], action[env], nxt[env], q_sa[env],
+                                              reward[env], q_next_max[env], new_q[env]))
+
+    def end_episodes(self, mask, episode):
+        for env in self.trace_envs:
+            if mask[env]:
+                self.write_trace(env, int(episode[env]))
+
+    def write_trace(self, env, episode):
+        """Write and clear the buffered updates of one environment's episode."""
+        digits = self.width // 4
+        mask = (1 << self.width) - 1
+        path = os.path.join(self.trace_dir, f"env{env:03d}_ep{episode:05d}.trace")
+        with open(path, "w") as f:
+            f.write(f"// q_update_datapath trace: DATA_WIDTH={self.width} FRAC_BITS={self.coef_frac_bits} "
+                    f"VALUE_FRAC_BITS={self.value_frac_bits} "
+                    f"learning_rate={self.alpha_fx & mask:0{digits}x} gamma={self.gamma_fx & mask:0{digits}x}\n")
+            f.write("// step state action next_state q_current reward q_next_max q_new\n")
+            for step, (s, a, n, q, r, qn, qnew) in enumerate(self._trace_rows[env]):
+                f.write(f"{step} {s} {a} {n} {int(q) & mask:0{digits}x} {int(r) & mask:0{digits}x} "
+                        f"{int(qn) & mask:0{digits}x} {int(qnew) & mask:0{digits}x}\n")
+        self._trace_rows[env] = []
+
+    def float_q(self):
+        """Q-tables converted back to real values."""
+        return self.Q / float(1 << self.value_frac_bits)
+
+    def greedy_values(self, table=0):
+        return self.float_q()[table].max(axis=1).reshape(self.world.rows, self.world.cols)
+
+
+if __name__ == "__main__":
+    learner = FixedPointQLearner(GridWorld(), num_envs=100, seed=0, trace_envs=[0])
+    start = time.perf_counter()
+    learner.train(episodes=100)
+    elapsed = time.perf_counter() - start
+    print(f"Fixed-point 5x5: 10000 episodes in {elapsed * 1e3:.1f} ms, "
+          f"traces for env 0 in {TRACE_DIR}/, "
+          f"{learner.won[:, -1].mean():.0%} of final episodes reach the goal")
+    learner.show_values()
+
+    big = GridWorld.random(100, 100, hole_fraction=0.05, seed=1)
+    learner = FixedPointQLearner(big, num_envs=256, seed=0)
+    start = time.perf_counter()
+    learner.train(episodes=20, max_steps=20000)
+    elapsed = time.perf_counter() - start
+    print(f"Fixed-point 100x100: {learner.env_steps} TD updates in {elapsed:.2f} s "
+          f"({learner.env_steps / elapsed:,.0f} updates/s)")
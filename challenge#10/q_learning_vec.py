@@ -0,0 +1,236 @@
+"""
+Vectorized Q-learning for the Frozen Lake grid world.
+
+NumPy-array replacement for the dict-based `Agent` in Q-Learning-Algorithm.py.
+The board is compiled once into flat lookup tables (reward, terminal flag and
+next state per (state, action)), and many environments are stepped together:
+one batched epsilon-greedy choice and one batched TD update per step for all
+environments, instead of one Python-level update and a full dict copy.
+
+The update rule and rewards match the original Agent:
+    Q(s,a) <- (1-alpha) Q(s,a) + alpha (r(s) + gamma max_a' Q(s',a'))
+with r = -5 on a hole, +1 on the win state, -1 elsewhere, and all actions of
+a terminal state set to its reward when an episode ends.
+
+Boards are any rows x cols size, up to and beyond the 100x100 boards the
+q_update_datapath hardware targets.
+"""
+import time
+
+import numpy as np
+
+# Defaults from Q-Learning-Algorithm.py
+BOARD_ROWS = 5
+BOARD_COLS = 5
+START = (0, 0)
+WIN_STATE = (4, 4)
+HOLE_STATE = [(1, 0), (3, 1), (4, 2), (1, 3)]
+
+NUM_ACTIONS = 4   # up, down, left, right
+STEP_REWARD = -1
+WIN_REWARD = 1
+HOLE_REWARD = -5
+
+
+class GridWorld:
+    """
+    A rows x cols board compiled into flat per-state tables.
+
+    Attributes:
+        reward (ndarray): (S,) reward received in each state.
+        terminal (ndarray): (S,) True for the win state and holes.
+        next_state (ndarray): (S, 4) state reached by each action; moves off
+            the board leave the agent where it is.
+        start (int): flat index of the start state.
+    """
+    def __init__(self, rows=BOARD_ROWS, cols=BOARD_COLS, start=START,
+                 win=WIN_STATE, holes=HOLE_STATE):
+        self.rows = rows
+        self.cols = cols
+        self.num_states = rows * cols
+        self.start = start[0] * cols + start[1]
+
+        self.reward = np.full(self.num_states, STEP_REWARD, dtype=np.float64)
+        self.terminal = np.zeros(self.num_states, dtype=bool)
+        win_idx = win[0] * cols + win[1]
+        self.reward[win_idx] = WIN_REWARD
+        self.terminal[win_idx] = True
+        for i, j in holes:
+            self.reward[i * cols + j] = HOLE_REWARD
+            self.terminal[i * cols + j] = True
+
+        r, c = np.divmod(np.arange(self.num_states), cols)
+        moves = [(-1, 0), (1, 0), (0, -1), (0, 1)]   # same order as State.nxtPosition
+        self.next_state = np.empty((self.num_states, NUM_ACTIONS), dtype=np.int64)
+        for a, (dr, dc) in enumerate(moves):
+            nr, nc = r + dr, c + dc
+            inside = (nr >= 0) & (nr < rows) & (nc >= 0) & (nc < cols)
+            self.next_state[:, a] = np.where(inside, nr * cols + nc, r * cols + c)
+
+    @classmethod
+    def random(cls, rows, cols, hole_fraction=0.1, seed=0):
+        """Board with start top-left, win bottom-right and randomly placed holes."""
+        rng = np.random.default_rng(seed)
+        start, win = (0, 0), (rows - 1, cols - 1)
+        cells = np.flatnonzero(rng.random(rows * cols) < hole_fraction)
+        holes = [divmod(int(s), cols) for s in cells
+                 if divmod(int(s), cols) not in (start, win)]
+        return cls(rows, cols, start, win, holes)
+
+
+class VectorQLearner:
+    """
+    Batched Q-learning over `num_envs` copies of one GridWorld.
+
+    Args:
+        world (GridWorld): board to learn.
+        num_envs (int): environments stepped in lock-step.
+        alpha, gamma, epsilon (float): learning rate, discount, exploration.
+        shared_q (bool): False gives every environment its own Q-table
+            (independent agents, each equivalent to the original Agent);
+            True makes all environments update one table (parallel actors;
+            simultaneous writes to the same (s, a) keep the last one).
+        seed (int): seed for exploration.
+
+    Subclasses change the arithmetic by overriding `q_dtype`, `reward_values`
+    and `td_update`, and can observe every update through `record_updates`.
+    """
+    q_dtype = np.float64
+
+    def __init__(self, world, num_envs=64, alpha=0.5, gamma=0.9, epsilon=0.1,
+                 shared_q=False, seed=0):
+        self.world = world
+        self.num_envs = num_envs
+        self.alpha = alpha
+        self.gamma = gamma
+        self.epsilon = epsilon
+        self.rng = np.random.default_rng(seed)
+
+        num_tables = 1 if shared_q else num_envs
+        self.Q = np.zeros((num_tables, world.num_states, NUM_ACTIONS), dtype=self.q_dtype)
+        self.reward_values = world.reward
+        self.tracing = False
+        self.table = np.zeros(num_envs, dtype=np.int64) if shared_q else np.arange(num_envs)
+
+    def choose_actions(self, state):
+        """Batched epsilon-greedy; greedy ties go to the highest action like Agent.Action."""
+        q = self.Q[self.table, state]                               # (E, 4)
+        greedy = NUM_ACTIONS - 1 - np.argmax(q[:, ::-1], axis=1)
+        explore = self.rng.random(self.num_envs) <= self.epsilon
+        random_actions = self.rng.integers(0, NUM_ACTIONS, self.num_envs)
+        return np.where(explore, random_actions, greedy)
+
+    def td_update(self, q_sa, reward, q_next_max):
+        """New Q(s,a) for a batch of updates."""
+        return (1 - self.alpha) * q_sa + self.alpha * (reward + self.gamma * q_next_max)
+
+    def record_updates(self, mask, episode, state, action, nxt, q_sa, reward, q_next_max, new_q):
+        """Called with each batch of TD updates when `self.tracing` is set."""
+
+    def end_episodes(self, mask, episode):
+        """Called when the environments in `mask` finish episode number `episode` and `self.tracing` is set."""
+
+    def train(self, episodes, max_steps=None):
+        """
+        Run until every environment has finished `episodes` episodes.
+
+        Args:
+            episodes (int): episodes per environment.
+            max_steps (int): optional cap on steps per episode; an episode
+                that hits it is restarted without a terminal update.
+
+        Returns:
+            ndarray: (num_envs, episodes) total reward of each episode.
+            `self.won` holds the matching mask of episodes that reached the
+            win state and `self.env_steps` the total number of TD updates.
+        """
+        w = self.world
+        E = self.num_envs
+        env = np.arange(E)
+        state = np.full(E, w.start, dtype=np.int64)
+        done_episodes = np.zeros(E, dtype=np.int64)
+        ep_reward = np.zeros(E, dtype=self.q_dtype)
+        ep_steps = np.zeros(E, dtype=np.int64)
+        history = np.zeros((E, episodes), dtype=self.q_dtype)
+        self.won = np.zeros((E, episodes), dtype=bool)
+        self.env_steps = 0
+
+        while True:
+            active = done_episodes < episodes
+            if not active.any():
+                break
+            reward = self.reward_values[state]
+            ending = w.terminal[state] & active
+            stepping = ~w.terminal[state] & active
+
+            # Episode end: every action of the terminal state takes its reward.
+            if ending.any():
+                ep_reward[ending] += reward[ending]
+                self.Q[self.table[ending], state[ending]] = reward[ending, None]
+                history[env[ending], done_episodes[ending]] = ep_reward[ending]
+                self.won[env[ending], done_episodes[ending]] = w.reward[state[ending]] == WIN_REWARD
+                if self.tracing:
+                    self.end_episodes(ending, done_episodes)
+                done_episodes[ending] += 1
+
+            # Batched TD update for all environments still moving.
+            action = self.choose_actions(state)
+            nxt = w.next_state[state, action]
+            tables = self.table
+            q_next_max = self.Q[tables, nxt].max(axis=1)
+            q_sa = self.Q[tables, state, action]
+            new_q = self.td_update(q_sa, reward, q_next_max)
+            if self.tracing:
+                self.record_updates(stepping, done_episodes, state, action, nxt,
+                                    q_sa, reward, q_next_max, new_q)
+            self.Q[tables[stepping], state[stepping], action[stepping]] = new_q[stepping]
+            ep_reward[stepping] += reward[stepping]
+            ep_steps[stepping] += 1
+            self.env_steps += int(stepping.sum())
+
+            restart = ending.copy()
+            if max_steps is not None:
+                truncated = stepping & (ep_steps >= max_steps)
+                history[env[truncated], done_episodes[truncated]] = ep_reward[truncated]
+                if self.tracing:
+                    self.end_episodes(truncated, done_episodes)
+                done_episodes[truncated] += 1
+                restart |= truncated
+            state = np.where(stepping & ~restart, nxt, state)
+            state[restart] = w.start
+            ep_reward[restart] = 0
+            ep_steps[restart] = 0
+
+        return history
+
+    def greedy_values(self, table=0):
+        """(rows, cols) max Q-value per cell for one Q-table."""
+        return self.Q[table].max(axis=1).reshape(self.world.rows, self.world.cols)
+
+    def show_values(self, table=0):
+        """Print the board of max Q-values, like Agent.showValues."""
+        values = self.greedy_values(table)
+        for row in values:
+            print('-----------------------------------------------')
+            print('| ' + ''.join(str(round(float(v), 3)).ljust(6) + ' | ' for v in row))
+        print('-----------------------------------------------')
+
+
+if __name__ == "__main__":
+    # 10,000 episodes on the original 5x5 board, spread over 100 environments.
+    learner = VectorQLearner(GridWorld(), num_envs=100, seed=0)
+    start = time.perf_counter()
+    rewards = learner.train(episodes=100)
+    elapsed = time.perf_counter() - start
+    print(f"5x5 board: {rewards.size} episodes in {elapsed * 1e3:.1f} ms, "
+          f"{learner.won[:, -1].mean():.0%} of final episodes reach the goal")
+    learner.show_values()
+
+    # 100x100 board with random holes.
+    big = GridWorld.random(100, 100, hole_fraction=0.05, seed=1)
+    learner = VectorQLearner(big, num_envs=256, seed=0)
+    start = time.perf_counter()
+    rewards = learner.train(episodes=20, max_steps=20000)
+    elapsed = time.perf_counter() - start
+    print(f"100x100 board: {rewards.size} episodes, {learner.env_steps} TD updates in {elapsed:.2f} s "
+          f"({learner.env_steps / elapsed:,.0f} updates/s)")
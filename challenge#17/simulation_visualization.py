@@ -1,7 +1,13 @@
+import argparse
+import csv
+import os
+import sys
 import time
 import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import matplotlib.pyplot as plt
 import numpy as np
+from systolic_sort import systolic_sort
 
 def systolic_bubble_sort(arr):
     """
@@ -39,61 +45,162 @@ def systolic_bubble_sort(arr):
     
     return arr
 
-def measure_performance():
+# Benchmark configuration
+DEFAULT_SIZES = [10, 100, 500, 1000, 2500, 5000]
+PYTHON_MAX_SIZE = 5000          # the pure-Python simulation is O(n^2) interpreter steps
+METHODS = ["systolic (python)", "systolic (vectorized)", "sorted()", "np.sort"]
+
+
+def _run_method(method, data):
+    """Sort `data` (a list) with one method; returns systolic ticks or None."""
+    if method == "systolic (python)":
+        systolic_bubble_sort(list(data))
+    elif method == "systolic (vectorized)":
+        return systolic_sort(np.asarray(data))[1]
+    elif method == "sorted()":
+        sorted(data)
+    elif method == "np.sort":
+        np.sort(np.asarray(data))
+    else:
+        raise ValueError(f"Unknown method '{method}'")
+    return None
+
+
+def benchmark_one(size, method, repeats=5, warmup=1, seed=0):
     """
-    Measures the execution time of the systolic sort simulation for various
-    problem sizes and generates a plot.
+    Time one (size, method) pair with perf_counter.
+
+    Each repeat sorts a fresh copy of the same random input; warmup runs are
+    discarded. Returns a dict with the median, quartiles and IQR in seconds
+    and, for the vectorized engine, the systolic tick count.
     """
-    sizes = [10, 100, 500, 1000, 2500, 5000]
-    execution_times = []
-
-    print("Running simulations for various sorting sizes...")
-    print("-" * 40)
-    print(f"{'Input Size':<15} | {'Execution Time (s)':<20}")
-    print("-" * 40)
-
-    for size in sizes:
-        # Generate a list of random numbers for each size
-        random_list = [random.randint(0, size) for _ in range(size)]
-        
-        # Measure the execution time
-        start_time = time.time()
-        systolic_bubble_sort(random_list)
-        end_time = time.time()
-        
-        duration = end_time - start_time
-        execution_times.append(duration)
-        print(f"{size:<15} | {duration:<20.6f}")
-
-    # Visualize the results
-    plt.style.use('seaborn-v0_8-whitegrid')
+    rng = random.Random(seed + size)
+    data = [rng.randint(0, size) for _ in range(size)]
+
+    for _ in range(warmup):
+        _run_method(method, data)
+
+    times = []
+    ticks = None
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        ticks = _run_method(method, data)
+        times.append(time.perf_counter() - start_time)
+
+    q1, median, q3 = np.percentile(times, [25, 50, 75])
+    return {"method": method, "size": size, "median_s": median, "q1_s": q1, "q3_s": q3,
+            "iqr_s": q3 - q1, "repeats": repeats, "ticks": ticks}
+
+
+def write_results(results, out_prefix):
+    """Write `<out_prefix>.csv` and `<out_prefix>.png` (no display needed); returns the figure."""
+    fields = ["method", "size", "median_s", "q1_s", "q3_s", "iqr_s", "repeats", "ticks"]
+    with open(out_prefix + ".csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(results)
+
     fig, ax = plt.subplots(figsize=(10, 6))
-    
-    # Using strings for x-axis labels to ensure they are treated as categories
-    size_labels = [str(s) for s in sizes]
-    
-    bars = ax.bar(size_labels, execution_times, color='skyblue', edgecolor='black')
+    for method in METHODS:
+        rows = sorted((r for r in results if r["method"] == method), key=lambda r: r["size"])
+        if not rows:
+            continue
+        sizes = [r["size"] for r in rows]
+        med = np.array([r["median_s"] for r in rows])
+        err = np.array([[r["median_s"] - r["q1_s"] for r in rows],
+                        [r["q3_s"] - r["median_s"] for r in rows]])
+        ax.errorbar(sizes, med, yerr=err, marker="o", capsize=3, label=method)
+    ax.set_xscale("log")
+    ax.set_yscale("log")
+    ax.set_xlabel("Number of Elements to Sort", fontsize=12)
+    ax.set_ylabel("Median Execution Time (seconds, IQR bars)", fontsize=12)
+    ax.set_title("Sorting Benchmark: Systolic Simulation vs Library Sorts", fontsize=14)
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(out_prefix + ".png", dpi=150)
+    return fig
 
-    ax.set_xlabel('Number of Elements to Sort', fontsize=12)
-    ax.set_ylabel('Execution Time (seconds)', fontsize=12)
-    ax.set_title('Systolic Bubble Sort Simulation Performance', fontsize=14)
 
-    # Optional: Add labels on top of bars
-    for bar in bars:
-        yval = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2.0, yval, f'{yval:.4f}', va='bottom', ha='center')
+def run_benchmark(sizes=None, methods=None, repeats=5, warmup=1, workers=None,
+                  python_max_size=PYTHON_MAX_SIZE, seed=0):
+    """
+    Benchmark every (size, method) pair in a process pool.
 
-    plt.tight_layout()
-    plt.show()
+    Pairs run concurrently, so absolute timings include some contention;
+    use workers=1 for the most stable numbers. The pure-Python simulation is
+    skipped above `python_max_size`.
+    """
+    sizes = sizes or DEFAULT_SIZES
+    methods = methods or METHODS
+    jobs = [(size, method) for size in sizes for method in methods
+            if not (method == "systolic (python)" and size > python_max_size)]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(benchmark_one, size, method, repeats, warmup, seed): (size, method)
+                   for size, method in jobs}
+        for future in as_completed(futures):
+            results.append(future.result())
+    results.sort(key=lambda r: (r["size"], METHODS.index(r["method"])))
+    return results
+
+
+def measure_performance(sizes=None, repeats=5, warmup=1, workers=None,
+                        headless=False, out_prefix="sort_benchmark"):
+    """
+    Measures the execution time of the systolic sort simulation (pure Python
+    and vectorized) against sorted() and np.sort for various problem sizes.
+
+    Reports median and IQR over `repeats` timed runs after `warmup` runs.
+    With headless=True the results go to CSV/PNG files only and no window
+    is opened, so it can run unattended.
+    """
+    results = run_benchmark(sizes, repeats=repeats, warmup=warmup, workers=workers)
+
+    print("-" * 86)
+    print(f"{'Method':<22} | {'Input Size':>10} | {'Median (s)':>12} | {'IQR (s)':>12} | {'Ticks':>8}")
+    print("-" * 86)
+    for r in results:
+        ticks = "" if r["ticks"] is None else r["ticks"]
+        print(f"{r['method']:<22} | {r['size']:>10} | {r['median_s']:>12.6f} | {r['iqr_s']:>12.6f} | {ticks:>8}")
+
+    if headless:
+        plt.switch_backend("Agg")
+    fig = write_results(results, out_prefix)
+    print(f"Wrote {out_prefix}.csv and {out_prefix}.png")
+
+    if headless:
+        plt.close(fig)
+    else:
+        plt.show()
+    return results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Systolic sort simulation and benchmark.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="process pool size (default: CPU count)")
+    parser.add_argument("--headless", action="store_true",
+                        help="write CSV/PNG only; implied when no display is available")
+    parser.add_argument("--out", default="sort_benchmark", help="output file prefix")
+    return parser.parse_args()
 
 
 if __name__ == '__main__':
+    args = parse_args()
+
     # --- Task 2: Test the software version ---
     print("--- Testing the sort implementation ---")
     sample_array = [6, 2, 8, 1, 9, 4, 5, 7, 3, 0]
     print(f"Original Array: {sample_array}")
     sorted_array = systolic_bubble_sort(sample_array.copy())
-    print(f"Sorted Array:   {sorted_array}\n")
+    print(f"Sorted Array:   {sorted_array}")
+    vec_sorted, ticks = systolic_sort(sample_array)
+    print(f"Vectorized:     {vec_sorted.tolist()} ({ticks} systolic ticks)\n")
     
     # --- Task 3: Visualize execution times ---
-    measure_performance()
+    headless = args.headless or (sys.platform.startswith("linux") and not os.environ.get("DISPLAY"))
+    measure_performance(args.sizes, args.repeats, args.warmup, args.workers, headless, args.out)
@@ -0,0 +1,216 @@
+"""
+Memristor crossbar matrix-vector multiply simulator.
+
+Python counterpart of crossbar.cir that scales past SPICE: an N x M array of
+Biolek memristors (challenge#28/memristor_batch.py) whose conductances come
+from the device states. Input voltages drive the N wordlines, the M bitlines
+are held at virtual ground, and the output is the bitline current vector
+
+    I = V @ G
+
+for a whole batch of input vectors in one matrix product. With wire
+resistance, the array is solved by sparse nodal analysis: every crosspoint
+has a wordline and a bitline node and the system matrix is factorized once
+per conductance state. Because the network is linear, large batches first
+solve for the effective (rows x cols) transfer matrix, one unit input per
+wordline, and then reuse it as a plain matrix product.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import splu
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "challenge#28"))
+from memristor_batch import NOMINAL, sample_population, simulate_population  # noqa: E402
+
+
+class Crossbar:
+    """
+    N x M memristor crossbar.
+
+    Args:
+        rows (int): Number of wordlines (inputs).
+        cols (int): Number of bitlines (outputs).
+        x0 (float or array): Initial device states in [0, 1].
+        variation (float): Device-to-device parameter spread (0 for ideal devices).
+        r_wire (float): Resistance of each wordline/bitline segment between
+            neighbouring crosspoints (ohms); 0 for ideal wires.
+        seed (int): Seed for the device population.
+    """
+    def __init__(self, rows, cols, x0=0.5, variation=0.0, r_wire=0.0, seed=0):
+        self.rows = rows
+        self.cols = cols
+        flat = sample_population(rows * cols, variation, seed) if variation > 0 else \
+            {k: np.full(rows * cols, float(v)) for k, v in NOMINAL.items()}
+        self.params = {k: v.reshape(rows, cols) for k, v in flat.items()}
+        self.x = np.broadcast_to(np.asarray(x0, dtype=np.float64), (rows, cols)).copy()
+        self.r_wire = r_wire
+        self._invalidate()
+
+    def _invalidate(self):
+        self._lu = None
+        self._G_eff = None
+
+    @property
+    def G(self):
+        """(rows, cols) device conductances from the current states."""
+        p = self.params
+        return 1.0 / (p["R_on"] * self.x + p["R_off"] * (1 - self.x))
+
+    @property
+    def G_range(self):
+        """Per-device (G_min, G_max): fully OFF and fully ON conductance."""
+        return 1.0 / self.params["R_off"], 1.0 / self.params["R_on"]
+
+    def set_conductances(self, G):
+        """Set device states directly so each device has conductance G (clipped to its range)."""
+        g_min, g_max = self.G_range
+        R = 1.0 / np.clip(G, g_min, g_max)
+        p = self.params
+        self.x = np.clip((p["R_off"] - R) / (p["R_off"] - p["R_on"]), 0, 1)
+        self._invalidate()
+
+    def program(self, v_rows, v_cols, duration, steps=100):
+        """
+        Apply one programming pulse and update every device state.
+
+        Each device sees v_rows[i] - v_cols[j] for `duration` seconds (e.g. a
+        V/2 scheme selects one device with +V/2 on its row and -V/2 on its
+        column). States are integrated with the batched Biolek model; devices
+        below threshold are left unchanged. `steps` is raised as needed to
+        keep each RK4 step to a small fraction of a full state swing.
+        """
+        v_dev = (np.asarray(v_rows, dtype=np.float64)[:, None]
+                 - np.asarray(v_cols, dtype=np.float64)[None, :]).ravel()
+        flat = {k: v.ravel() for k, v in self.params.items()}
+        max_rate = np.max(flat["k"] * np.abs(v_dev) ** flat["alpha"])
+        steps = max(steps, int(np.ceil(duration * max_rate / 0.05)))
+        t = np.linspace(0.0, duration, 2)
+        x, _, _ = simulate_population(flat, self.x.ravel(), lambda _t: v_dev, t, substeps=steps)
+        self.x = x[-1].reshape(self.rows, self.cols)
+        self._invalidate()
+
+    def mvm(self, V):
+        """
+        Bitline currents for a batch of wordline voltages.
+
+        Args:
+            V (array): (rows,) or (batch, rows) input voltages.
+
+        Returns:
+            array: (cols,) or (batch, cols) output currents (A).
+        """
+        V = np.asarray(V, dtype=np.float64)
+        single = V.ndim == 1
+        V2 = V[np.newaxis] if single else V
+        if self.r_wire == 0:
+            I = V2 @ self.G
+        elif self._G_eff is not None or V2.shape[0] >= self.rows:
+            I = V2 @ self.effective_G()
+        else:
+            I = self._solve_with_wires(V2)
+        return I[0] if single else I
+
+    def effective_G(self):
+        """
+        (rows, cols) transfer matrix including wire resistance, so that
+        I = V @ effective_G(). Costs one sparse solve per wordline and is
+        cached until the device states change.
+        """
+        if self.r_wire == 0:
+            return self.G
+        if self._G_eff is None:
+            self._G_eff = self._solve_with_wires(np.eye(self.rows))
+        return self._G_eff
+
+    def _node_system(self):
+        """
+        Sparse nodal matrix for the array with wire resistance.
+
+        Unknowns are the wordline node voltages w[i, j] followed by the
+        bitline node voltages b[i, j]. Wordline i is driven from its j=0 end
+        through one wire segment; bitline j is sensed at virtual ground below
+        its i=rows-1 end through one wire segment.
+        """
+        N, M = self.rows, self.cols
+        g_w = 1.0 / self.r_wire
+        G = self.G
+        nw = N * M
+        w_idx = np.arange(nw).reshape(N, M)
+        b_idx = nw + w_idx
+
+        rows_, cols_, vals = [], [], []
+
+        def stamp(a, b, g):
+            # Conductance g between node arrays a and b.
+            rows_.extend([a, b, a, b])
+            cols_.extend([a, b, b, a])
+            vals.extend([g, g, -g, -g])
+
+        stamp(w_idx[:, :-1].ravel(), w_idx[:, 1:].ravel(), np.full(N * (M - 1), g_w))   # wordline segments
+        stamp(b_idx[:-1, :].ravel(), b_idx[1:, :].ravel(), np.full((N - 1) * M, g_w))   # bitline segments
+        stamp(w_idx.ravel(), b_idx.ravel(), G.ravel())                                   # devices
+        # Driver and sense-amp segments to fixed potentials: diagonal only.
+        rows_.extend([w_idx[:, 0], b_idx[-1, :]])
+        cols_.extend([w_idx[:, 0], b_idx[-1, :]])
+        vals.extend([np.full(N, g_w), np.full(M, g_w)])
+
+        A = sp.csc_matrix((np.concatenate(vals), (np.concatenate(rows_), np.concatenate(cols_))),
+                          shape=(2 * nw, 2 * nw))
+        return A, w_idx[:, 0], b_idx[-1, :], g_w
+
+    def _solve_with_wires(self, V):
+        if self._lu is None:
+            A, self._drive_nodes, self._sense_nodes, self._g_w = self._node_system()
+            self._lu = splu(A)
+        rhs = np.zeros((self._lu.shape[0], V.shape[0]))
+        rhs[self._drive_nodes] = self._g_w * V.T
+        v = self._lu.solve(rhs)
+        return (self._g_w * v[self._sense_nodes]).T
+
+
+def benchmark(size=256, batch=1000, r_wire=0.1, seed=0):
+    """Throughput and wire-resistance error of an NxN array on random inputs."""
+    rng = np.random.default_rng(seed)
+    xbar = Crossbar(size, size, x0=rng.uniform(0, 1, (size, size)), variation=0.1,
+                    r_wire=r_wire, seed=seed)
+    V = rng.uniform(0, 0.15, (batch, size))  # read voltages below the 0.17 V switching threshold
+
+    start = time.perf_counter()
+    ideal = V @ xbar.G
+    t_ideal = time.perf_counter() - start
+
+    start = time.perf_counter()
+    wired = xbar.mvm(V)
+    t_wired = time.perf_counter() - start
+
+    rel_err = np.abs(wired - ideal) / np.abs(ideal).max()
+    print(f"{size}x{size} crossbar, batch {batch}:")
+    print(f"  ideal wires : {batch / t_ideal:,.0f} MVM/s")
+    start = time.perf_counter()
+    xbar.mvm(V)
+    t_cached = time.perf_counter() - start
+    print(f"  r_wire={r_wire} ohm: first batch {t_wired:.2f} s (sparse LU + transfer matrix), "
+          f"then {batch / t_cached:,.0f} MVM/s; max IR-drop error {rel_err.max():.2%} of full scale")
+
+
+if __name__ == "__main__":
+    # Reproduce crossbar.cir: G entries of 1 S (1 ohm) and ~0 (1 GOhm).
+    G = np.array([[1, 0, 1, 0],
+                  [0, 1, 0, 1],
+                  [1, 1, 0, 0],
+                  [0, 0, 1, 1]], dtype=np.float64)
+    V = np.array([1.0, 2.0, 0.0, 1.0])
+    print("crossbar.cir check, I = V @ G:", V @ G, "(expected [1, 2, 2, 3] A)")
+
+    # Memristor version: map G onto device conductances and read it out.
+    xbar = Crossbar(4, 4)
+    g_min, g_max = xbar.G_range
+    xbar.set_conductances(g_min + G * (g_max - g_min))
+    I = xbar.mvm(V)
+    print("Memristor crossbar, normalized:", np.round((I - V.sum() * g_min[0, 0]) / (g_max - g_min)[0, 0], 6))
+
+    benchmark()
@@ -1,6 +1,14 @@
+import os
+import sys
+
 import numpy as np
 from sklearn.neural_network import MLPClassifier
 
+HERE = os.path.dirname(os.path.abspath(__file__))
+MEM_DIR = os.path.join(HERE, "mlp_mem")   # next to this script, whatever the cwd
+sys.path.insert(0, os.path.join(HERE, "..", "challenge#8"))
+from mlp_fixed import layers_from_sklearn, export_mlp, quantize_inputs, fixed_forward, write_golden  # noqa: E402
+
 # NAND function inputs and outputs
 X_nand = np.array([[0, 0],
                    [0, 1],
@@ -41,3 +49,12 @@ print("\nTesting for XOR function:")
 for i in range(4):
     pred = clf.predict([X_xor[i]])
     print(f"Input: {X_xor[i]} => Predicted Output: {pred[0]}")
+
+# Export the trained network as Q8.8 .mem files plus golden vectors for a testbench
+qlayers = export_mlp(layers_from_sklearn(clf), MEM_DIR)
+X_q = quantize_inputs(X_combined)
+out_q = fixed_forward(X_q, qlayers)[-1]
+write_golden(X_q, out_q, MEM_DIR)
+fixed_pred = (out_q[:, 0] >= 128).astype(int)
+print(f"\nFixed-point export in {MEM_DIR}: predictions match sklearn for "
+      f"{np.mean(fixed_pred == predictions):.0%} of inputs")
@@ -0,0 +1,33 @@
+import unittest
+
+import numpy as np
+from sklearn.datasets import make_blobs
+
+from visualization import Perceptron
+
+
+class TestPerceptron(unittest.TestCase):
+    def test_fit_fast_per_sample_matches_fit(self):
+        X, y = make_blobs(n_samples=100, n_features=2, centers=2, cluster_std=1.05, random_state=42)
+        classic = Perceptron(learning_rate=0.1, n_iters=100)
+        for _ in classic.fit(X, y):
+            pass
+        fast = Perceptron(learning_rate=0.1, n_iters=100)
+        fast.fit_fast(X, y, batch_size=1, history_every=1, shuffle=False)
+
+        self.assertEqual(fast.n_updates, len(classic.history) - 1)
+        self.assertEqual([step for step, _, _ in fast.history], list(range(len(classic.history))))
+        for (w_classic, b_classic), (_, w_fast, b_fast) in zip(classic.history, fast.history):
+            np.testing.assert_array_equal(w_fast, w_classic)
+            self.assertEqual(b_fast, b_classic)
+
+    def test_fit_fast_per_sample_default_is_in_order(self):
+        X, y = make_blobs(n_samples=100, n_features=2, centers=2, cluster_std=1.05, random_state=42)
+        ordered, default = Perceptron(), Perceptron()
+        ordered.fit_fast(X, y, batch_size=1, shuffle=False)
+        default.fit_fast(X, y, batch_size=1)
+        self.assertEqual(default.n_updates, ordered.n_updates)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,9 @@
+import argparse
+import os
+import sys
+import time
+from collections import deque
+
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
@@ -66,74 +72,171 @@ class Perceptron:
         for _ in range(20): yield
         return
 
+    def fit_fast(self, X, y, batch_size=1024, history_every=1, history_size=1000, seed=0, shuffle=None):
+        """
+        Headless training with vectorized mini-batch updates.
+
+        Each batch is classified with one matrix product and all of its
+        misclassified samples are applied as a single update. Labels with more
+        than two classes are trained one-vs-rest, one weight column per class,
+        in the same matrix products. Training stops after the first epoch with
+        no misclassified samples.
+
+        History is sparse: one snapshot every `history_every` updates, kept in
+        a ring buffer of the last `history_size` snapshots, so memory does not
+        grow with the dataset. With batch_size=1, shuffle=False and
+        history_every=1 this records the same steps as the animated `fit`.
+
+        Args:
+            X (array): (n_samples, n_features) inputs.
+            y (array): (n_samples,) class labels.
+            batch_size (int): Samples per update.
+            history_every (int): Record every k-th update.
+            history_size (int): Maximum number of snapshots kept.
+            seed (int): Seed for the per-epoch shuffle.
+            shuffle (bool): Visit the samples in a new random order every
+                epoch. Default: only when batch_size > 1, so per-sample
+                training goes through X in order like `fit`.
+
+        Returns:
+            list: Number of misclassified samples in each epoch.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        self.classes_ = np.unique(y)
+        if len(self.classes_) == 2:
+            Y = (y == self.classes_[1])[:, np.newaxis].astype(np.float64)
+        else:
+            Y = (y[:, np.newaxis] == self.classes_[np.newaxis, :]).astype(np.float64)
+        n_samples, n_features = X.shape
 
-# --- 2. Data Generation and Setup ---
-
-# Generate a linearly separable dataset with 2 features
-X, y = make_blobs(n_samples=100, n_features=2, centers=2, cluster_std=1.05, random_state=42)
-
-# Instantiate and prepare the perceptron
-p = Perceptron(learning_rate=0.1, n_iters=100)
-
-# The training process is now a generator
-training_generator = p.fit(X, y)
-
-# --- 3. Animation and Visualization ---
-
-# Set up the plot
-fig, ax = plt.subplots(figsize=(8, 6))
-plt.style.use('seaborn-v0_8-whitegrid')
-ax.set_title("Perceptron Learning Process")
-ax.set_xlabel("Feature 1")
-ax.set_ylabel("Feature 2")
-ax.set_xlim(X[:, 0].min() - 1, X[:, 0].max() + 1)
-ax.set_ylim(X[:, 1].min() - 1, X[:, 1].max() + 1)
-
-# Plot the data points
-ax.scatter(X[:, 0], X[:, 1], c=y, cmap='viridis', marker='o', edgecolors='k')
-
-# Initialize an empty line object for the decision boundary
-line, = ax.plot([], [], 'r-', lw=2)
-info_text = ax.text(0.02, 0.95, '', transform=ax.transAxes, fontsize=12)
-
-def init():
-    """Initializes the plot for the animation."""
-    line.set_data([], [])
-    info_text.set_text('')
-    return line, info_text
+        W = np.zeros((n_features, Y.shape[1]))
+        b = np.zeros(Y.shape[1])
+        self.history = deque(maxlen=history_size)
+        self.history.append((0, *self._unpack(W, b)))
 
-def update(frame):
-    """
-    Update function for the animation. This function is called for each frame.
-    It advances the training generator by one step and redraws the decision boundary.
+        if shuffle is None:
+            shuffle = batch_size > 1
+        rng = np.random.default_rng(seed)
+        errors_per_epoch = []
+        updates = 0
+        for epoch in range(self.n_iters):
+            order = rng.permutation(n_samples) if shuffle else np.arange(n_samples)
+            errors = 0
+            for start in range(0, n_samples, batch_size):
+                idx = order[start:start + batch_size]
+                Xb = X[idx]
+                err = Y[idx] - (Xb @ W + b >= 0)
+                wrong = np.count_nonzero(err)
+                if wrong == 0:
+                    continue
+                errors += np.count_nonzero(err.any(axis=1))
+                W += self.lr * (Xb.T @ err)
+                b += self.lr * err.sum(axis=0)
+                updates += 1
+                if updates % history_every == 0:
+                    self.history.append((updates, *self._unpack(W, b)))
+            errors_per_epoch.append(errors)
+            if errors == 0:
+                break
+
+        self.weights, self.bias = self._unpack(W, b)
+        self.n_updates = updates
+        if self.history[-1][0] != updates:
+            self.history.append((updates, self.weights.copy(), self.bias))
+        return errors_per_epoch
+
+    @staticmethod
+    def _unpack(W, b):
+        # Binary models keep the original (n_features,) weights and scalar bias.
+        if W.shape[1] == 1:
+            return W[:, 0].copy(), float(b[0])
+        return W.copy(), b.copy()
+
+    def predict(self, X):
+        """Class labels for X (after fit_fast)."""
+        scores = np.asarray(X, dtype=np.float64) @ self.weights + self.bias
+        if scores.ndim == 1:
+            return self.classes_[(scores >= 0).astype(np.int64)]
+        return self.classes_[np.argmax(scores, axis=1)]
+
+
+# --- 2. Animation from recorded history ---
+
+def animate_history(X, y, history, interval=50):
     """
-    try:
-        # Get the next state from the training generator
-        next(training_generator)
-        
-        # Get the current weights and bias from history
-        weights, bias = p.history[-1]
-        step_number = len(p.history) - 1
-
-        # Calculate the decision boundary line
-        # w1*x1 + w2*x2 + b = 0  =>  x2 = (-w1*x1 - b) / w2
-        x0 = np.array([ax.get_xlim()[0], ax.get_xlim()[1]])
-        if weights[1] != 0: # Avoid division by zero
-            x1 = (-weights[0] * x0 - bias) / weights[1]
-            line.set_data(x0, x1)
-        
-        info_text.set_text(f'Update Step: {step_number}')
-
-    except StopIteration:
-        # The generator is exhausted, meaning training is complete
-        info_text.set_text(f'Training Complete! Steps: {len(p.history)-1}')
-
-    return line, info_text
-
-# Create the animation
-# The interval is the delay between frames in milliseconds.
-ani = FuncAnimation(fig, update, frames=p.n_iters*len(X), init_func=init, blit=True, interval=50, repeat=False)
-
-# Display the plot
-plt.show()
+    Replays recorded (step, weights, bias) snapshots as a FuncAnimation.
 
+    Only the first two features are drawn; for one-vs-rest models there is one
+    boundary line per class.
+    """
+    fig, ax = plt.subplots(figsize=(8, 6))
+    plt.style.use('seaborn-v0_8-whitegrid')
+    ax.set_title("Perceptron Learning Process")
+    ax.set_xlabel("Feature 1")
+    ax.set_ylabel("Feature 2")
+    ax.set_xlim(X[:, 0].min() - 1, X[:, 0].max() + 1)
+    ax.set_ylim(X[:, 1].min() - 1, X[:, 1].max() + 1)
+
+    # Plot at most 5000 points so large datasets stay responsive
+    shown = np.random.default_rng(0).permutation(len(X))[:5000]
+    ax.scatter(X[shown, 0], X[shown, 1], c=y[shown], cmap='viridis', marker='o', edgecolors='k')
+
+    num_lines = 1 if np.ndim(history[0][1]) == 1 else history[0][1].shape[1]
+    lines = [ax.plot([], [], 'r-', lw=2)[0] for _ in range(num_lines)]
+    info_text = ax.text(0.02, 0.95, '', transform=ax.transAxes, fontsize=12)
+    x0 = np.array(ax.get_xlim())
+
+    def update(frame):
+        step, weights, bias = history[min(frame, len(history) - 1)]
+        W = np.reshape(weights, (weights.shape[0], -1))
+        B = np.reshape(bias, -1)
+        for k, line in enumerate(lines):
+            # w1*x1 + w2*x2 + b = 0  =>  x2 = (-w1*x1 - b) / w2
+            if W[1, k] != 0:
+                line.set_data(x0, (-W[0, k] * x0 - B[k]) / W[1, k])
+        if frame >= len(history) - 1:
+            info_text.set_text(f'Training Complete! Steps: {step}')
+        else:
+            info_text.set_text(f'Update Step: {step}')
+        return (*lines, info_text)
+
+    # Hold the final line for a few frames, as the generator version does
+    ani = FuncAnimation(fig, update, frames=len(history) + 20, blit=True, interval=interval, repeat=False)
+    return fig, ani
+
+
+# --- 3. Training runs ---
+
+def run_headless(n_samples, centers, batch_size, history_every, n_iters, seed=42):
+    """Trains on a large blob dataset with fit_fast and reports timing and accuracy."""
+    X, y = make_blobs(n_samples=n_samples, n_features=2, centers=centers, cluster_std=1.05, random_state=seed)
+    p = Perceptron(learning_rate=0.1, n_iters=n_iters)
+    start = time.perf_counter()
+    errors = p.fit_fast(X, y, batch_size=batch_size, history_every=history_every)
+    elapsed = time.perf_counter() - start
+    accuracy = np.mean(p.predict(X) == y)
+    print(f"{n_samples} samples, {centers} classes: {len(errors)} epochs, {p.n_updates} batch updates "
+          f"in {elapsed:.2f} s, training accuracy {accuracy:.2%}, {len(p.history)} history snapshots")
+    return X, y, p
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Perceptron training and visualization.")
+    parser.add_argument("--samples", type=int, default=100)
+    parser.add_argument("--classes", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="samples per update (1 follows the classic per-sample rule, in order)")
+    parser.add_argument("--history-every", type=int, default=1, help="record every k-th update")
+    parser.add_argument("--epochs", type=int, default=100)
+    parser.add_argument("--headless", action="store_true",
+                        help="train without animating; implied when no display is available")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    headless = args.headless or (sys.platform.startswith("linux") and not os.environ.get("DISPLAY"))
+    X, y, p = run_headless(args.samples, args.classes, args.batch_size, args.history_every, args.epochs)
+    if not headless:
+        fig, ani = animate_history(X, y, list(p.history))
+        plt.show()
@@ -0,0 +1,201 @@
+"""
+Batched MLP engine: trains K independently initialized networks at once.
+
+Generalizes MLP_XOR (multi-layered-xor.py) to arbitrary layer sizes and
+mini-batches. Every layer of all K networks is stored as one stacked tensor,
+weights (K, n_in, n_out) and biases (K, 1, n_out), so a forward or backward
+pass over all networks is one einsum per layer. Each network stops on its own
+once its loss drops below the tolerance, and finished networks are dropped
+from the working set so the remaining ones train faster.
+
+One run answers "what fraction of random inits solve XOR":
+
+    python mlp_batched.py --networks 1000 --layers 2 2 1
+"""
+import argparse
+import time
+
+import numpy as np
+
+XOR_X = np.array([[0, 0], [0, 1], [1, 0], [1, 1]], dtype=np.float64)
+XOR_Y = np.array([[0], [1], [1], [0]], dtype=np.float64)
+
+
+def sigmoid(x):
+    """The Sigmoid activation function."""
+    return 1 / (1 + np.exp(-x))
+
+
+class BatchedMLP:
+    """
+    K sigmoid MLPs with the same architecture, trained side by side.
+
+    Args:
+        layer_sizes (list): Neurons per layer including input and output,
+            e.g. [2, 2, 1] for the 2-2-1 XOR network.
+        num_networks (int): Number of independently initialized networks K.
+        seed (int): Seed for the initial weights.
+        init_scale (float): Weights and biases start uniform in
+            [0, init_scale), like np.random.rand in MLP_XOR for 1.0.
+    """
+    def __init__(self, layer_sizes, num_networks=1, seed=0, init_scale=1.0):
+        self.layer_sizes = list(layer_sizes)
+        self.num_networks = num_networks
+        rng = np.random.default_rng(seed)
+        self.weights = [rng.random((num_networks, n_in, n_out)) * init_scale
+                        for n_in, n_out in zip(self.layer_sizes[:-1], self.layer_sizes[1:])]
+        self.biases = [rng.random((num_networks, 1, n_out)) * init_scale
+                       for n_out in self.layer_sizes[1:]]
+
+    @staticmethod
+    def _forward(weights, biases, X):
+        """Activations of every layer; X is (batch, n_in), shared by all networks."""
+        activations = [X]
+        a = sigmoid(np.einsum("bi,kio->kbo", X, weights[0]) + biases[0])
+        activations.append(a)
+        for W, b in zip(weights[1:], biases[1:]):
+            a = sigmoid(np.einsum("kbi,kio->kbo", a, W) + b)
+            activations.append(a)
+        return activations
+
+    @staticmethod
+    def _backward(weights, biases, activations, y, learning_rate):
+        """One in-place gradient step for all networks (same rule as MLP_XOR.backpropagate)."""
+        out = activations[-1]
+        delta = (y - out) * out * (1 - out)
+        for layer in range(len(weights) - 1, -1, -1):
+            a_in = activations[layer]
+            if layer > 0:
+                # Propagate through the pre-update weights
+                next_delta = np.einsum("kbo,kio->kbi", delta, weights[layer])
+                next_delta *= a_in * (1 - a_in)
+                weights[layer] += learning_rate * np.einsum("kbi,kbo->kio", a_in, delta)
+            else:
+                weights[layer] += learning_rate * np.einsum("bi,kbo->kio", a_in, delta)
+            biases[layer] += learning_rate * delta.sum(axis=1, keepdims=True)
+            if layer > 0:
+                delta = next_delta
+
+    def feedforward(self, X):
+        """(K, batch, n_out) outputs of all networks."""
+        return self._forward(self.weights, self.biases, np.asarray(X, dtype=np.float64))[-1]
+
+    def loss(self, X, y):
+        """(K,) mean squared error of each network."""
+        return np.mean(np.square(y - self.feedforward(X)), axis=(1, 2))
+
+    def predict(self, X):
+        """(K, batch, n_out) rounded predictions."""
+        return np.round(self.feedforward(X))
+
+    def train(self, X, y, epochs=20000, learning_rate=0.1, batch_size=None,
+              tol=0.01, check_every=10, seed=0):
+        """
+        Trains all networks with per-network early stopping.
+
+        Args:
+            X (array): (samples, n_in) inputs.
+            y (array): (samples, n_out) targets.
+            epochs (int): Maximum epochs per network.
+            learning_rate (float): Step size.
+            batch_size (int): Mini-batch size; None for full-batch training.
+            tol (float): A network stops once its MSE on (X, y) is below tol.
+            check_every (int): Epochs between loss checks.
+            seed (int): Seed for the per-epoch mini-batch shuffle.
+
+        Returns:
+            dict: 'epochs' (K,) epochs trained by each network, 'converged'
+            (K,) whether it reached tol, 'loss' (K,) final MSE and 'solved'
+            (K,) whether every rounded output matches y.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        n = X.shape[0]
+        batch_size = batch_size or n
+        rng = np.random.default_rng(seed)
+
+        K = self.num_networks
+        stopped_at = np.full(K, epochs)
+        converged = np.zeros(K, dtype=bool)
+
+        live = np.arange(K)
+        W = [w.copy() for w in self.weights]
+        B = [b.copy() for b in self.biases]
+
+        def retire(mask):
+            # Write finished networks back and drop them from the working set
+            nonlocal live, W, B
+            for full, part in zip(self.weights + self.biases, W + B):
+                full[live[mask]] = part[mask]
+            keep = ~mask
+            live = live[keep]
+            W = [w[keep] for w in W]
+            B = [b[keep] for b in B]
+
+        for epoch in range(1, epochs + 1):
+            order = rng.permutation(n) if batch_size < n else np.arange(n)
+            for start in range(0, n, batch_size):
+                idx = order[start:start + batch_size]
+                acts = self._forward(W, B, X[idx])
+                self._backward(W, B, acts, y[idx], learning_rate)
+
+            if epoch % check_every == 0 or epoch == epochs:
+                loss = np.mean(np.square(y - self._forward(W, B, X)[-1]), axis=(1, 2))
+                done = loss < tol
+                if done.any():
+                    stopped_at[live[done]] = epoch
+                    converged[live[done]] = True
+                    retire(done)
+                if live.size == 0:
+                    break
+
+        if live.size:
+            retire(np.ones(live.size, dtype=bool))
+
+        out = self.feedforward(X)
+        return {
+            "epochs": stopped_at,
+            "converged": converged,
+            "loss": np.mean(np.square(y - out), axis=(1, 2)),
+            "solved": np.all(np.round(out) == y, axis=(1, 2)),
+        }
+
+
+def convergence_report(stats):
+    """Prints convergence statistics across all initializations."""
+    K = len(stats["epochs"])
+    conv_epochs = stats["epochs"][stats["converged"]]
+    print(f"Networks trained    : {K}")
+    print(f"Solved (all correct): {stats['solved'].mean():.1%}")
+    print(f"Reached loss tol    : {stats['converged'].mean():.1%}")
+    if conv_epochs.size:
+        p10, p50, p90 = np.percentile(conv_epochs, [10, 50, 90])
+        print(f"Epochs to converge  : median {p50:.0f}, 10th-90th percentile {p10:.0f}-{p90:.0f}")
+    stuck = ~stats["solved"]
+    if stuck.any():
+        print(f"Unsolved final loss : median {np.median(stats['loss'][stuck]):.4f} "
+              f"({stuck.sum()} networks, likely local minima)")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Train many MLPs on XOR at once.")
+    parser.add_argument("--layers", type=int, nargs="+", default=[2, 2, 1],
+                        help="layer sizes including input and output")
+    parser.add_argument("--networks", type=int, default=1000)
+    parser.add_argument("--epochs", type=int, default=20000)
+    parser.add_argument("--lr", type=float, default=0.1)
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--tol", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    mlp = BatchedMLP(args.layers, args.networks, seed=args.seed)
+    start = time.perf_counter()
+    stats = mlp.train(XOR_X, XOR_Y, epochs=args.epochs, learning_rate=args.lr,
+                      batch_size=args.batch_size, tol=args.tol, seed=args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"--- {'-'.join(map(str, args.layers))} on XOR, {args.networks} seeds in {elapsed:.2f} s ---")
+    convergence_report(stats)
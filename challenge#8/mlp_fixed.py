@@ -0,0 +1,188 @@
+"""
+Fixed-point MLP export and bit-exact integer reference model.
+
+Quantizes a trained sigmoid MLP (BatchedMLP, MLP_XOR or sklearn's
+MLPClassifier from challenge#6) into $readmemh .mem files in the same format
+as Main Project/weights_mem.py, plus a sigmoid lookup table, and provides an
+integer inference model whose outputs are golden data for a testbench.
+
+Number formats (per layer, all integer arithmetic):
+
+    activations  unsigned ACT_BITS, Q0.ACT_FRAC   (inputs 0/1 -> 0/255)
+    weights      signed 16-bit Q8.8               (same SCALE as weights_mem.py)
+    biases       signed 16-bit Q8.8, aligned with << ACT_FRAC before the add
+    acc          = sum(a * w) + (b << ACT_FRAC)   (wrap to ACC_WIDTH)
+    z            = acc >>> (ACT_FRAC + W_FRAC - LUT_FRAC)
+    a_next       = sigmoid_lut[clip(z, -LUT_SIZE/2, LUT_SIZE/2 - 1) + LUT_SIZE/2]
+
+Files written for layer l: mlp_w{l}.mem (output-neuron major, like
+weights0.mem's channel-major order), mlp_b{l}.mem and a shared
+sigmoid_lut.mem; mlp_in.vec / mlp_out.vec hold golden input/output vectors.
+"""
+import argparse
+import os
+
+import numpy as np
+
+W_FRAC     = 8          # Q8.8 weights and biases
+W_BITS     = 16
+ACT_FRAC   = 8          # Q0.8 activations
+ACT_BITS   = 8
+ACC_WIDTH  = 32
+LUT_FRAC   = 4          # LUT input step 1/16
+LUT_SIZE   = 256        # covers z in [-8, 8)
+OUT_DIR    = "mlp_mem"
+
+
+def wrap(x, width):
+    """Two's-complement wrap of int64 values to `width` bits."""
+    half = np.int64(1) << (width - 1)
+    return ((x + half) & ((np.int64(1) << width) - 1)) - half
+
+
+def quantize(values, frac_bits=W_FRAC, bits=W_BITS):
+    """Round to signed fixed point and saturate to `bits`."""
+    lo, hi = -(1 << (bits - 1)), (1 << (bits - 1)) - 1
+    return np.clip(np.round(np.asarray(values) * (1 << frac_bits)), lo, hi).astype(np.int64)
+
+
+def sigmoid_lut(size=LUT_SIZE, lut_frac=LUT_FRAC, act_frac=ACT_FRAC, act_bits=ACT_BITS):
+    """Sigmoid sampled at z = (i - size/2) / 2**lut_frac, as unsigned Q0.act_frac."""
+    z = (np.arange(size) - size // 2) / float(1 << lut_frac)
+    y = np.round((1 << act_frac) / (1 + np.exp(-z)))
+    return np.clip(y, 0, (1 << act_bits) - 1).astype(np.int64)
+
+
+def quantize_inputs(X):
+    """Map real inputs in [0, 1] to unsigned Q0.ACT_FRAC activations."""
+    return np.clip(np.round(np.asarray(X, dtype=np.float64) * (1 << ACT_FRAC)),
+                   0, (1 << ACT_BITS) - 1).astype(np.int64)
+
+
+def layers_from_batched(mlp, index=0):
+    """(W, b) pairs of network `index` of a BatchedMLP, W as (n_in, n_out)."""
+    return [(W[index], b[index, 0]) for W, b in zip(mlp.weights, mlp.biases)]
+
+
+def layers_from_xor(mlp):
+    """(W, b) pairs of a challenge#8 MLP_XOR."""
+    return [(mlp.weights_hidden, mlp.bias_hidden[0]), (mlp.weights_output, mlp.bias_output[0])]
+
+
+def layers_from_sklearn(clf):
+    """(W, b) pairs of a fitted MLPClassifier with activation='logistic'."""
+    return list(zip(clf.coefs_, clf.intercepts_))
+
+
+def quantize_layers(layers):
+    """Q8.8 integer (W, b) pairs."""
+    return [(quantize(W), quantize(b)) for W, b in layers]
+
+
+def fixed_forward(X_q, qlayers, lut=None):
+    """
+    Bit-exact integer inference for a batch of inputs.
+
+    Args:
+        X_q (array): (batch, n_in) unsigned activations (see quantize_inputs).
+        qlayers (list): Q8.8 integer (W, b) pairs.
+        lut (array): Sigmoid table; defaults to sigmoid_lut().
+
+    Returns:
+        list: Integer activations of every layer, input first; the last
+        entry is the (batch, n_out) network output.
+    """
+    lut = sigmoid_lut() if lut is None else np.asarray(lut, dtype=np.int64)
+    half = len(lut) // 2
+    shift = ACT_FRAC + W_FRAC - LUT_FRAC
+    activations = [np.asarray(X_q, dtype=np.int64)]
+    for W, b in qlayers:
+        acc = wrap(activations[-1] @ W + (b << ACT_FRAC), ACC_WIDTH)
+        z = np.clip(acc >> shift, -half, half - 1)
+        activations.append(lut[z + half])
+    return activations
+
+
+def write_mem(path, values, bits):
+    """One hex word per line, two's complement, $readmemh format."""
+    digits = (bits + 3) // 4
+    mask = (1 << bits) - 1
+    with open(path, "w") as f:
+        for v in np.asarray(values).ravel():
+            f.write(f"{int(v) & mask:0{digits}x}\n")
+
+
+def read_mem(path, bits, signed=True):
+    """Inverse of write_mem."""
+    with open(path) as f:
+        vals = np.array([int(line, 16) for line in f if line.strip()], dtype=np.int64)
+    if signed:
+        vals = np.where(vals >= 1 << (bits - 1), vals - (1 << bits), vals)
+    return vals
+
+
+def export_mlp(layers, out_dir=OUT_DIR):
+    """
+    Quantize (W, b) pairs and write mlp_w{l}.mem, mlp_b{l}.mem and sigmoid_lut.mem.
+
+    Returns:
+        list: The Q8.8 integer (W, b) pairs that were written.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    qlayers = quantize_layers(layers)
+    for l, (W, b) in enumerate(qlayers):
+        write_mem(os.path.join(out_dir, f"mlp_w{l}.mem"), W.T, W_BITS)   # output-neuron major
+        write_mem(os.path.join(out_dir, f"mlp_b{l}.mem"), b, W_BITS)
+    write_mem(os.path.join(out_dir, "sigmoid_lut.mem"), sigmoid_lut(), ACT_BITS)
+    with open(os.path.join(out_dir, "mlp_shape.txt"), "w") as f:
+        f.write(" ".join(str(W.shape[0]) for W, _ in qlayers) + f" {qlayers[-1][0].shape[1]}\n")
+    return qlayers
+
+
+def load_mlp(out_dir=OUT_DIR):
+    """Read exported .mem files back into (qlayers, lut)."""
+    with open(os.path.join(out_dir, "mlp_shape.txt")) as f:
+        sizes = [int(s) for s in f.read().split()]
+    qlayers = []
+    for l, (n_in, n_out) in enumerate(zip(sizes[:-1], sizes[1:])):
+        W = read_mem(os.path.join(out_dir, f"mlp_w{l}.mem"), W_BITS).reshape(n_out, n_in).T
+        b = read_mem(os.path.join(out_dir, f"mlp_b{l}.mem"), W_BITS)
+        qlayers.append((W, b))
+    lut = read_mem(os.path.join(out_dir, "sigmoid_lut.mem"), ACT_BITS, signed=False)
+    return qlayers, lut
+
+
+def write_golden(X_q, out_q, out_dir=OUT_DIR):
+    """Golden vectors: one input vector and its expected output per line, hex."""
+    for name, data in (("mlp_in.vec", X_q), ("mlp_out.vec", out_q)):
+        with open(os.path.join(out_dir, name), "w") as f:
+            for row in np.atleast_2d(data):
+                f.write(" ".join(f"{int(v):02x}" for v in row) + "\n")
+
+
+if __name__ == "__main__":
+    from mlp_batched import BatchedMLP, XOR_X, XOR_Y
+
+    parser = argparse.ArgumentParser(description="Train, quantize and export an XOR MLP.")
+    parser.add_argument("--layers", type=int, nargs="+", default=[2, 2, 1])
+    parser.add_argument("--out", default=OUT_DIR)
+    args = parser.parse_args()
+
+    mlp = BatchedMLP(args.layers, num_networks=64, seed=0)
+    stats = mlp.train(XOR_X, XOR_Y, epochs=20000)
+    index = int(np.argmin(np.where(stats["solved"], stats["loss"], np.inf)))
+    layers = layers_from_batched(mlp, index)
+
+    export_mlp(layers, args.out)
+    qlayers, lut = load_mlp(args.out)       # golden data comes from the files as written
+    X_q = quantize_inputs(XOR_X)
+    out_q = fixed_forward(X_q, qlayers, lut)[-1]
+    write_golden(X_q, out_q, args.out)
+
+    float_out = mlp.feedforward(XOR_X)[index]
+    print(f"Exported network {index} ({'-'.join(map(str, args.layers))}) to {args.out}/")
+    print("Input | float out | fixed out (Q0.8) | fixed pred")
+    for x, f_out, q_out in zip(XOR_X, float_out, out_q):
+        print(f"{x.astype(int)} | {f_out[0]:9.4f} | {q_out[0]:>5} ({q_out[0] / 256:.4f}) | {int(q_out[0] >= 128)}")
+    agree = np.all((out_q >= 128) == (float_out >= 0.5))
+    print(f"Fixed-point predictions match float: {agree}")
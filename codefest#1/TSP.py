@@ -1,57 +1,380 @@
-import numpy as np
+import argparse
+import math
 import random
+import time
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+# Above this many cities the n x n distance matrix is not built
+MATRIX_MAX_CITIES = 2000
+NEIGHBORS = 10
+
 
 def calculate_distance_matrix(cities):
     """Calculate the Euclidean distance matrix for city coordinates."""
-    n = len(cities)
-    D = np.zeros((n, n))
-    for i in range(n):
-        for j in range(n):
-            D[i, j] = np.linalg.norm(np.array(cities[i]) - np.array(cities[j]))
-    return D
+    P = np.asarray(cities, dtype=np.float64)
+    diff = P[:, np.newaxis, :] - P[np.newaxis, :, :]
+    return np.sqrt(np.einsum("ijk,ijk->ij", diff, diff))
+
 
-def nearest_neighbor_tsp(D):
+def nearest_neighbor_tsp(D, start=0):
     """
     Solve the TSP using a nearest-neighbor heuristic.
     Returns the route as a list of city indices.
     """
     n = len(D)
-    visited = [False] * n
-    route = [0]  # Start at city 0
-    visited[0] = True
+    visited = np.zeros(n, dtype=bool)
+    route = [start]
+    visited[start] = True
 
     for _ in range(1, n):
-        last = route[-1]
-        # Find the closest unvisited city
-        next_city = np.argmin([D[last][j] if not visited[j] else np.inf for j in range(n)])
+        # Closest unvisited city: one masked argmin over the row
+        next_city = int(np.argmin(np.where(visited, np.inf, D[route[-1]])))
         route.append(next_city)
         visited[next_city] = True
 
     return route
 
+
+def nearest_neighbor_points(points, start=0, tree=None, k=8):
+    """
+    Nearest-neighbor tour from coordinates without an n x n matrix.
+
+    Each step queries the KD-tree for the k nearest cities and takes the
+    first unvisited one, growing k fourfold when all are visited. Once k grows past
+    the number of cities still unvisited, the remaining ones are searched
+    directly instead.
+    """
+    P = np.asarray(points, dtype=np.float64)
+    n = len(P)
+    tree = cKDTree(P) if tree is None else tree
+    visited = np.zeros(n, dtype=bool)
+    route = np.empty(n, dtype=np.int64)
+    route[0] = start
+    visited[start] = True
+    unvisited = None
+    remaining = n - 1
+
+    for step in range(1, n):
+        last = route[step - 1]
+        kk = k
+        next_city = -1
+        while kk < remaining:
+            _, idx = tree.query(P[last], k=kk)
+            free = idx[~visited[idx]]
+            if free.size:
+                next_city = free[0]
+                break
+            kk *= 4
+        if next_city < 0:
+            if unvisited is None or unvisited.size > 2 * remaining:
+                unvisited = np.flatnonzero(~visited)
+            else:
+                unvisited = unvisited[~visited[unvisited]]
+            d = P[unvisited] - P[last]
+            next_city = unvisited[np.argmin(np.einsum("ij,ij->i", d, d))]
+        route[step] = next_city
+        visited[next_city] = True
+        remaining -= 1
+
+    return route
+
+
 def total_distance(route, D):
     """Compute the total distance of the given route, returning to the start."""
-    distance = 0
-    for i in range(len(route) - 1):
-        distance += D[route[i], route[i+1]]
-    distance += D[route[-1], route[0]]  # Return to starting city
-    return distance
+    route = np.asarray(route)
+    return float(D[route, np.roll(route, -1)].sum())
+
+
+def tour_length(points, route):
+    """Closed-tour length from coordinates."""
+    P = np.asarray(points, dtype=np.float64)[np.asarray(route)]
+    return float(np.sqrt(((P - np.roll(P, -1, axis=0)) ** 2).sum(axis=1)).sum())
+
+
+def neighbor_lists(points, k=NEIGHBORS, tree=None):
+    """(n, k) indices of each city's k nearest other cities and their distances."""
+    P = np.asarray(points, dtype=np.float64)
+    tree = cKDTree(P) if tree is None else tree
+    dist, idx = tree.query(P, k=min(k + 1, len(P)))
+    return idx[:, 1:], dist[:, 1:]
+
+
+class _Tour:
+    """
+    Tour array plus the bookkeeping the local search passes share: city
+    positions, coordinate columns for cheap vectorized distances, and the
+    neighbor lists with their precomputed distances.
+    """
+    def __init__(self, P, route, nbrs, nbr_dist):
+        self.x = np.ascontiguousarray(P[:, 0])
+        self.y = np.ascontiguousarray(P[:, 1])
+        self.xs, self.ys = self.x.tolist(), self.y.tolist()
+        self.tour = np.array(route, dtype=np.int64)
+        self.n = len(self.tour)
+        self.pos = np.empty_like(self.tour)
+        self.pos[self.tour] = np.arange(self.n)
+        self.nbrs, self.nbr_dist = nbrs, nbr_dist
+
+    def dist(self, a, b):
+        """Vectorized distances between city arrays a and b."""
+        return np.hypot(self.x[a] - self.x[b], self.y[a] - self.y[b])
+
+    def d(self, u, v):
+        """Scalar distance, for re-scoring single moves."""
+        return math.hypot(self.xs[u] - self.xs[v], self.ys[u] - self.ys[v])
+
+    def edge_lengths(self):
+        """Length of edge (tour[i], tour[i+1]) for every position i."""
+        return self.dist(self.tour, np.roll(self.tour, -1))
+
+    def reverse(self, lo, hi):
+        """
+        Reverse tour[lo:hi] as a cyclic tour: when the segment is longer than
+        half the tour, the complementary segment is reversed instead, which
+        gives the same cycle in the opposite direction at most half the cost.
+        """
+        tour, pos, n = self.tour, self.pos, self.n
+        if 2 * (hi - lo) <= n:
+            tour[lo:hi] = tour[lo:hi][::-1]
+            pos[tour[lo:hi]] = np.arange(lo, hi)
+        else:
+            idx = np.r_[hi:n, 0:lo]
+            tour[idx] = tour[idx][::-1]
+            pos[tour[idx]] = idx
+
+
+def two_opt_pass(t, active, eps=1e-9):
+    """
+    One 2-opt pass with neighbor lists over the `active` cities.
+
+    For every active city a and neighbor c, the move that replaces edges
+    (a, next a) and (c, next c) with (a, c) and (next a, next c) is scored in
+    one vectorized step, as is the mirrored move with the predecessors. The
+    improving candidates are then applied best first; each is re-scored on
+    the current tour with four scalar distances before its segment is
+    reversed, since earlier moves in the pass may have changed it.
 
-def main():
+    Returns:
+        tuple: (moves applied, total gain, cities whose edges changed).
+    """
+    n, k = t.n, t.nbrs.shape[1]
+    edge = t.edge_lengths()
+    i = np.repeat(t.pos[active], k)
+    a = np.repeat(active, k)
+    c = t.nbrs[active].ravel()
+    d_ac = t.nbr_dist[active].ravel()
+    j = t.pos[c]
+
+    cand = []
+    for step in (1, -1):
+        b = t.tour[(i + step) % n]
+        d = t.tour[(j + step) % n]
+        d_ab = edge[i] if step == 1 else edge[i - 1]
+        d_cd = edge[j] if step == 1 else edge[j - 1]
+        gain = d_ab + d_cd - d_ac - t.dist(b, d)
+        ok = (gain > eps) & (c != b)
+        cand.append((a[ok], c[ok], np.full(ok.sum(), step), gain[ok]))
+    gain = np.concatenate([x[3] for x in cand])
+    if gain.size == 0:
+        return 0, 0.0, np.empty(0, dtype=np.int64)
+    order = np.argsort(-gain, kind="stable")
+    cols = [np.concatenate([x[m] for x in cand])[order].tolist() for m in range(3)]
+
+    tour, pos, dist = t.tour, t.pos, t.d
+    moves, total, touched = 0, 0.0, []
+    for a_, c_, step in zip(*cols):
+        i_, j_ = int(pos[a_]), int(pos[c_])
+        b_ = int(tour[(i_ + step) % n])
+        d_ = int(tour[(j_ + step) % n])
+        if c_ == b_ or d_ == a_:
+            continue
+        g = dist(a_, b_) + dist(c_, d_) - dist(a_, c_) - dist(b_, d_)
+        if g <= eps:
+            continue
+        # Successor move reverses (i, j]; predecessor move reverses (i-1, j-1]
+        if step == -1:
+            i_, j_ = (i_ - 1) % n, (j_ - 1) % n
+        t.reverse(min(i_, j_) + 1, max(i_, j_) + 1)
+        moves += 1
+        total += g
+        touched.extend((a_, b_, c_, d_))
+    return moves, total, np.unique(touched)
+
+
+def or_opt_pass(t, active, max_len=3, eps=1e-9):
+    """
+    One Or-opt pass over segments that start at an `active` city: move
+    segments of 1..max_len cities, optionally reversed, to sit between a
+    neighbor c of their first or last city and c's successor. Moves are
+    scored in one vectorized step and applied best first, each re-scored on
+    the current tour before the subarray between the segment and its new
+    place is rotated.
+
+    Returns:
+        tuple: (moves applied, total gain, cities whose edges changed).
+    """
+    n, k = t.n, t.nbrs.shape[1]
+    tour, pos = t.tour, t.pos
+    edge = t.edge_lengths()
+    starts = pos[active]
+    cand = []
+    for L in range(1, max_len + 1):
+        i = starts[(starts >= 1) & (starts < n - L)]     # segment tour[i:i+L], no wrap
+        s1, sL = tour[i], tour[i + L - 1]
+        p, nx = tour[i - 1], tour[i + L]
+        removed = edge[i - 1] + edge[i + L - 1] - t.dist(p, nx)
+        for end in (s1, sL):
+            c = t.nbrs[end].ravel()
+            ii = np.repeat(i, k)
+            j = pos[c]
+            ok = ((j < ii - 1) | (j >= ii + L)) & (j < n - 1)
+            c, ii, j = c[ok], ii[ok], j[ok]
+            e = tour[j + 1]
+            a1, aL = tour[ii], tour[ii + L - 1]
+            fwd = t.dist(c, a1) + t.dist(aL, e)
+            rev = t.dist(c, aL) + t.dist(a1, e)
+            gain = np.repeat(removed, k)[ok] + edge[j] - np.minimum(fwd, rev)
+            good = gain > eps
+            cand.append((a1[good], c[good], np.full(good.sum(), L), gain[good]))
+
+    gain = np.concatenate([x[3] for x in cand]) if cand else np.empty(0)
+    if gain.size == 0:
+        return 0, 0.0, np.empty(0, dtype=np.int64)
+    order = np.argsort(-gain, kind="stable")
+    cols = [np.concatenate([x[m] for x in cand])[order].tolist() for m in range(3)]
+
+    dist = t.d
+    moves, total, touched = 0, 0.0, []
+    for s1, c, L in zip(*cols):
+        s, j = int(pos[s1]), int(pos[c])
+        if s < 1 or s + L > n - 1 or j >= n - 1 or s - 1 <= j < s + L:
+            continue
+        a1, aL = int(tour[s]), int(tour[s + L - 1])
+        p, nx, e = int(tour[s - 1]), int(tour[s + L]), int(tour[j + 1])
+        fwd = dist(c, a1) + dist(aL, e)
+        rev = dist(c, aL) + dist(a1, e)
+        g = dist(p, a1) + dist(aL, nx) - dist(p, nx) + dist(c, e) - min(fwd, rev)
+        if g <= eps:
+            continue
+        seg = (tour[s:s + L][::-1] if rev < fwd else tour[s:s + L]).copy()
+        if j > s:
+            tour[s:j + 1 - L] = tour[s + L:j + 1]
+            tour[j + 1 - L:j + 1] = seg
+            pos[tour[s:j + 1]] = np.arange(s, j + 1)
+        else:
+            tour[j + 1 + L:s + L] = tour[j + 1:s].copy()
+            tour[j + 1:j + 1 + L] = seg
+            pos[tour[j + 1:s + L]] = np.arange(j + 1, s + L)
+        moves += 1
+        total += g
+        touched.extend((p, nx, c, e, a1, aL))
+    return moves, total, np.unique(touched)
+
+
+def local_search(points, route, k=NEIGHBORS, max_passes=1000, or_opt=True, nbrs=None, full_checks=1):
+    """
+    Improve a tour with neighbor-list 2-opt and Or-opt until no move helps.
+
+    Uses don't-look bits at pass granularity: after the first pass only
+    cities whose tour edges changed, and cities that list one of them as a
+    neighbor, are scanned again. When that set runs dry, up to `full_checks`
+    extra passes rescan every city, since reversals flip the direction of
+    untouched segments and can open new moves there.
+
+    Returns:
+        tuple: (improved route array, number of passes).
+    """
+    P = np.asarray(points, dtype=np.float64)
+    if len(P) < 5:
+        return np.array(route, dtype=np.int64), 0
+    nbrs, nbr_dist = neighbor_lists(P, k) if nbrs is None else nbrs
+    t = _Tour(P, route, nbrs, nbr_dist)
+    active = np.arange(t.n)
+    for passes in range(1, max_passes + 1):
+        moved, _, touched = two_opt_pass(t, active)
+        if or_opt:
+            moved_or, _, touched_or = or_opt_pass(t, active)
+            moved += moved_or
+            touched = np.union1d(touched, touched_or)
+        if moved == 0:
+            if active.size == t.n or full_checks == 0:
+                return t.tour, passes
+            # Reversals flip the direction of untouched segments, which can
+            # open moves elsewhere: rescan everything before stopping
+            full_checks -= 1
+            active = np.arange(t.n)
+            continue
+        # Rescan changed cities and every city that lists one of them as a neighbor
+        changed = np.zeros(t.n, dtype=bool)
+        changed[touched] = True
+        changed |= changed[nbrs].any(axis=1)
+        active = np.flatnonzero(changed)
+    return t.tour, max_passes
+
+
+def solve(points, start=0, k=NEIGHBORS, improve=True):
+    """
+    Nearest-neighbor construction plus optional local search.
+
+    Uses the distance matrix for small instances and the KD-tree otherwise.
+    """
+    P = np.asarray(points, dtype=np.float64)
+    if len(P) <= MATRIX_MAX_CITIES:
+        route = np.array(nearest_neighbor_tsp(calculate_distance_matrix(P), start))
+    else:
+        route = nearest_neighbor_points(P, start)
+    if improve:
+        route, _ = local_search(P, route, k)
+    return route
+
+
+def main(num_cities=10):
     """Entry point for profiling / direct run."""
     # Generate random city coordinates (e.g., 10 cities)
-    num_cities = 10
     cities = [(random.uniform(0, 100), random.uniform(0, 100)) for _ in range(num_cities)]
-    
+
     # Calculate the distance matrix
     D = calculate_distance_matrix(cities)
-    
+
     # Solve the TSP
     route = nearest_neighbor_tsp(D)
     dist = total_distance(route, D)
-    
+
     print("TSP route (by city indices):", route)
     print("Total distance:", dist)
 
+
+def benchmark(num_cities, seed=0, k=NEIGHBORS):
+    """Construction and local-search timing for one random instance."""
+    P = np.random.default_rng(seed).uniform(0, 100, (num_cities, 2))
+    start = time.perf_counter()
+    if num_cities <= MATRIX_MAX_CITIES:
+        route = np.array(nearest_neighbor_tsp(calculate_distance_matrix(P)))
+    else:
+        route = nearest_neighbor_points(P)
+    t_nn = time.perf_counter() - start
+    nn_len = tour_length(P, route)
+
+    start = time.perf_counter()
+    improved, passes = local_search(P, route, k)
+    t_ls = time.perf_counter() - start
+    ls_len = tour_length(P, improved)
+    assert np.array_equal(np.sort(improved), np.arange(num_cities))
+    print(f"{num_cities:>7} cities | NN {nn_len:12.1f} in {t_nn:7.3f} s | "
+          f"2-opt/Or-opt {ls_len:12.1f} ({1 - ls_len / nn_len:6.1%} shorter) "
+          f"in {t_ls:7.3f} s, {passes} passes")
+
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Nearest-neighbor TSP with 2-opt/Or-opt improvement.")
+    parser.add_argument("--cities", type=int, default=10)
+    parser.add_argument("--benchmark", type=int, nargs="*", metavar="N",
+                        help="time construction + local search for these sizes")
+    args = parser.parse_args()
+    if args.benchmark is not None:
+        for n in args.benchmark or [10, 100, 1000, 10000, 100000]:
+            benchmark(n)
+    else:
+        main(args.cities)
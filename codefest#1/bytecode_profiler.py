@@ -0,0 +1,231 @@
+"""
+Bytecode instruction profiler: static and dynamic opcode counts.
+
+instruction_counter.py counts opcodes in a saved disassembly text file,
+which says how often an instruction appears, not how often it runs. This
+profiler takes a function (or a "module:function" entry point) and reports:
+
+- static counts straight from dis.get_instructions, including nested code
+  objects (comprehensions, inner functions), with no text round-trip;
+- dynamic counts of every executed instruction, collected with
+  sys.monitoring INSTRUCTION events on Python 3.12+ or sys.settrace opcode
+  events on older versions;
+- the hot opcodes weighted by execution frequency, grouped into the
+  hardware-unit categories used in Architecture_and_findings.txt.
+
+By default only code from the target's own source file is counted, so
+library internals (NumPy, SciPy Python layers) do not drown the workload.
+"""
+import argparse
+import dis
+import importlib
+import os
+import sys
+import types
+from collections import Counter
+
+# Opcode families mapped to the functional units they would need in hardware
+CATEGORIES = [
+    ("memory (load/store)", ("LOAD_", "STORE_", "DELETE_", "COPY", "SWAP", "PUSH_NULL", "POP_TOP")),
+    ("ALU (arithmetic/compare)", ("BINARY_", "UNARY_", "COMPARE_OP", "IS_OP", "CONTAINS_OP", "INPLACE_")),
+    ("control (jump/iterate)", ("JUMP", "POP_JUMP", "FOR_ITER", "GET_ITER", "RETURN", "END_FOR",
+                                "RESUME", "NOP", "EXTENDED_ARG")),
+    ("call/build", ("CALL", "PRECALL", "KW_NAMES", "BUILD_", "LIST_", "MAKE_FUNCTION", "FORMAT_VALUE",
+                    "MAP_ADD", "SET_ADD", "DICT_")),
+]
+MONITORING_TOOL = 3  # sys.monitoring tool id (3-5 are free for user tools)
+
+
+def categorize(opname):
+    for name, prefixes in CATEGORIES:
+        if opname.startswith(prefixes):
+            return name
+    return "other"
+
+
+def resolve(target):
+    """'module:function' or 'module:Class.method' -> callable."""
+    module_name, _, attr = target.partition(":")
+    obj = importlib.import_module(module_name)
+    for part in (attr or "main").split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+def _code_objects(code):
+    yield code
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            yield from _code_objects(const)
+
+
+def static_counts(obj):
+    """
+    Opcode counts of a function, code object or module, from dis.get_instructions.
+
+    For a module, every function and method defined in it is included.
+    """
+    if isinstance(obj, types.ModuleType):
+        counts = Counter()
+        for value in vars(obj).values():
+            funcs = [value] if isinstance(value, types.FunctionType) else \
+                [v for v in vars(value).values() if isinstance(v, types.FunctionType)] \
+                if isinstance(value, type) else []
+            for f in funcs:
+                if f.__module__ == obj.__name__:
+                    counts += static_counts(f)
+        return counts
+    code = obj if isinstance(obj, types.CodeType) else obj.__code__
+    counts = Counter()
+    for c in _code_objects(code):
+        counts.update(ins.opname for ins in dis.get_instructions(c))
+    return counts
+
+
+def executed_static_counts(code_objects):
+    """Static opcode counts over a set of code objects (no nested recursion)."""
+    counts = Counter()
+    for c in code_objects:
+        counts.update(ins.opname for ins in dis.get_instructions(c))
+    return counts
+
+
+def _in_scope(files):
+    if files is None:
+        return lambda code: True
+    files = {os.path.abspath(f) for f in files}
+    return lambda code: os.path.abspath(code.co_filename) in files
+
+
+def _dynamic_settrace(func, args, kwargs, in_scope):
+    counts = Counter()
+    seen = set()
+    opname = dis.opname
+
+    def local_trace(frame, event, arg):
+        if event == "opcode":
+            counts[opname[frame.f_code.co_code[frame.f_lasti]]] += 1
+        return local_trace
+
+    def global_trace(frame, event, arg):
+        if not in_scope(frame.f_code):
+            return None
+        seen.add(frame.f_code)
+        frame.f_trace_opcodes = True
+        return local_trace
+
+    old = sys.gettrace()
+    sys.settrace(global_trace)
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        sys.settrace(old)
+    return counts, result, seen
+
+
+def _dynamic_monitoring(func, args, kwargs, in_scope):
+    mon = sys.monitoring
+    counts = Counter()
+    seen = set()
+    opname = dis.opname
+
+    def on_instruction(code, offset):
+        if not in_scope(code):
+            return mon.DISABLE
+        seen.add(code)
+        counts[opname[code.co_code[offset]]] += 1
+
+    mon.use_tool_id(MONITORING_TOOL, "bytecode_profiler")
+    mon.register_callback(MONITORING_TOOL, mon.events.INSTRUCTION, on_instruction)
+    mon.set_events(MONITORING_TOOL, mon.events.INSTRUCTION)
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        mon.set_events(MONITORING_TOOL, 0)
+        mon.register_callback(MONITORING_TOOL, mon.events.INSTRUCTION, None)
+        mon.free_tool_id(MONITORING_TOOL)
+    return counts, result, seen
+
+
+def dynamic_counts(func, *args, files="auto", backend="auto", **kwargs):
+    """
+    Run func(*args, **kwargs) and count every executed bytecode instruction.
+
+    Args:
+        files: Source files whose code is counted; "auto" uses the file that
+            defines `func`, None counts everything.
+        backend (str): "monitoring", "settrace" or "auto" (monitoring when available).
+
+    Returns:
+        tuple: (Counter of opname -> executions, func's return value, set of
+        the in-scope code objects that ran).
+    """
+    if files == "auto":
+        files = [func.__code__.co_filename]
+    in_scope = _in_scope(files)
+    if backend == "auto":
+        backend = "monitoring" if hasattr(sys, "monitoring") else "settrace"
+    if backend == "monitoring":
+        return _dynamic_monitoring(func, args, kwargs, in_scope)
+    return _dynamic_settrace(func, args, kwargs, in_scope)
+
+
+def report(name, static, dynamic, top=15):
+    """Prints hot opcodes by execution count next to their static counts, then per category."""
+    total = sum(dynamic.values()) or 1
+    print(f"=== {name}: {sum(static.values())} static instructions in the code that ran, "
+          f"{total} executed ===")
+    print(f"{'Opcode':<24} | {'static':>6} | {'executed':>10} | {'share':>6} | category")
+    print("-" * 80)
+    for op, n in dynamic.most_common(top):
+        print(f"{op:<24} | {static.get(op, 0):>6} | {n:>10} | {n / total:>6.1%} | {categorize(op)}")
+    by_cat = Counter()
+    for op, n in dynamic.items():
+        by_cat[categorize(op)] += n
+    print("\nExecuted instructions by unit:")
+    for cat, n in by_cat.most_common():
+        print(f"  {cat:<26} {n / total:>6.1%}")
+    print()
+
+
+def _workloads():
+    """Built-in codefest workloads: name -> (function, args)."""
+    import random
+    import cryptography
+    import differential_equation
+    import TSP
+    random.seed(0)
+    text = "Hello World! (a+b-c)? x;y," * 400
+    return {
+        "crypto": (cryptography.transform_char_by_char, (text,)),
+        "crypto-table": (cryptography.transform_text, (text,)),
+        "tsp": (TSP.main, (200,)),
+        "de": (differential_equation.solve_logistic, ()),
+    }
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("MPLBACKEND", "Agg")   # profiled workloads must not open windows
+    parser = argparse.ArgumentParser(description="Static + dynamic bytecode opcode profiler.")
+    parser.add_argument("targets", nargs="*",
+                        help="built-in workload (crypto, crypto-table, tsp, de) or module:function "
+                             "(called without arguments)")
+    parser.add_argument("--all-files", action="store_true",
+                        help="count instructions in every file, not just the target's")
+    parser.add_argument("--backend", choices=["auto", "monitoring", "settrace"], default="auto")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    workloads = _workloads()
+    for target in args.targets or ["crypto", "tsp", "de"]:
+        func, fargs = workloads[target] if target in workloads else (resolve(target), ())
+        with open(os.devnull, "w") as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                dynamic, _, seen = dynamic_counts(func, *fargs, files=None if args.all_files else "auto",
+                                                  backend=args.backend)
+            finally:
+                sys.stdout = stdout
+        # Static counts over every code object that ran, so both columns cover the same code
+        static = executed_static_counts(seen)
+        report(target, static, dynamic, args.top)
@@ -0,0 +1,90 @@
+"""
+Throughput benchmark for the cryptography workload.
+
+Measures MB/s for encrypt, decrypt and round-trip (decrypt(encrypt(x)),
+checked against x) for the per-character reference, the translate-table
+engine and the multi-process streaming engine, on a synthetic ASCII log
+corpus.
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+from io import StringIO
+
+from cryptography import (inverse_char_by_char, inverse_transform_text, transform_char_by_char,
+                          transform_stream, transform_text)
+
+# The per-character loop runs at a few MB/s; time it on a prefix only
+PER_CHAR_MAX_MB = 4
+LOG_WORDS = ["INFO", "WARN", "ERROR", "request", "(id=42)", "user+admin", "retry?", "done!",
+             "latency;", "a-b", "cache,", "Hello", "World", "12:00:01", "GET", "/api/v1"]
+
+
+def make_corpus(mb, seed=0):
+    """About `mb` MB of ASCII log-like text."""
+    rng = random.Random(seed)
+    lines = [" ".join(rng.choice(LOG_WORDS) for _ in range(12)) + "\n" for _ in range(1000)]
+    block = "".join(lines)
+    return (block * (int(mb * 1e6) // len(block) + 1))[:int(mb * 1e6)]
+
+
+def _streamed(decrypt, workers, chunk_chars):
+    def run(text):
+        dst = StringIO()
+        transform_stream(StringIO(text), dst, chunk_chars, workers, decrypt)
+        return dst.getvalue()
+    return run
+
+
+def implementations(workers, chunk_chars):
+    """name -> (encrypt, decrypt) callables on str."""
+    # transform_stream only uses a process pool for workers > 1
+    streamed = f"multi-process ({workers} workers)" if workers > 1 else "streamed (1 process)"
+    return {
+        "per-char": (transform_char_by_char, inverse_char_by_char),
+        "translate-table": (transform_text, inverse_transform_text),
+        streamed: (_streamed(False, workers, chunk_chars), _streamed(True, workers, chunk_chars)),
+    }
+
+
+def _time(func, arg, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        out = func(arg)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), out
+
+
+def benchmark(mb=32, repeats=3, workers=None, chunk_chars=1 << 20):
+    """
+    Returns:
+        list: (name, encrypt MB/s, decrypt MB/s, round-trip MB/s) rows.
+    """
+    workers = workers or os.cpu_count()
+    corpus = make_corpus(mb)
+    rows = []
+    for name, (enc, dec) in implementations(workers, chunk_chars).items():
+        text = corpus[:int(PER_CHAR_MAX_MB * 1e6)] if name == "per-char" else corpus
+        size = len(text) / 1e6
+        t_enc, cipher = _time(enc, text, repeats)
+        t_dec, plain = _time(dec, cipher, repeats)
+        if plain != text:
+            raise AssertionError(f"{name}: round trip does not reproduce the input")
+        rows.append((name, size / t_enc, size / t_dec, size / (t_enc + t_dec)))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Encrypt/decrypt throughput benchmark.")
+    parser.add_argument("--mb", type=float, default=32, help="corpus size in MB")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    print(f"{'Implementation':<28} | {'encrypt MB/s':>12} | {'decrypt MB/s':>12} | {'round-trip MB/s':>15}")
+    print("-" * 76)
+    for name, enc, dec, rt in benchmark(args.mb, args.repeats, args.workers):
+        print(f"{name:<28} | {enc:>12.1f} | {dec:>12.1f} | {rt:>15.1f}")
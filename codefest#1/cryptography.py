@@ -1,8 +1,30 @@
+import argparse
 import dis
 import io
 import contextlib
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
-def transform_text(text):
+# Characters per chunk for the streaming API (~1-4 MB of text)
+CHUNK_CHARS = 1 << 20
+
+SIGN_MAPPING = {
+    '(': ')',
+    ')': '(',
+    '+': '-',
+    '-': '+',
+    '!': '?',
+    '?': '!',
+    ',': ';',
+    ';': ','
+}
+
+
+# Reference implementation, one character at a time. main() disassembles this
+# function for the bytecode analysis; transform_text is the fast path.
+def transform_char_by_char(text):
     # Predefined mapping for signs:
     sign_mapping = {
         '(': ')',
@@ -36,7 +58,127 @@ def transform_text(text):
             result.append(ch)
     return ''.join(result)
 
-def main():
+
+def _map_code(code):
+    """Replacement for one code point under transform_char_by_char's rules."""
+    ch = chr(code)
+    if ch.isalpha():
+        base = ord('A') if ch.isupper() else ord('a')
+        return chr((code - base) * 3 % 26 + base)
+    return SIGN_MAPPING.get(ch, ch)
+
+
+class _TranslationTable(dict):
+    """
+    str.translate table. The 256 Latin-1 code points are precomputed; any
+    other code point (isalpha() is true for e.g. Greek or CJK letters, which
+    the per-character rule also maps) is computed once on first use.
+    """
+    def __missing__(self, code):
+        value = _map_code(code)
+        self[code] = value
+        return value
+
+
+TRANSLATION_TABLE = _TranslationTable({code: _map_code(code) for code in range(256)})
+# 256-entry table for bytes.translate on ASCII or Latin-1 encoded data
+BYTES_TABLE = bytes(ord(_map_code(code)) for code in range(256))
+
+
+def transform_text(text):
+    """Encrypt text; output-identical to transform_char_by_char."""
+    return text.translate(TRANSLATION_TABLE)
+
+
+def transform_bytes(data):
+    """Encrypt ASCII or Latin-1 encoded bytes with one bytes.translate call."""
+    return data.translate(BYTES_TABLE)
+
+
+# Decryption: 3 * 9 = 27 = 1 (mod 26), so letter index i maps back with i * 9 % 26.
+# The sign swaps are their own inverse. Only ASCII letters round-trip: the
+# encryption folds other letters (e.g. 'é', Greek) onto ASCII ones.
+def inverse_char_by_char(text):
+    """Reference decryption, one character at a time (for benchmarks)."""
+    result = []
+    for ch in text:
+        if 'a' <= ch <= 'z' or 'A' <= ch <= 'Z':
+            base = ord('A') if ch.isupper() else ord('a')
+            result.append(chr((ord(ch) - base) * 9 % 26 + base))
+        elif ch in SIGN_MAPPING:
+            result.append(SIGN_MAPPING[ch])
+        else:
+            result.append(ch)
+    return ''.join(result)
+
+
+INVERSE_TABLE = {ord(ch): inverse_char_by_char(ch) for ch in
+                 "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz" + ''.join(SIGN_MAPPING)}
+INVERSE_BYTES_TABLE = bytes(INVERSE_TABLE.get(code, chr(code)).encode("latin-1")[0] for code in range(256))
+
+
+def inverse_transform_text(text):
+    """Decrypt text produced by transform_text (exact for ASCII letters)."""
+    return text.translate(INVERSE_TABLE)
+
+
+def inverse_transform_bytes(data):
+    """Decrypt ASCII or Latin-1 encoded bytes with one bytes.translate call."""
+    return data.translate(INVERSE_BYTES_TABLE)
+
+
+def transform_stream(src, dst, chunk_chars=CHUNK_CHARS, workers=1, decrypt=False):
+    """
+    Encrypt (or with decrypt=True, decrypt) text file object `src` into
+    `dst` chunk by chunk.
+
+    The transform is per character, so chunk boundaries do not matter and
+    memory stays bounded by the chunk size. With workers > 1, chunks are
+    encrypted in a process pool with at most 2 * workers chunks in flight,
+    and written back in order.
+
+    Returns:
+        int: Number of characters processed.
+    """
+    func = inverse_transform_text if decrypt else transform_text
+    total = 0
+    if workers <= 1:
+        for chunk in iter(lambda: src.read(chunk_chars), ''):
+            dst.write(func(chunk))
+            total += len(chunk)
+        return total
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in iter(lambda: src.read(chunk_chars), ''):
+            pending.append(pool.submit(func, chunk))
+            total += len(chunk)
+            if len(pending) >= 2 * workers:
+                dst.write(pending.popleft().result())
+        while pending:
+            dst.write(pending.popleft().result())
+    return total
+
+
+def transform_file(src_path, dst_path, chunk_chars=CHUNK_CHARS, workers=1, encoding="utf-8",
+                   decrypt=False):
+    """Encrypt (or decrypt) a text file of any size into dst_path; newlines are kept as-is."""
+    with open(src_path, "r", encoding=encoding, newline="") as src, \
+            open(dst_path, "w", encoding=encoding, newline="") as dst:
+        return transform_stream(src, dst, chunk_chars, workers, decrypt)
+
+
+def write_disassembly(path="disassembled.txt"):
+    """Write the bytecode of the per-character encryption function to `path`."""
+    # Capture the disassembled bytecode into a StringIO object.
+    bytecode_output = io.StringIO()
+    with contextlib.redirect_stdout(bytecode_output):
+        dis.dis(transform_char_by_char)
+    with open(path, "w") as dis_file:
+        dis_file.write(bytecode_output.getvalue())
+
+
+def interactive():
     # Prompt the user for input.
     user_input = input("Enter a string to encrypt: ")
     
@@ -56,17 +198,103 @@ def main():
     # Ask the user if they want to disassemble the encryption function.
     choice = input("\nDo you want to disassemble the encryption function and save it to a file? (y/n): ")
     if choice.strip().lower() == 'y':
-        # Capture the disassembled bytecode into a StringIO object.
-        bytecode_output = io.StringIO()
-        with contextlib.redirect_stdout(bytecode_output):
-            dis.dis(transform_text)
-        disassembled_code = bytecode_output.getvalue()
-        
-        # Write the disassembled bytecode to "disassembled.txt".
-        with open("disassembled.txt", "w") as dis_file:
-            dis_file.write(disassembled_code)
-        
+        write_disassembly("disassembled.txt")
         print("\nDisassembled bytecode saved in 'disassembled.txt'.")
 
+
+def _output_path(path, out_dir, decrypt):
+    suffix = ".dec" if decrypt else ".enc"
+    if out_dir:
+        return os.path.join(out_dir, os.path.basename(path) + suffix)
+    return path + suffix
+
+
+def _process_file(args):
+    src, dst, chunk_chars, workers, encoding, decrypt = args
+    return src, transform_file(src, dst, chunk_chars, workers, encoding, decrypt)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description="Encrypt or decrypt text in batch. Without arguments on a terminal, "
+                    "runs the interactive prompt.")
+    parser.add_argument("files", nargs="*",
+                        help="input files; none or '-' reads stdin")
+    parser.add_argument("-o", "--output",
+                        help="output file for a single input (default: stdout)")
+    parser.add_argument("--out-dir",
+                        help="directory for per-file outputs when several files are given "
+                             "(default: next to each input with a .enc/.dec suffix)")
+    parser.add_argument("-d", "--decrypt", action="store_true")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_CHARS,
+                        help="characters per buffered chunk")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="files processed concurrently")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes per file for chunk-level parallelism")
+    parser.add_argument("--encoding", default="utf-8")
+    parser.add_argument("--disassemble", nargs="?", const="disassembled.txt", metavar="PATH",
+                        help="also write the bytecode of the encryption function")
+    return parser.parse_args(argv)
+
+
+def batch(args):
+    """Stream stdin/files to stdout/files in chunks; returns the number of characters processed."""
+    if args.disassemble:
+        write_disassembly(args.disassemble)
+
+    files = [f for f in args.files if f != "-"]
+    if not files:
+        src = io.TextIOWrapper(sys.stdin.buffer, encoding=args.encoding, newline="")
+        if args.output:
+            with open(args.output, "w", encoding=args.encoding, newline="") as dst:
+                return transform_stream(src, dst, args.chunk_size, args.workers, args.decrypt)
+        dst = io.TextIOWrapper(sys.stdout.buffer, encoding=args.encoding, newline="",
+                               write_through=False)
+        try:
+            return transform_stream(src, dst, args.chunk_size, args.workers, args.decrypt)
+        finally:
+            dst.flush()
+            dst.detach()
+
+    if len(files) == 1 and not args.out_dir:
+        if args.output:
+            return transform_file(files[0], args.output, args.chunk_size, args.workers,
+                                  args.encoding, args.decrypt)
+        with open(files[0], "r", encoding=args.encoding, newline="") as src:
+            dst = io.TextIOWrapper(sys.stdout.buffer, encoding=args.encoding, newline="")
+            try:
+                return transform_stream(src, dst, args.chunk_size, args.workers, args.decrypt)
+            finally:
+                dst.flush()
+                dst.detach()
+
+    if args.output:
+        raise SystemExit("--output takes a single input; use --out-dir for several files")
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+    tasks = [(f, _output_path(f, args.out_dir, args.decrypt), args.chunk_size, args.workers,
+              args.encoding, args.decrypt) for f in files]
+    if args.jobs <= 1:
+        return sum(_process_file(t)[1] for t in tasks)
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        return sum(n for _, n in pool.map(_process_file, tasks))
+
+
+def main(argv=None):
+    """
+    Interactive prompt when called without arguments (or run on a terminal
+    with none); otherwise the batch CLI, e.g.
+
+        python cryptography.py big.log -o big.log.enc
+        cat big.log | python cryptography.py > big.log.enc
+        python cryptography.py -d --out-dir plain/ logs/*.enc -j 4
+    """
+    if argv is None or (not argv and sys.stdin.isatty()):
+        interactive()
+        return
+    batch(parse_args(argv))
+
+
 if __name__ == '__main__':
-    main()
+    main(sys.argv[1:])
@@ -0,0 +1,699 @@
+"""
+Loop-level parallelism analyzer for the workload functions.
+
+The "Parallelism Insights" in Architecture_and_findings.txt were written by
+reading the code. This module derives them from the AST instead. Every
+for/while loop in a function is scanned in execution order for loop-carried
+dependencies and classified as
+
+- data-parallel: iterations touch disjoint data (locals, out[i] stores,
+  results gathered with append/extend/add/update);
+- reduction: the only carried values are accumulators updated with an
+  associative operator (s += x, p *= x, m = max(m, x), hist[k] += 1);
+- sequential: a value is read before it is written in the iteration, an
+  element other than the one written is read, shared state is mutated in
+  place, the loop exits early, or it does ordered I/O.
+
+Work per iteration is estimated from the arithmetic, comparisons, calls and
+subscripts in the body, multiplied through nested loops whose trip count is
+a constant. The analysis is static and name-based (no alias tracking), so
+it points at candidates rather than proving them safe.
+
+The `parallelize` decorator acts on the result: a function whose loop over
+one argument is a map or a reduction is run over chunks of that argument in
+a process pool, and with check=True every call is compared against the
+serial output.
+"""
+import argparse
+import ast
+import functools
+import importlib
+import inspect
+import itertools
+import operator
+import os
+import textwrap
+import types
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+DEFAULT_TARGETS = ["cryptography.py", "TSP.py", "differential_equation.py",
+                   os.path.join("..", "Main Project", "time_sw_conv.py")]
+# Calls whose effects are ordered (I/O, iterator or RNG state)
+IMPURE_CALLS = {"print", "input", "next", "open", "exec", "eval"}
+IMPURE_MODULES = {"random"}
+# Methods that gather results; safe while the container is not otherwise read in the loop
+COLLECT_METHODS = {"append", "extend", "add", "update"}
+# Methods that change their object in place
+MUTATING_METHODS = {"insert", "pop", "popleft", "appendleft", "remove", "discard", "clear", "setdefault",
+                    "sort", "reverse", "fill", "seek", "resize"}
+# Associative operators accepted as reductions: symbol, combine function, identity
+# (None: idempotent, so any initial value combines correctly)
+REDUCTION_OPS = {ast.Add: "+", ast.Mult: "*", ast.BitOr: "|", ast.BitAnd: "&", ast.BitXor: "^"}
+REDUCTION_COMBINE = {"+": (operator.add, 0), "*": (operator.mul, 1), "^": (operator.xor, 0),
+                     "|": (operator.or_, None), "&": (operator.and_, None), "max": (max, None),
+                     "min": (min, None)}
+CHUNKS_PER_WORKER = 4
+_CONST_OPS = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+              ast.FloorDiv: operator.floordiv}
+_SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)
+
+
+def _const(node, consts):
+    """Integer value of a literal / module constant expression, else None."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, int):
+        return node.value
+    if isinstance(node, ast.Name):
+        value = consts.get(node.id)
+        return value if isinstance(value, int) else None
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        value = _const(node.operand, consts)
+        return None if value is None else -value
+    if isinstance(node, ast.BinOp) and type(node.op) in _CONST_OPS:
+        left, right = _const(node.left, consts), _const(node.right, consts)
+        if left is not None and right is not None:
+            return _CONST_OPS[type(node.op)](left, right)
+    return None
+
+
+def _trip_count(loop, consts):
+    if not isinstance(loop, (ast.For, ast.AsyncFor)):
+        return None
+    it = loop.iter
+    if isinstance(it, (ast.Tuple, ast.List, ast.Set)):
+        return len(it.elts)
+    if isinstance(it, ast.Constant) and isinstance(it.value, (str, bytes)):
+        return len(it.value)
+    if isinstance(it, ast.Call) and isinstance(it.func, ast.Name) and it.func.id == "range" \
+            and 1 <= len(it.args) <= 3 and not it.keywords:
+        values = [_const(a, consts) for a in it.args]
+        if None not in values:
+            return len(range(*values))
+    return None
+
+
+def _work(node, consts):
+    """(operations, exact) for one execution of `node`; nested loops multiply by their trip count."""
+    if isinstance(node, _SCOPES):
+        return 0, True
+    if isinstance(node, (ast.For, ast.AsyncFor, ast.While)):
+        ops, exact = _work(node.iter if isinstance(node, (ast.For, ast.AsyncFor)) else node.test, consts)
+        body_ops, body_exact = _sum_work(node.body, consts)
+        trips = _trip_count(node, consts)
+        if trips is None:
+            trips, exact = 1, False
+        return ops + trips * body_ops, exact and body_exact
+    if isinstance(node, ast.Compare):
+        ops = len(node.ops)
+    else:
+        ops = int(isinstance(node, (ast.BinOp, ast.UnaryOp, ast.AugAssign, ast.BoolOp, ast.Call, ast.Subscript)))
+    exact = not isinstance(node, (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp))
+    child_ops, child_exact = _sum_work(ast.iter_child_nodes(node), consts)
+    return ops + child_ops, exact and child_exact
+
+
+def _sum_work(nodes, consts):
+    ops, exact = 0, True
+    for child in nodes:
+        n, e = _work(child, consts)
+        ops, exact = ops + n, exact and e
+    return ops, exact
+
+
+def _uses(node, name):
+    return any(isinstance(sub, ast.Name) and sub.id == name for sub in ast.walk(node))
+
+
+def _bound_names(node):
+    """Names bound by comprehensions and lambdas inside an expression (not reads of outer state)."""
+    bound = set()
+    for sub in ast.walk(node):
+        if isinstance(sub, ast.comprehension):
+            bound |= {n.id for n in ast.walk(sub.target) if isinstance(n, ast.Name)}
+        elif isinstance(sub, ast.Lambda):
+            bound |= {a.arg for a in sub.args.args + sub.args.kwonlyargs}
+    return bound
+
+
+class _LoopScan:
+    """Walks one loop body in execution order and records how every name is used."""
+
+    def __init__(self, targets, modules, impure):
+        self.modules = modules              # alias -> module name
+        self.impure = impure                # extra impure function names (from random import ...)
+        self.targets = set(targets)
+        self.defined = set(targets)         # definitely assigned so far in this iteration
+        self.tainted = set(targets)         # values derived from the loop variable
+        self.exposed = set()                # read before being assigned in the iteration
+        self.written = set()
+        self.plain = set()                  # assigned other than by a reduction
+        self.reductions = {}                # name -> {operator symbols}
+        self.loads = []                     # every ordinary Name load, in order
+        self.sub_loads = []                 # (container, index dump) for c[...] reads
+        self.stores = []                    # (container, index node, reduction symbol, index tainted)
+        self.calls = []                     # (object, method) for obj.method(...) calls
+        self.effects = set()                # ordered side effects
+        self.exits = set()
+        self.shared = set()                 # global/nonlocal names and attribute targets
+        self._skip = set()                  # ids of Name loads that belong to a reduction
+
+    def block(self, stmts):
+        for stmt in stmts:
+            self._stmt(stmt)
+
+    def _branch(self, *blocks):
+        """Scans alternative blocks; only names assigned on every path stay defined."""
+        before, after = self.defined, None
+        for stmts in blocks:
+            self.defined = set(before)
+            self.block(stmts)
+            after = self.defined if after is None else after & self.defined
+        self.defined = before if after is None else after
+
+    def _read(self, node):
+        """Records the reads (and calls) in an expression; returns the names read."""
+        if node is None:
+            return set()
+        bound = _bound_names(node)
+        names = set()
+        for sub in ast.walk(node):
+            if isinstance(sub, ast.Call):
+                self._call(sub)
+            elif isinstance(sub, ast.Subscript) and isinstance(sub.value, ast.Name):
+                self.sub_loads.append((sub.value.id, ast.dump(sub.slice)))
+            elif isinstance(sub, ast.NamedExpr):
+                self._store(sub.target, False)
+            elif isinstance(sub, ast.Name) and isinstance(sub.ctx, ast.Load) and sub.id not in bound:
+                names.add(sub.id)
+                if id(sub) not in self._skip:
+                    self.loads.append(sub.id)
+                if sub.id not in self.defined:
+                    self.exposed.add(sub.id)
+        return names
+
+    def _call(self, node):
+        func = node.func
+        if isinstance(func, ast.Name) and (func.id in IMPURE_CALLS or func.id in self.impure):
+            self.effects.add(f"{func.id}()")
+        elif isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name):
+            owner = func.value.id
+            if owner in self.modules:
+                if self.modules[owner].split(".")[0] in IMPURE_MODULES:
+                    self.effects.add(f"{owner}.{func.attr}()")
+            else:
+                self.calls.append((owner, func.attr))
+                if func.attr in ("write", "writelines", "send", "put"):
+                    self.effects.add(f"{owner}.{func.attr}()")
+
+    def _store(self, target, tainted, op=None):
+        if isinstance(target, ast.Name):
+            name = target.id
+            if op is None:
+                self.plain.add(name)
+            elif name not in self.defined:
+                self.exposed.add(name)      # the implicit read of `name op= x`
+                self.reductions.setdefault(name, set()).add(op)
+            self.written.add(name)
+            self.defined.add(name)
+            if tainted:
+                self.tainted.add(name)
+        elif isinstance(target, (ast.Tuple, ast.List)):
+            for elt in target.elts:
+                self._store(elt, tainted)
+        elif isinstance(target, ast.Starred):
+            self._store(target.value, tainted)
+        elif isinstance(target, ast.Subscript) and isinstance(target.value, ast.Name):
+            index_names = self._read(target.slice)
+            self.stores.append((target.value.id, target.slice, op, bool(index_names & self.tainted)))
+        else:                               # obj.attr = ..., f(x)[i] = ...
+            self._read(target.value)
+            self.shared.add(ast.unparse(target))
+
+    def _reduction_form(self, stmt):
+        """Operator symbol if stmt is `v = v op x` or `v = max(v, x)`, else None."""
+        if len(stmt.targets) != 1 or not isinstance(stmt.targets[0], ast.Name):
+            return None
+        name, value = stmt.targets[0].id, stmt.value
+        if isinstance(value, ast.BinOp) and type(value.op) in REDUCTION_OPS:
+            own, other, symbol = value.left, value.right, REDUCTION_OPS[type(value.op)]
+        elif isinstance(value, ast.Call) and isinstance(value.func, ast.Name) \
+                and value.func.id in ("max", "min") and len(value.args) == 2 and not value.keywords:
+            own, other, symbol = value.args[0], value.args[1], value.func.id
+        else:
+            return None
+        if isinstance(own, ast.Name) and own.id == name and not _uses(other, name):
+            self._skip.add(id(own))
+            return symbol
+        return None
+
+    def _stmt(self, s):
+        if isinstance(s, ast.Assign):
+            op = self._reduction_form(s)
+            tainted = bool(self._read(s.value) & self.tainted)
+            for target in s.targets:
+                self._store(target, tainted, op)
+        elif isinstance(s, ast.AugAssign):
+            names = self._read(s.value)
+            op = REDUCTION_OPS.get(type(s.op))
+            if op is None and isinstance(s.target, ast.Name):
+                self._read(ast.Name(id=s.target.id, ctx=ast.Load()))
+            self._store(s.target, bool(names & self.tainted), op)
+        elif isinstance(s, ast.AnnAssign):
+            if s.value is not None:
+                self._store(s.target, bool(self._read(s.value) & self.tainted))
+        elif isinstance(s, ast.Expr):
+            self._read(s.value)
+        elif isinstance(s, ast.If):
+            self._read(s.test)
+            self._branch(s.body, s.orelse)
+        elif isinstance(s, (ast.For, ast.AsyncFor)):
+            tainted = bool(self._read(s.iter) & self.tainted)
+            before = self.defined
+            self.defined = set(before)
+            self._store(s.target, tainted)
+            self.block(s.body)
+            self.block(s.orelse)
+            self.defined = before           # the loop may run zero times
+        elif isinstance(s, ast.While):
+            self._read(s.test)
+            self._branch(s.body + s.orelse, [])
+        elif isinstance(s, (ast.With, ast.AsyncWith)):
+            for item in s.items:
+                self._read(item.context_expr)
+                if item.optional_vars is not None:
+                    self._store(item.optional_vars, False)
+            self.block(s.body)
+        elif isinstance(s, ast.Try):
+            self._branch(s.body + s.orelse, *[h.body for h in s.handlers])
+            self.block(s.finalbody)
+        elif isinstance(s, ast.Return):
+            self._read(s.value)
+            self.exits.add("return")
+        elif isinstance(s, ast.Break):
+            self.exits.add("break")
+        elif isinstance(s, (ast.Global, ast.Nonlocal)):
+            self.shared.update(s.names)
+        elif isinstance(s, _SCOPES):
+            self.written.add(s.name)
+            self.defined.add(s.name)
+        elif isinstance(s, ast.Delete):
+            for target in s.targets:
+                self._store(target, False)
+        else:                               # raise, assert, match, ...
+            for child in ast.iter_child_nodes(s):
+                if isinstance(child, ast.expr):
+                    self._read(child)
+
+
+def _loop_header(loop):
+    if isinstance(loop, ast.While):
+        return f"while {ast.unparse(loop.test)}"
+    return f"for {ast.unparse(loop.target)} in {ast.unparse(loop.iter)}"
+
+
+def _classify(scan, is_while):
+    """(kind, reasons, reductions, gathers, element writes) from a finished scan."""
+    reasons, reductions, gathers, writes = [], [], [], []
+    local = scan.written - scan.exposed
+    if is_while:
+        reasons.append("while loop: the trip count depends on values computed in the loop")
+    reasons += [f"early exit ({e})" for e in sorted(scan.exits)]
+    reasons += [f"writes shared state {name}" for name in sorted(scan.shared)]
+    reasons += [f"ordered side effect {e}" for e in sorted(scan.effects)]
+
+    for name in sorted((scan.exposed & scan.written) - scan.targets):
+        ops = scan.reductions.get(name, set())
+        if len(ops) == 1 and name not in scan.plain and name not in scan.loads:
+            reductions.append((name, next(iter(ops))))
+        else:
+            reasons.append(f"{name} is read before it is written (carried from the previous iteration)")
+
+    # Writes to one container at different index expressions can land on the
+    # same element from different iterations (out[i] and out[i + 1])
+    indexes = {}
+    for container, index, _, _ in scan.stores:
+        if container not in local:
+            indexes.setdefault(container, {})[ast.dump(index)] = f"{container}[{ast.unparse(index)}]"
+    for container, labels in indexes.items():
+        if len(labels) > 1:
+            reasons.append(f"{container} is written at {' and '.join(labels.values())}; "
+                           f"different iterations can write the same element")
+
+    for container, index, op, tainted in scan.stores:
+        if container in local:
+            continue
+        label = f"{container}[{ast.unparse(index)}]"
+        reads = [i for c, i in scan.sub_loads if c == container]
+        other = any(i != ast.dump(index) for i in reads) or scan.loads.count(container) > len(reads)
+        if other:
+            reasons.append(f"{label} is written while {container} is read at another index")
+        elif len(indexes[container]) > 1:
+            continue                        # already reported above
+        elif tainted:
+            writes.append(label)
+        elif op is not None:
+            reductions.append((label, op))
+        else:
+            reasons.append(f"{label} is written at an index that does not depend on the loop variable")
+
+    for obj, method in dict.fromkeys(scan.calls):
+        if obj in local or obj in scan.targets:
+            continue
+        if method in COLLECT_METHODS:
+            own = sum(1 for o, m in scan.calls if o == obj)
+            if scan.loads.count(obj) > own:
+                reasons.append(f"{obj}.{method}() while {obj} is also read in the loop")
+            else:
+                gathers.append(f"{obj}.{method}")
+        elif method in MUTATING_METHODS:
+            reasons.append(f"{obj}.{method}() changes {obj} in place")
+
+    kind = "sequential" if reasons else "reduction" if reductions else "data-parallel"
+    return kind, reasons, reductions, gathers, writes
+
+
+def analyze_loop(loop, consts=None, modules=None, impure=()):
+    """
+    Classify one ast.For / ast.While node.
+
+    Returns:
+        dict: 'line', 'header', 'kind' (data-parallel, reduction or
+        sequential), 'reasons' for a sequential verdict, 'reductions' as
+        (target, operator) pairs, 'gathers' (container.method), 'writes'
+        (out[i] element stores), estimated 'ops' per iteration ('exact'
+        False when a nested trip count is unknown) and 'trips' when constant.
+    """
+    consts, modules = consts or {}, modules or {}
+    is_for = isinstance(loop, (ast.For, ast.AsyncFor))
+    targets = {n.id for n in ast.walk(loop.target) if isinstance(n, ast.Name)} if is_for else set()
+    scan = _LoopScan(targets, modules, set(impure))
+    scan.block(loop.body)
+    kind, reasons, reductions, gathers, writes = _classify(scan, not is_for)
+    ops, exact = _sum_work(loop.body, consts)
+    return {
+        "line": loop.lineno,
+        "header": _loop_header(loop),
+        "kind": kind,
+        "reasons": reasons,
+        "reductions": reductions,
+        "gathers": gathers,
+        "writes": writes,
+        "ops": ops,
+        "exact": exact,
+        "trips": _trip_count(loop, consts),
+    }
+
+
+def _loops(node, depth=0):
+    """(loop, nesting depth) for every loop in a function body, not entering nested scopes."""
+    for child in ast.iter_child_nodes(node):
+        if isinstance(child, _SCOPES):
+            continue
+        if isinstance(child, (ast.For, ast.AsyncFor, ast.While)):
+            yield child, depth
+            yield from _loops(child, depth + 1)
+        else:
+            yield from _loops(child, depth)
+
+
+def _functions(node, prefix=""):
+    """(qualified name, FunctionDef) for every function and method in a module."""
+    for child in ast.iter_child_nodes(node):
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            yield prefix + child.name, child
+            yield from _functions(child, f"{prefix}{child.name}.<locals>.")
+        elif isinstance(child, ast.ClassDef):
+            yield from _functions(child, f"{prefix}{child.name}.")
+
+
+def _module_info(tree):
+    """Integer constants, module aliases and impure imported names at module level."""
+    consts, modules, impure = {}, {}, set()
+    for stmt in tree.body:
+        if isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name):
+            value = _const(stmt.value, consts)
+            if value is not None:
+                consts[stmt.targets[0].id] = value
+        elif isinstance(stmt, ast.Import):
+            for alias in stmt.names:
+                modules[alias.asname or alias.name.split(".")[0]] = alias.name
+        elif isinstance(stmt, ast.ImportFrom) and (stmt.module or "").split(".")[0] in IMPURE_MODULES:
+            impure |= {alias.asname or alias.name for alias in stmt.names}
+    return consts, modules, impure
+
+
+def _globals_info(func):
+    """_module_info for a live function, from its globals."""
+    g = func.__globals__
+    consts = {k: v for k, v in g.items() if isinstance(v, int) and not isinstance(v, bool)}
+    modules = {k: v.__name__ for k, v in g.items() if isinstance(v, types.ModuleType)}
+    impure = {k for k, v in g.items() if getattr(v, "__module__", None) in IMPURE_MODULES}
+    return consts, modules, impure
+
+
+def analyze_source(source, filename="<source>", functions=None):
+    """Loop reports for every function in `source` (or only those named in `functions`)."""
+    tree = ast.parse(source, filename)
+    consts, modules, impure = _module_info(tree)
+    results = []
+    for qualname, fn in _functions(tree):
+        if functions and qualname not in functions:
+            continue
+        for loop, depth in _loops(fn):
+            info = analyze_loop(loop, consts, modules, impure)
+            info.update(file=filename, function=qualname, depth=depth)
+            results.append(info)
+    return results
+
+
+def analyze_file(path, functions=None):
+    with open(path, encoding="utf-8") as f:
+        return analyze_source(f.read(), os.path.basename(path), functions)
+
+
+def _details(info):
+    details = [f"reduction: {name} ({op})" for name, op in info["reductions"]]
+    if info["gathers"]:
+        details.append("gathers via " + ", ".join(info["gathers"]))
+    if info["writes"]:
+        details.append("independent element writes " + ", ".join(info["writes"]))
+    return details + info["reasons"]
+
+
+def _ops(info):
+    return f"{info['ops']}" if info["exact"] else f">={info['ops']}"
+
+
+def candidates(loops, top=10):
+    """Data-parallel and reduction loops ranked by estimated work per iteration."""
+    parallel = [lp for lp in loops if lp["kind"] != "sequential"]
+    return sorted(parallel, key=lambda lp: lp["ops"], reverse=True)[:top]
+
+
+def report(loops, top=10):
+    """Prints one row per loop grouped by file, then the ranked acceleration candidates."""
+    current = None
+    for lp in loops:
+        if lp["file"] != current:
+            current = lp["file"]
+            print(f"\n=== {current} ===")
+            print(f"{'function':<24} | {'line':>4} | {'loop':<44} | {'kind':<13} | {'ops/iter':>8} | {'trips':>5}")
+            print("-" * 114)
+        header = ("  " * lp["depth"] + lp["header"])[:44]
+        print(f"{lp['function'][:24]:<24} | {lp['line']:>4} | {header:<44} | {lp['kind']:<13} | "
+              f"{_ops(lp):>8} | {lp['trips'] if lp['trips'] is not None else '?':>5}")
+        for detail in _details(lp):
+            print(f"{'':<24} | {'':>4} |     {detail}")
+    print("\nAcceleration candidates (data-parallel / reduction, by estimated work per iteration):")
+    for lp in candidates(loops, top):
+        print(f"  {lp['file']}:{lp['line']} {lp['function']}: {lp['header'][:50]} -> {lp['kind']}, "
+              f"{_ops(lp)} ops/iter")
+
+
+def findings(loops):
+    """Markdown bullets in the style of the Parallelism Insights section."""
+    lines = []
+    for file, group in itertools.groupby(loops, key=lambda lp: lp["file"]):
+        lines.append(f"- **`{file}`:**")
+        for lp in group:
+            details = "; ".join(_details(lp))
+            lines.append(f"  - `{lp['function']}` line {lp['line']}, `{lp['header']}`: **{lp['kind']}**"
+                         f"{', ' + details if details else ''} ({_ops(lp)} ops/iter)")
+    return "\n".join(lines)
+
+
+def _chunk_plan(func):
+    """How to split func's loop over one argument across chunks: (plan, None) or (None, reason)."""
+    if "<locals>" in func.__qualname__:
+        return None, "it is defined inside a function, so pool workers cannot import it"
+    try:
+        fn = ast.parse(textwrap.dedent(inspect.getsource(func))).body[0]
+    except (OSError, TypeError):
+        return None, "its source is not available"
+    body = [s for s in fn.body if not (isinstance(s, ast.Expr) and isinstance(s.value, ast.Constant)
+                                       and isinstance(s.value.value, str))]
+    params = {a.arg for a in fn.args.posonlyargs + fn.args.args + fn.args.kwonlyargs}
+    loops = [i for i, s in enumerate(body) if isinstance(s, ast.For)]
+    if len(loops) != 1:
+        return None, "it needs exactly one top-level for loop"
+    i = loops[0]
+    loop = body[i]
+    if not (isinstance(loop.iter, ast.Name) and loop.iter.id in params):
+        return None, "the loop must iterate directly over an argument"
+    seq = loop.iter.id
+    if any(_uses(s, seq) for s in body[:i]):
+        return None, f"the code before the loop uses {seq}"
+    if len(body) != i + 2 or not isinstance(body[i + 1], ast.Return) or body[i + 1].value is None:
+        return None, "the loop must be followed by a single return"
+
+    consts, modules, impure = _globals_info(func)
+    info = analyze_loop(loop, consts, modules, impure)
+    if info["kind"] == "sequential":
+        return None, "the loop is sequential: " + "; ".join(info["reasons"])
+    if info["writes"]:
+        return None, "it writes " + ", ".join(info["writes"]) + ", which worker processes do not share"
+    inits = {s.targets[0].id: s.value for s in body[:i]
+             if isinstance(s, ast.Assign) and len(s.targets) == 1 and isinstance(s.targets[0], ast.Name)}
+    ret = body[i + 1].value
+
+    if info["kind"] == "reduction":
+        if len(info["reductions"]) != 1 or info["gathers"]:
+            return None, "it needs exactly one accumulator"
+        name, op = info["reductions"][0]
+        func_op, identity = REDUCTION_COMBINE[op]
+        init = inits.get(name)
+        if not (isinstance(ret, ast.Name) and ret.id == name):
+            return None, f"it must return the accumulator {name}"
+        if init is None or (identity is not None and not (isinstance(init, ast.Constant)
+                                                          and init.value == identity)):
+            return None, f"{name} must start at {identity if identity is not None else 'a value set before the loop'}"
+        return {"param": seq, "kind": "reduction", "combine": lambda parts: functools.reduce(func_op, parts),
+                "describe": f"{name} {op}= per chunk, partial results combined with {op}"}, None
+
+    owners = {g.split(".")[0] for g in info["gathers"]}
+    methods = {g.split(".")[1] for g in info["gathers"]}
+    if len(owners) != 1:
+        return None, "it must gather into exactly one container"
+    acc = owners.pop()
+    init = inits.get(acc)
+    empty = (isinstance(init, (ast.List, ast.Set)) and not init.elts) or \
+        (isinstance(init, ast.Dict) and not init.keys) or \
+        (isinstance(init, ast.Call) and isinstance(init.func, ast.Name)
+         and init.func.id in ("list", "set", "dict") and not init.args)
+    if not empty:
+        return None, f"{acc} must start empty before the loop"
+    if methods <= {"append", "extend"}:
+        if isinstance(ret, ast.Name) and ret.id == acc:
+            combine = lambda parts: list(itertools.chain.from_iterable(parts))  # noqa: E731
+        elif isinstance(ret, ast.Call) and isinstance(ret.func, ast.Attribute) and ret.func.attr == "join" \
+                and isinstance(ret.func.value, ast.Constant) and not ret.func.value.value \
+                and len(ret.args) == 1 and isinstance(ret.args[0], ast.Name) and ret.args[0].id == acc:
+            combine = lambda parts: parts[0][:0].join(parts)                     # noqa: E731
+        elif isinstance(ret, ast.Call) and isinstance(ret.func, ast.Attribute) \
+                and isinstance(ret.func.value, ast.Name) and modules.get(ret.func.value.id) == "numpy" \
+                and ret.func.attr in ("array", "asarray") and len(ret.args) == 1 \
+                and isinstance(ret.args[0], ast.Name) and ret.args[0].id == acc:
+            combine = np.concatenate
+        else:
+            return None, f"the return value must be {acc}, ''.join({acc}) or np.array({acc})"
+    elif methods <= {"add", "update"} and isinstance(ret, ast.Name) and ret.id == acc:
+        combine = lambda parts: functools.reduce(operator.or_, parts)          # noqa: E731
+    else:
+        return None, f"{acc} must be gathered with append/extend or add/update and returned"
+    return {"param": seq, "kind": "map", "combine": combine,
+            "describe": f"{', '.join(sorted(info['gathers']))} per chunk, chunks concatenated in order"}, None
+
+
+def _call_original(module, qualname, args, kwargs):
+    """Pool task: import the undecorated function by name and run it on one chunk."""
+    obj = importlib.import_module(module)
+    for part in qualname.split("."):
+        obj = getattr(obj, part)
+    return getattr(obj, "__wrapped__", obj)(*args, **kwargs)
+
+
+def _same(a, b):
+    if isinstance(a, (np.ndarray, float, np.floating)) or isinstance(b, (np.ndarray, float, np.floating)):
+        return np.shape(a) == np.shape(b) and np.allclose(a, b, equal_nan=True)
+    return a == b
+
+
+def parallelize(func=None, *, workers=None, min_items=100_000, check=True):
+    """
+    Run a function's map or reduction loop over chunks of its input in a process pool.
+
+    The function must be importable at module level and shaped like
+
+        <setup that does not use seq>
+        acc = []                 # or an identity such as 0 for a reduction
+        for x in seq:            # data-parallel, or a reduction into acc
+            ...
+        return acc               # or ''.join(acc) / np.array(acc)
+
+    so that f(a + b) == combine(f(a), f(b)). The shape and the loop
+    classification are checked once, when the decorator is applied.
+
+    Args:
+        workers (int): Pool size; defaults to os.cpu_count().
+        min_items (int): Inputs shorter than this run serially.
+        check (bool): Also run the original serially on every call and raise
+            AssertionError if the outputs differ (np.allclose for floats).
+
+    Returns:
+        The wrapped function; its `loop_plan` attribute describes the split.
+
+    Raises:
+        ValueError: The function does not have a loop that can be split safely.
+    """
+    if func is None:
+        return functools.partial(parallelize, workers=workers, min_items=min_items, check=check)
+    plan, reason = _chunk_plan(func)
+    if plan is None:
+        raise ValueError(f"parallelize: cannot split {func.__qualname__}: {reason}")
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        seq = signature.bind(*args, **kwargs).arguments[plan["param"]]
+        pool_size = workers or os.cpu_count()
+        if not seq or len(seq) < min_items or pool_size <= 1:
+            return func(*args, **kwargs)
+        step = -(-len(seq) // (pool_size * CHUNKS_PER_WORKER))
+        tasks = []
+        for lo in range(0, len(seq), step):
+            bound = signature.bind(*args, **kwargs)
+            bound.arguments[plan["param"]] = seq[lo:lo + step]
+            tasks.append((bound.args, bound.kwargs))
+        with ProcessPoolExecutor(max_workers=pool_size) as pool:
+            parts = list(pool.map(_call_original, itertools.repeat(func.__module__),
+                                  itertools.repeat(func.__qualname__),
+                                  [a for a, _ in tasks], [k for _, k in tasks]))
+        result = plan["combine"](parts)
+        if check and not _same(result, func(*args, **kwargs)):
+            raise AssertionError(f"parallelize: {func.__qualname__} chunked output differs from the serial run")
+        return result
+
+    wrapper.loop_plan = plan
+    return wrapper
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Classify loops as data-parallel, reduction or sequential.")
+    parser.add_argument("targets", nargs="*",
+                        help="file.py or file.py:func1,func2 (default: the codefest workloads "
+                             "and Main Project/time_sw_conv.py)")
+    parser.add_argument("--markdown", action="store_true",
+                        help="print findings as Markdown bullets for Architecture_and_findings.txt")
+    parser.add_argument("--top", type=int, default=10, help="acceleration candidates to list")
+    args = parser.parse_args()
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    loops = []
+    for target in args.targets or [os.path.join(here, t) for t in DEFAULT_TARGETS]:
+        path, _, names = target.partition(":")
+        loops += analyze_file(path, set(names.split(",")) if names else None)
+    if args.markdown:
+        print(findings(loops))
+    else:
+        report(loops, args.top)
@@ -1,16 +1,238 @@
+"""
+Unified profiling harness for the codefest workloads and the conv reference.
+
+Every workload is registered with a builder that prepares its input for a
+given size outside the measured region and returns a zero-argument callable.
+Each (workload, size) job is then measured three ways:
+
+- wall clock: one warm-up call, then `repeats` timed calls (min and median);
+- cProfile: one profiled call, dumped to <prof_dir>/<name>_<size>.prof for
+  snakeviz, with the hottest functions by own time;
+- tracemalloc: one traced call for the peak Python/NumPy allocation and the
+  source lines holding the most memory (the output included) on return.
+
+Jobs run in this process one after another, or with --isolate each in its
+own interpreter (no shared caches or allocator state), several at a time
+with -j. The combined report puts all jobs side by side.
+"""
+import argparse
+import contextlib
 import cProfile
-from differential_equation  import main as de_main
-from TSP import main as tsp_main
-from cryptography import main as crypt_main
+import json
+import os
+import pstats
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+MAIN_PROJECT = os.path.join(HERE, "..", "Main Project")
+PROF_DIR = "profiles"
+REPEATS = 5
+TOP = 5
+T_SPAN = (0, 20)
+
+
+def _de(n):
+    from differential_equation import sample_parameters, solve_ivp_baseline
+    r, K, y0 = sample_parameters(n)
+    t_eval = np.linspace(*T_SPAN, 200)
+    return lambda: solve_ivp_baseline(r, K, y0, T_SPAN, t_eval)
+
+
+def _tsp(n):
+    from TSP import solve
+    points = np.random.default_rng(0).uniform(0, 100, (n, 2))
+    return lambda: solve(points)
+
+
+def _crypto(n):
+    from crypto_benchmark import make_corpus
+    from cryptography import transform_char_by_char
+    text = make_corpus(n / 1e6)
+    return lambda: transform_char_by_char(text)
+
+
+def _conv(n):
+    if MAIN_PROJECT not in sys.path:
+        sys.path.append(MAIN_PROJECT)
+    from image_ref import OUT_CH, conv_fixed_point, read_signed_hex
+    from patch_stream import IMG_DIM, patch_windows
+    Wq = np.array(read_signed_hex(os.path.join(MAIN_PROJECT, "weights0.mem"))).reshape(OUT_CH, -1)
+    bq = read_signed_hex(os.path.join(MAIN_PROJECT, "bias0.mem"))
+    images = np.random.default_rng(0).integers(0, 256, (n, IMG_DIM, IMG_DIM), dtype=np.uint8)
+    return lambda: conv_fixed_point(patch_windows(images), Wq, bq)
+
+
+# name -> (builder, size unit, default sizes)
+WORKLOADS = {
+    "de": (_de, "parameter sets", [1, 100]),
+    "tsp": (_tsp, "cities", [1000, 10000]),
+    "crypto": (_crypto, "characters", [100_000, 1_000_000]),
+    "conv": (_conv, "256x256 images", [1, 16]),
+}
+
+
 def profile(fn, outname):
+    """Runs fn once under cProfile and dumps the stats to `outname`."""
     profiler = cProfile.Profile()
     profiler.enable()
     fn()
     profiler.disable()
     profiler.dump_stats(outname)
-    print(f"→ Profile for {fn.__name__} saved to {outname}")
+    return pstats.Stats(profiler)
+
+
+def _label(func):
+    filename, line, name = func
+    return f"{os.path.basename(filename)}:{line}({name})" if line else name
+
+
+def run_workload(name, size, repeats=REPEATS, prof_dir=PROF_DIR, top=TOP):
+    """
+    Times, profiles and memory-traces one workload at one size.
+
+    Returns:
+        dict: JSON-serializable results: wall-clock 'times', cProfile 'calls',
+        'prof' path and 'hot' functions (label, calls, own s, cumulative s),
+        tracemalloc 'peak' bytes and 'allocs', the sites (label, bytes) still
+        holding memory when the call returns, its output included.
+    """
+    builder, unit, _ = WORKLOADS[name]
+    fn = builder(size)
+    os.makedirs(prof_dir, exist_ok=True)
+    prof = os.path.join(prof_dir, f"{name}_{size}.prof")
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        fn()                                    # warm-up: imports, caches, page faults
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+
+        stats = profile(fn, prof)
+
+        tracemalloc.start()
+        try:
+            result = fn()                       # keep the output alive for the snapshot
+            _, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        del result
+
+    by_own_time = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+    return {
+        "name": name,
+        "size": size,
+        "unit": unit,
+        "pid": os.getpid(),
+        "times": times,
+        "calls": stats.total_calls,
+        "prof": prof,
+        "hot": [(_label(func), nc, tt, ct) for func, (_, nc, tt, ct, _) in by_own_time[:top]],
+        "peak": peak,
+        "allocs": [(f"{os.path.basename(s.traceback[0].filename)}:{s.traceback[0].lineno}", s.size)
+                   for s in snapshot.statistics("lineno")[:top]],
+    }
+
+
+def _run_isolated(name, size, repeats, prof_dir, top):
+    """run_workload in a fresh interpreter; the child prints its result as JSON."""
+    cmd = [sys.executable, os.path.abspath(__file__), "--worker", name, str(size),
+           "--repeats", str(repeats), "--prof-dir", os.path.abspath(prof_dir), "--top", str(top)]
+    out = subprocess.run(cmd, cwd=HERE, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def run_all(jobs, repeats=REPEATS, prof_dir=PROF_DIR, top=TOP, isolate=False, workers=1):
+    """
+    Runs (name, size) jobs and returns their results in job order.
+
+    Args:
+        isolate (bool): Run every job in its own subprocess.
+        workers (int): Subprocesses running at once when isolated. Parallel
+            jobs compete for cores, so keep 1 for timings that will be compared.
+    """
+    if not isolate:
+        return [run_workload(name, size, repeats, prof_dir, top) for name, size in jobs]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run_isolated, name, size, repeats, prof_dir, top) for name, size in jobs]
+        return [f.result() for f in futures]
+
+
+def report(results, file=None):
+    """Prints the side-by-side comparison, then per-job hot functions and allocation sites."""
+    file = file or sys.stdout
+    print(f"{'Workload':<8} | {'size':>9} | {'unit':<15} | {'median s':>9} | {'min s':>9} | "
+          f"{'calls':>9} | {'peak MB':>8} | hottest function", file=file)
+    print("-" * 110, file=file)
+    for r in results:
+        hottest = r["hot"][0][0] if r["hot"] else "-"
+        print(f"{r['name']:<8} | {r['size']:>9} | {r['unit']:<15} | {statistics.median(r['times']):>9.4f} | "
+              f"{min(r['times']):>9.4f} | {r['calls']:>9} | {r['peak'] / 1e6:>8.2f} | {hottest}", file=file)
+
+    for r in results:
+        print(f"\n=== {r['name']} ({r['size']} {r['unit']}), profile in {r['prof']} ===", file=file)
+        print(f"{'function':<52} | {'calls':>9} | {'own s':>8} | {'cum s':>8}", file=file)
+        for label, calls, own, cum in r["hot"]:
+            print(f"{label[:52]:<52} | {calls:>9} | {own:>8.4f} | {cum:>8.4f}", file=file)
+        print(f"{'allocation site':<52} | {'MB':>9}", file=file)
+        for label, size in r["allocs"]:
+            print(f"{label[:52]:<52} | {size / 1e6:>9.3f}", file=file)
+
+
+def parse_sizes(specs):
+    """['tsp=1000,5000', ...] -> {'tsp': [1000, 5000], ...}"""
+    sizes = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if name not in WORKLOADS or not values:
+            raise SystemExit(f"--size expects NAME=N[,N...] with NAME in {', '.join(WORKLOADS)}: {spec!r}")
+        sizes[name] = [int(v) for v in values.split(",")]
+    return sizes
+
 
 if __name__ == '__main__':
-    profile(de_main,  'de_profile.prof')
-    profile(tsp_main, 'tsp_profile.prof')
-    print("Done. Use `snakeviz de_profile.prof` or `snakeviz tsp_profile.prof` to inspect.")
+    os.environ.setdefault("MPLBACKEND", "Agg")   # profiled workloads must not open windows
+    parser = argparse.ArgumentParser(description="Time, cProfile and tracemalloc the codefest workloads.")
+    parser.add_argument("workloads", nargs="*", metavar="WORKLOAD",
+                        help=f"any of {', '.join(WORKLOADS)} (default: all)")
+    parser.add_argument("--size", action="append", default=[], metavar="NAME=N[,N...]",
+                        help="input sizes for one workload, e.g. tsp=1000,5000")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="timed calls per job")
+    parser.add_argument("--isolate", action="store_true", help="run every job in its own subprocess")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="isolated subprocesses at once")
+    parser.add_argument("--prof-dir", default=PROF_DIR)
+    parser.add_argument("--top", type=int, default=TOP, help="hot functions / allocation sites per job")
+    parser.add_argument("--json", metavar="PATH", help="also write all results as JSON")
+    parser.add_argument("--report", metavar="PATH", help="also write the report to a text file")
+    parser.add_argument("--worker", nargs=2, metavar=("NAME", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        name, size = args.worker
+        print(json.dumps(run_workload(name, int(size), args.repeats, args.prof_dir, args.top)))
+        sys.exit(0)
+
+    unknown = [name for name in args.workloads if name not in WORKLOADS]
+    if unknown:
+        parser.error(f"unknown workload(s) {', '.join(unknown)}; choose from {', '.join(WORKLOADS)}")
+    sizes = parse_sizes(args.size)
+    jobs = [(name, size) for name in args.workloads or WORKLOADS
+            for size in sizes.get(name, WORKLOADS[name][2])]
+    results = run_all(jobs, args.repeats, args.prof_dir, args.top, args.isolate, args.jobs)
+    report(results)
+    if args.report:
+        with open(args.report, "w") as f:
+            report(results, f)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    print(f"\nDone. Use `snakeviz {results[0]['prof']}` (or any file in {args.prof_dir}/) to inspect.")
@@ -1,10 +1,23 @@
+import io
 import os
+import random
+import tempfile
 import unittest
 from io import StringIO
 from unittest.mock import patch
 
 # Import functions from your main file. Adjust the module name if needed.
-from cryptography import transform_text, main
+from cryptography import (transform_text, transform_char_by_char, transform_bytes,
+                          transform_stream, transform_file, main, inverse_transform_text,
+                          inverse_char_by_char, inverse_transform_bytes)
+
+def _total(xs):
+    # Module-level reduction for the parallelize tests
+    total = 0
+    for x in xs:
+        total += x
+    return total
+
 
 class TestCryptoAlgorithm(unittest.TestCase):
     def test_transform_text(self):
@@ -14,6 +27,148 @@ class TestCryptoAlgorithm(unittest.TestCase):
         # For a punctuation test: '!' becomes '?' as per our mapping.
         self.assertEqual(transform_text("Hello World!"), "Vmhhq Oqzhj?")
 
+    def test_table_matches_char_by_char(self):
+        # Every Latin-1 code point, plus non-Latin letters that isalpha() accepts.
+        latin1 = ''.join(chr(c) for c in range(256))
+        self.assertEqual(transform_text(latin1), transform_char_by_char(latin1))
+        other = "Ωμέγα Straße ǅ 中文 ﬁ ① ٣ 𝔄"
+        self.assertEqual(transform_text(other), transform_char_by_char(other))
+        rng = random.Random(0)
+        sample = ''.join(chr(rng.randrange(0x3000)) for _ in range(5000))
+        self.assertEqual(transform_text(sample), transform_char_by_char(sample))
+
+    def test_transform_bytes(self):
+        data = bytes(range(256)) * 4
+        self.assertEqual(transform_bytes(data),
+                         transform_char_by_char(data.decode("latin-1")).encode("latin-1"))
+
+    def test_stream_chunks_and_workers(self):
+        rng = random.Random(1)
+        text = ''.join(rng.choice("Hello, World! (a+b-c)?;\r\n\té") for _ in range(20000))
+        expected = transform_char_by_char(text)
+        for chunk_chars, workers in ((1, 1), (7, 1), (4096, 1), (1000, 2)):
+            dst = StringIO()
+            self.assertEqual(transform_stream(StringIO(text), dst, chunk_chars, workers), len(text))
+            self.assertEqual(dst.getvalue(), expected)
+
+    def test_transform_file(self):
+        text = "Log line (1) + error!\r\nsecond; line\n" * 100
+        with tempfile.TemporaryDirectory() as tmp:
+            src, dst = os.path.join(tmp, "in.txt"), os.path.join(tmp, "out.txt")
+            with open(src, "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+            transform_file(src, dst, chunk_chars=64)
+            with open(dst, encoding="utf-8", newline="") as f:
+                self.assertEqual(f.read(), transform_char_by_char(text))
+
+    def test_inverse_transform(self):
+        self.assertEqual(inverse_transform_text("Vmhhq Oqzhj?"), "Hello World!")
+        self.assertEqual(inverse_transform_bytes(b"Vmhhq Oqzhj?"), b"Hello World!")
+
+    def test_round_trip_random(self):
+        # Any text without non-ASCII letters must survive encrypt -> decrypt.
+        rng = random.Random(2)
+        alphabet = [chr(c) for c in range(32, 127)] + list("\t\n\r\u00a0\u00bf\u2013\u20ac\u2460\u0663")
+        for _ in range(200):
+            text = ''.join(rng.choice(alphabet) for _ in range(rng.randrange(200)))
+            cipher = transform_text(text)
+            self.assertEqual(inverse_transform_text(cipher), text)
+            self.assertEqual(inverse_char_by_char(cipher), text)
+            self.assertEqual(transform_text(inverse_transform_text(text)), text)
+            data = text.encode("latin-1", errors="ignore")
+            self.assertEqual(inverse_transform_bytes(transform_bytes(data)), data)
+
+    def test_round_trip_stream(self):
+        rng = random.Random(3)
+        text = ''.join(rng.choice("The quick (brown) fox; jumps+over-the lazy dog?!\n") for _ in range(10000))
+        cipher, plain = StringIO(), StringIO()
+        transform_stream(StringIO(text), cipher, chunk_chars=333)
+        transform_stream(StringIO(cipher.getvalue()), plain, chunk_chars=1000, workers=2, decrypt=True)
+        self.assertEqual(plain.getvalue(), text)
+
+    def test_parallelize_per_char_loop(self):
+        # The analyzer classifies the per-character loop as a map, so it can be chunked
+        from parallelism_analyzer import parallelize
+        text = "Hello World! (a+b-c)? x;y,\n" * 500
+        encrypt = parallelize(transform_char_by_char, workers=2, min_items=1)
+        self.assertEqual(encrypt.loop_plan["kind"], "map")
+        self.assertEqual(encrypt(text), transform_char_by_char(text))
+        with self.assertRaises(ValueError):
+            parallelize(transform_stream)
+
+    def test_analyzer_overlapping_element_writes(self):
+        # Iterations i and i+1 both write out[i+1], so the loop is not data-parallel
+        from parallelism_analyzer import analyze_source
+        src = ("def shift(xs, out):\n"
+               "    for i in range(len(xs)):\n"
+               "        out[i] = xs[i]\n"
+               "        out[i + 1] = 0\n")
+        (loop,) = analyze_source(src)
+        self.assertEqual(loop["kind"], "sequential")
+        self.assertTrue(any("out[i] and out[i + 1]" in r for r in loop["reasons"]))
+
+    def test_parallelize_empty_input(self):
+        from parallelism_analyzer import parallelize
+        total = parallelize(_total, workers=2, min_items=0)
+        self.assertEqual(total.loop_plan["kind"], "reduction")
+        self.assertEqual(total([]), 0)
+        self.assertEqual(total(list(range(10))), 45)
+
+    def test_batch_cli_files(self):
+        text = "Batch (mode) works + no prompts!\r\n" * 50
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, f"log{i}.txt") for i in range(3)]
+            for p in paths:
+                with open(p, "w", encoding="utf-8", newline="") as f:
+                    f.write(text)
+            enc_dir, dec_dir = os.path.join(tmp, "enc"), os.path.join(tmp, "dec")
+            # Run from the temp dir, so a stray crypted.txt would show up there
+            cwd = os.getcwd()
+            os.chdir(tmp)
+            try:
+                with patch('builtins.input', side_effect=AssertionError("prompted")):
+                    main(paths + ["--out-dir", enc_dir, "-j", "2", "--chunk-size", "100"])
+                    main(["-d", "--out-dir", dec_dir] + [os.path.join(enc_dir, os.path.basename(p) + ".enc")
+                                                         for p in paths])
+            finally:
+                os.chdir(cwd)
+            self.assertFalse(os.path.exists(os.path.join(tmp, "crypted.txt")))
+            for p in paths:
+                with open(os.path.join(enc_dir, os.path.basename(p) + ".enc"), encoding="utf-8", newline="") as f:
+                    self.assertEqual(f.read(), transform_text(text))
+                with open(os.path.join(dec_dir, os.path.basename(p) + ".enc.dec"), encoding="utf-8", newline="") as f:
+                    self.assertEqual(f.read(), text)
+
+    def test_batch_stdin_to_stdout(self):
+        text = "Piped (stdin) + stdout!\r\nline two; end\n" * 20
+        stdin = io.TextIOWrapper(io.BytesIO(text.encode("utf-8")), encoding="utf-8")
+        stdout = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+        with patch('sys.stdin', stdin), patch('sys.stdout', stdout), \
+                patch('builtins.input', side_effect=AssertionError("prompted")):
+            main(["-", "--chunk-size", "7"])
+        self.assertEqual(stdout.buffer.getvalue().decode("utf-8"), transform_text(text))
+
+    def test_batch_disassemble_path(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, "in.txt")
+            with open(src, "w") as f:
+                f.write("Hello World!")
+            dis_path = os.path.join(tmp, "bytecode.txt")
+            main([src, "-o", os.path.join(tmp, "out.txt"), "--disassemble", dis_path])
+            with open(dis_path) as f:
+                self.assertIn("LOAD_CONST", f.read())
+
+    def test_batch_output_needs_single_input(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, f"log{i}.txt") for i in range(2)]
+            for p in paths:
+                with open(p, "w") as f:
+                    f.write("text")
+            with self.assertRaises(SystemExit) as cm:
+                main(paths + ["-o", os.path.join(tmp, "out.txt")])
+            self.assertIn("--output takes a single input", str(cm.exception))
+            self.assertFalse(os.path.exists(os.path.join(tmp, "out.txt")))
+
     @patch('builtins.input', side_effect=["Test Input", "n"])  # 'n' for no disassembly output
     def test_main_creates_crypted_file(self, mock_input):
         # Ensure the file doesn't already exist.
@@ -0,0 +1,146 @@
+"""
+Multi-start parallel TSP solver.
+
+Runs nearest-neighbor construction plus 2-opt/Or-opt local search (TSP.py)
+from many start cities across a process pool and keeps the best tour. The
+city coordinates, the neighbor lists and, for instances small enough to
+have one, the distance matrix are placed in multiprocessing.shared_memory
+once; workers attach to them by name in the pool initializer, so nothing
+larger than a start index and the resulting route crosses a process
+boundary per task.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from TSP import (MATRIX_MAX_CITIES, NEIGHBORS, calculate_distance_matrix, local_search,
+                 nearest_neighbor_points, nearest_neighbor_tsp, neighbor_lists, tour_length)
+
+# Arrays attached in each worker by _attach
+_shared = {}
+
+
+def _to_shared(arrays):
+    """Copy named arrays into new shared-memory blocks; returns (blocks, specs)."""
+    blocks, specs = [], {}
+    for name, arr in arrays.items():
+        arr = np.ascontiguousarray(arr)
+        shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+        np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+        blocks.append(shm)
+        specs[name] = (shm.name, arr.shape, arr.dtype.str)
+    return blocks, specs
+
+
+def _attach(specs, improve):
+    """Pool initializer: map the shared blocks into this worker."""
+    _shared.clear()
+    for name, (shm_name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _shared[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        _shared["_shm_" + name] = shm           # keep the mapping alive
+    _shared["_improve"] = improve
+
+
+def _solve_from(start):
+    """Worker task: construct from `start`, improve, and measure its CPU time."""
+    t0 = time.process_time()
+    P = _shared["points"]
+    if "D" in _shared:
+        route = np.array(nearest_neighbor_tsp(_shared["D"], start))
+    else:
+        route = nearest_neighbor_points(P, start)
+    if _shared["_improve"]:
+        route, _ = local_search(P, route, nbrs=(_shared["nbrs"], _shared["nbr_dist"]))
+    return start, tour_length(P, route), route, os.getpid(), time.process_time() - t0
+
+
+def solve_multistart(points, starts=None, num_starts=16, workers=None, k=NEIGHBORS,
+                     improve=True, seed=0):
+    """
+    Best tour over many start cities, solved in parallel.
+
+    Args:
+        points (array): (n, 2) city coordinates.
+        starts (array): Start cities; defaults to `num_starts` distinct random ones.
+        num_starts (int): Number of starts when `starts` is not given.
+        workers (int): Pool size; defaults to os.cpu_count().
+        k (int): Neighbor-list size for the local search.
+        improve (bool): Run 2-opt/Or-opt after construction.
+        seed (int): Seed for choosing the start cities.
+
+    Returns:
+        dict: 'route', 'length' and 'start' of the best tour, 'lengths' of
+        every start, and 'workers' mapping each worker pid to its task
+        count and busy CPU seconds; 'elapsed' is the wall-clock time.
+    """
+    P = np.ascontiguousarray(points, dtype=np.float64)
+    n = len(P)
+    if starts is None:
+        rng = np.random.default_rng(seed)
+        starts = rng.choice(n, size=min(num_starts, n), replace=False)
+    starts = [int(s) for s in starts]
+    workers = workers or os.cpu_count()
+
+    wall = time.perf_counter()
+    nbrs, nbr_dist = neighbor_lists(P, min(k, n - 1))
+    arrays = {"points": P, "nbrs": nbrs, "nbr_dist": nbr_dist}
+    if n <= MATRIX_MAX_CITIES:
+        arrays["D"] = calculate_distance_matrix(P)
+    blocks, specs = _to_shared(arrays)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                 initargs=(specs, improve)) as pool:
+            results = list(pool.map(_solve_from, starts))
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+    wall = time.perf_counter() - wall
+
+    per_worker = {}
+    for _, _, _, pid, seconds in results:
+        tasks, busy = per_worker.get(pid, (0, 0.0))
+        per_worker[pid] = (tasks + 1, busy + seconds)
+    best = min(results, key=lambda r: r[1])
+    return {
+        "route": best[2],
+        "length": best[1],
+        "start": best[0],
+        "lengths": {r[0]: r[1] for r in results},
+        "workers": per_worker,
+        "elapsed": wall,
+    }
+
+
+def report(result):
+    """Prints the best tour and per-worker timing."""
+    lengths = np.array(list(result["lengths"].values()))
+    print(f"Best tour {result['length']:.1f} from start city {result['start']} "
+          f"({len(lengths)} starts: worst {lengths.max():.1f}, median {np.median(lengths):.1f})")
+    busy_total = sum(busy for _, busy in result["workers"].values())
+    # CPU seconds, not task wall time, so waiting for a core does not count as work
+    print(f"Wall time {result['elapsed']:.2f} s, {busy_total:.2f} s of worker CPU time "
+          f"({busy_total / result['elapsed']:.1f} cores busy on average)")
+    print(f"{'Worker pid':>10} | {'tasks':>5} | {'CPU (s)':>8}")
+    for pid, (tasks, busy) in sorted(result["workers"].items()):
+        print(f"{pid:>10} | {tasks:>5} | {busy:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multi-start parallel TSP solver.")
+    parser.add_argument("--cities", type=int, default=5000)
+    parser.add_argument("--starts", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-improve", action="store_true", help="construction only")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    points = np.random.default_rng(args.seed).uniform(0, 100, (args.cities, 2))
+    result = solve_multistart(points, num_starts=args.starts, workers=args.workers,
+                              improve=not args.no_improve, seed=args.seed)
+    report(result)